@@ -0,0 +1,10 @@
+"""Performance benchmarks for pycallnumber.
+
+``python -m benchmarks`` runs the benchmark suite (see ``suite``) on
+generated corpora (see ``corpus``) and writes the results as JSON, so
+runs on different versions can be compared; run it with ``--help`` for
+options. The other modules are standalone scripts that look at one
+operation in more detail, e.g., ``python benchmarks/split.py``.
+
+Run benchmarks from the repository root.
+"""
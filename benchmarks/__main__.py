@@ -0,0 +1,104 @@
+"""Run the benchmark suite and write the results as JSON.
+
+Run from the repository root, e.g.:
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --sizes 100 1000 10000 --only parse sorted
+    python -m benchmarks --compare results.json
+
+With ``--compare``, each case's best time is also compared to the
+same case in an earlier results file, and the ratios are printed.
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks import suite
+
+
+FORMAT_VERSION = 1
+
+
+def get_environment():
+    try:
+        from importlib import metadata
+        version = metadata.version('pycallnumber')
+    except Exception:
+        version = None
+    try:
+        revision = subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            stderr=subprocess.STDOUT).decode('utf-8').strip()
+    except Exception:
+        revision = None
+    return {
+        'pycallnumber_version': version,
+        'git_revision': revision,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def case_id(result):
+    params = ', '.join('{}={}'.format(key, result['params'][key])
+                       for key in sorted(result['params']))
+    return '{} ({})'.format(result['benchmark'], params)
+
+
+def compare(baseline, results):
+    old_times = dict((case_id(r), r['best']) for r in baseline['results'])
+    header = ('case', 'old (ms)', 'new (ms)', 'new/old')
+    lines = ['{:<40}  {:>12}  {:>12}  {:>8}'.format(*header)]
+    for result in results:
+        old = old_times.get(case_id(result))
+        if old is not None:
+            lines.append('{:<40}  {:>12.2f}  {:>12.2f}  {:>8.2f}'.format(
+                case_id(result), old * 1000, result['best'] * 1000,
+                result['best'] / old if old else float('inf')))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Run the pycallnumber benchmark suite.')
+    parser.add_argument('--only', nargs='+', choices=list(suite.BENCHMARKS),
+                        metavar='NAME',
+                        help=('benchmarks to run (default: all): {}'
+                              ''.format(', '.join(suite.BENCHMARKS))))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000],
+                        help='corpus sizes to run each benchmark at')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of timed runs per case')
+    parser.add_argument('--output', default='-',
+                        help='the file to write JSON results to '
+                             '(default: stdout)')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='an earlier JSON results file to compare to')
+    args = parser.parse_args(argv)
+    results = suite.run(args.only, args.sizes, args.repeat)
+    report = {'format_version': FORMAT_VERSION,
+              'environment': get_environment(),
+              'results': results}
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == '-':
+        print(output)
+    else:
+        with open(args.output, 'w') as outfile:
+            outfile.write(output + '\n')
+    if args.compare:
+        with open(args.compare) as infile:
+            print(compare(json.load(infile), results), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
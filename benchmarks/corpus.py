@@ -0,0 +1,95 @@
+"""Generate realistic call number strings for benchmarks.
+
+Each generator produces strings in the shapes (and with the variations
+in spacing, case, and punctuation) found in real catalog data for one
+type of call number. Output is deterministic for a given ``seed``, so
+benchmark runs on different versions parse the same strings.
+"""
+
+from __future__ import unicode_literals
+import random
+
+
+LC_CLASSES = ('B', 'BF', 'D', 'DA', 'E', 'F', 'GV', 'HD', 'HQ', 'HV', 'JK',
+              'KF', 'LB', 'ML', 'MT', 'N', 'NA', 'PN', 'PR', 'PS', 'QA', 'QC',
+              'QH', 'R', 'RC', 'TK', 'Z')
+SUDOC_AGENCIES = ('A', 'C', 'D', 'E', 'EP', 'GA', 'HE', 'I', 'J', 'L', 'LC',
+                  'NAS', 'PREX', 'S', 'T', 'Y')
+LOCAL_PREFIXES = ('LPCD', 'CD', 'DVD', 'MFICHE', 'MFILM', 'VC', 'LP', 'AC')
+
+
+def _cutter(rng):
+    return '{}{}'.format(rng.choice('ABCDEFGHJKLMNPRSTWZ'),
+                         rng.randint(1, 999))
+
+
+def lc_callnumber(rng):
+    cn = '{}{}{}'.format(rng.choice(LC_CLASSES),
+                         rng.choice(('', ' ')), rng.randint(1, 9999))
+    if rng.random() < 0.3:
+        cn = '{}.{}'.format(cn, rng.randint(1, 99))
+    cn = '{} .{}'.format(cn, _cutter(rng))
+    if rng.random() < 0.4:
+        cn = '{} {}'.format(cn, _cutter(rng))
+    if rng.random() < 0.7:
+        cn = '{} {}'.format(cn, rng.randint(1900, 2023))
+    if rng.random() < 0.2:
+        cn = '{} {}'.format(cn, rng.choice(('v. ', 'c. ', 'no. ', 'pt. ')) +
+                            str(rng.randint(1, 40)))
+    return cn.lower() if rng.random() < 0.1 else cn
+
+
+def dewey_callnumber(rng):
+    cn = '{:03d}'.format(rng.randint(0, 999))
+    if rng.random() < 0.8:
+        cn = '{}.{}'.format(cn, rng.randint(1, 9999))
+    cn = '{} {}{}'.format(cn, _cutter(rng), rng.choice(('', 'a', 'b', 't')))
+    if rng.random() < 0.3:
+        cn = '{} {}'.format(cn, rng.randint(1900, 2023))
+    if rng.random() < 0.2:
+        cn = '{} {}'.format(cn, rng.choice(('v.', 'bk.', 'c.')) +
+                            str(rng.randint(1, 12)))
+    return cn
+
+
+def sudoc_callnumber(rng):
+    stem = '{} {}.{}'.format(rng.choice(SUDOC_AGENCIES), rng.randint(1, 99),
+                             rng.randint(1, 999))
+    if rng.random() < 0.3:
+        stem = '{}/{}'.format(stem, rng.randint(1, 20))
+    book = '{}'.format(rng.randint(1, 999))
+    if rng.random() < 0.5:
+        book = '{} {}/{}'.format(rng.choice('ABCDEFGMPRST'),
+                                 rng.randint(1, 99), rng.randint(990, 999))
+    elif rng.random() < 0.5:
+        book = '{}-{}'.format(rng.randint(1, 999), rng.randint(1, 99))
+    return '{}:{}'.format(stem, book)
+
+
+def local_callnumber(rng):
+    cn = '{} {}'.format(rng.choice(LOCAL_PREFIXES), rng.randint(1, 99999))
+    if rng.random() < 0.3:
+        cn = '{} {:,}'.format(rng.choice(LOCAL_PREFIXES),
+                              rng.randint(1000, 999999))
+    if rng.random() < 0.4:
+        cn = '{} {}'.format(cn, rng.choice('abcd'))
+    return cn
+
+
+GENERATORS = {
+    'LC': lc_callnumber,
+    'Dewey': dewey_callnumber,
+    'SuDoc': sudoc_callnumber,
+    'Local': local_callnumber,
+}
+
+
+def make_corpus(kind, size, seed=0):
+    """Return a list of ``size`` call number strings of the given
+    ``kind`` (a key in GENERATORS, or 'mixed' for all kinds,
+    interleaved at random)."""
+    rng = random.Random('{}-{}'.format(kind, seed))
+    if kind == 'mixed':
+        generators = [GENERATORS[k] for k in sorted(GENERATORS)]
+        return [rng.choice(generators)(rng) for _ in range(size)]
+    return [GENERATORS[kind](rng) for _ in range(size)]
@@ -0,0 +1,69 @@
+"""Measure how long it takes to derive custom Unit types.
+
+Derives several hundred simple, number, and compound Unit types, like
+a configuration-driven local call number scheme might at startup, and
+reports the average time per ``derive`` call for each kind.
+
+Run from the repository root:
+
+    python benchmarks/derive.py
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+import timeit
+
+from pycallnumber import units as uns
+
+
+def derive_alphabetic(i):
+    return uns.Alphabetic.derive(classname='Prefix{}'.format(i),
+                                 min_length=1, max_length=i % 5 + 1)
+
+
+def derive_numeric(i):
+    return uns.Numeric.derive(classname='Volume{}'.format(i),
+                              max_val=10 ** (i % 6 + 1))
+
+
+def derive_number(i):
+    return uns.Number.derive(classname='ClassNumber{}'.format(i),
+                             min_val=0, max_val=i + 1, max_decimal_places=3)
+
+
+def derive_compound(i):
+    return uns.AlphaNumeric.derive(
+        classname='Shelf{}'.format(i),
+        groups=[
+            {'name': 'prefix', 'min': 1, 'max': 1,
+             'type': derive_alphabetic(i)},
+            {'name': 'number', 'min': 1, 'max': 1,
+             'type': derive_numeric(i)},
+        ])
+
+
+DERIVERS = (
+    ('Alphabetic', derive_alphabetic),
+    ('Numeric', derive_numeric),
+    ('Number', derive_number),
+    ('AlphaNumeric (with 2 parts)', derive_compound),
+)
+
+
+def bench_derive(count=300):
+    results = []
+    for label, deriver in DERIVERS:
+        seconds = min(timeit.repeat(lambda: [deriver(i) for i in range(count)],
+                                    number=1, repeat=3))
+        results.append((label, seconds / count))
+    return results
+
+
+def main():
+    print('{:>28}  {:>14}'.format('unit type', 'per derive (us)'))
+    for label, seconds in bench_derive():
+        print('{:>28}  {:>14.0f}'.format(label, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
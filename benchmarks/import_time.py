@@ -0,0 +1,47 @@
+"""Measure how long it takes to import and start using pycallnumber.
+
+Each statement runs in a fresh Python interpreter, so that nothing is
+already imported or cached. Times are the best of several runs, minus
+the time it takes to start an interpreter that runs nothing.
+
+Run from the repository root:
+
+    python benchmarks/import_time.py
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+import subprocess
+import sys
+import timeit
+
+
+STATEMENTS = (
+    'import pycallnumber',
+    'import pycallnumber; pycallnumber.__version__',
+    'import pycallnumber; pycallnumber.units.LC',
+    'import pycallnumber; pycallnumber.units.LC("MT 1001 .C35 B40 1992")',
+    'import pycallnumber; pycallnumber.callnumber("MT 1001 .C35 B40 1992")',
+)
+
+
+def time_statement(statement, repeat=5):
+    command = [sys.executable, '-c', statement]
+    return min(timeit.repeat(lambda: subprocess.check_call(command),
+                             number=1, repeat=repeat))
+
+
+def bench_imports(statements=STATEMENTS, repeat=5):
+    startup = time_statement('pass', repeat)
+    return [(statement, time_statement(statement, repeat) - startup)
+            for statement in statements]
+
+
+def main():
+    print('{:>70}  {:>9}'.format('statement', 'time (ms)'))
+    for statement, seconds in bench_imports():
+        print('{:>70}  {:>9.0f}'.format(statement, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Measure the memory used by parsed call numbers.
+
+Parses a batch of call number strings of each of several types, keeps
+the resulting Unit objects, and reports how many bytes were allocated
+for each call number, along with how many Unit objects make up each
+one. Uses ``tracemalloc``, so it requires Python 3.4 or later.
+
+Run from the repository root:
+
+    python benchmarks/memory.py
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+import gc
+import tracemalloc
+
+from pycallnumber import units
+
+
+NUM_CALLNUMBERS = 2000
+CALLNUMBER_FORMATS = (
+    (units.LC, 'MS {0}.C{1} R{2} {3}'),
+    (units.Dewey, '{0}.{1} C{2}t bk.{1}'),
+    (units.SuDoc, 'A {1}.{2}:C {0}/{2}-{1}/{3}'),
+    (units.Local, 'LPCD {0},{1}{2} a.'),
+)
+
+
+def make_strings(fmt, number=NUM_CALLNUMBERS):
+    return [fmt.format(100 + i % 900, i % 90 + 1, i % 70 + 1, 1900 + i % 100)
+            for i in range(number)]
+
+
+def count_units(unit):
+    return 1 + sum([count_units(part) for part in getattr(unit, '_parts', [])
+                    if part is not None])
+
+
+def measure(unittype, strings):
+    # Parse one call number first so that class-level caches, such as
+    # compiled template regexes, are not counted.
+    unittype(strings[0])
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parsed = [unittype(cnstr) for cnstr in strings]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(parsed), count_units(parsed[0])
+
+
+def main():
+    print('{:>8}  {:>16}  {:>16}'.format('type', 'bytes per cn',
+                                         'units per cn'))
+    for unittype, fmt in CALLNUMBER_FORMATS:
+        bytes_per, num_units = measure(unittype, make_strings(fmt))
+        print('{:>8}  {:>16.0f}  {:>16}'.format(unittype.__name__, bytes_per,
+                                                num_units))
+
+
+if __name__ == '__main__':
+    main()
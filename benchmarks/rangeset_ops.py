@@ -0,0 +1,60 @@
+"""Benchmark RangeSet set operations on large RangeSets.
+
+Builds pairs of RangeSets with interleaved, partially overlapping
+ranges, like merged shelving maps, and times union (|), intersection
+(&), difference (-), and symmetric difference (^) for increasing
+numbers of ranges.
+
+Run from the repository root:
+
+    python benchmarks/rangeset_ops.py
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+import operator
+import timeit
+
+from pycallnumber import units
+from pycallnumber.set import RangeSet
+
+
+SIZES = (10, 100, 1000, 3000)
+OPERATIONS = (('|', operator.or_), ('&', operator.and_),
+              ('-', operator.sub), ('^', operator.xor))
+
+
+def make_rangeset(num_ranges, offset):
+    ranges = []
+    for i in range(num_ranges):
+        start = i * 10 + offset
+        ranges.append((units.Numeric(str(start)),
+                       units.Numeric(str(start + 5))))
+    return RangeSet(*ranges)
+
+
+def time_call(function, number):
+    return timeit.timeit(function, number=number) / number
+
+
+def bench_operations(sizes=SIZES, number=3):
+    results = []
+    for size in sizes:
+        rset1, rset2 = make_rangeset(size, 0), make_rangeset(size, 3)
+        times = [time_call(lambda: op(rset1, rset2), number)
+                 for _, op in OPERATIONS]
+        results.append((size, times))
+    return results
+
+
+def main():
+    header = ['ranges'] + ['{} (ms)'.format(sym) for sym, _ in OPERATIONS]
+    print('    '.join(['{:>8}'.format(h) for h in header]))
+    for size, times in bench_operations():
+        row = ['{:>8}'.format(size)]
+        row.extend(['{:>8.1f}'.format(t * 1000) for t in times])
+        print('    '.join(row))
+
+
+if __name__ == '__main__':
+    main()
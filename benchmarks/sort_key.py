@@ -0,0 +1,57 @@
+"""Compare getting sort keys via ``sort_key`` and via Unit objects.
+
+For several types of call numbers, times ``sort_key(cnstr)`` against
+``callnumber(cnstr).for_sort()``, using the default Unit types, and
+checks that both return the same values.
+
+Run from the repository root:
+
+    python benchmarks/sort_key.py
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+import timeit
+
+import pycallnumber as pycn
+
+
+CALLNUMBERS = (
+    'MT 1001 .C35 B40 1992',
+    'QA76.73.P98 C35 2001 v. 1',
+    '500.1 C226t bk.2',
+    'A 1.2:C 35/2-3/994',
+    'LPCD 100,001 a',
+    'not a call number',
+)
+
+
+def unit_sort_key(cnstr):
+    unit = pycn.callnumber(cnstr, quiet=True)
+    return unit.for_sort() if unit else None
+
+
+def time_call(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def bench_sort_keys(cnstrs=CALLNUMBERS, number=100):
+    results = []
+    for cnstr in cnstrs:
+        assert pycn.sort_key(cnstr) == unit_sort_key(cnstr)
+        with_units = time_call(lambda: unit_sort_key(cnstr), number)
+        without_units = time_call(lambda: pycn.sort_key(cnstr), number)
+        results.append((cnstr, with_units, without_units))
+    return results
+
+
+def main():
+    print('{:>28}  {:>12}  {:>14}'.format('call number', 'units (us)',
+                                          'sort_key (us)'))
+    for cnstr, with_units, without_units in bench_sort_keys():
+        print('{:>28}  {:>12.0f}  {:>14.0f}'.format(cnstr, with_units * 1e6,
+                                                    without_units * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark splitting long, unbounded groupings into parts.
+
+The ``parts`` grouping on ``Local`` and the ``parts`` grouping on
+``Item`` both use ``max: None``, so the cost of splitting them grows
+with the length of the string. This times ``Grouping._split_string``
+directly, as well as parsing the full Unit, for strings of increasing
+length.
+
+Run from the repository root:
+
+    python benchmarks/split.py
+"""
+
+from __future__ import unicode_literals
+from __future__ import print_function
+import timeit
+
+from pycallnumber import units
+
+
+LOCAL_TOKEN = 'LPCD 100,001 a.'
+ITEM_TOKEN = 'v. 1 c. 2 supp.'
+SIZES = (1, 10, 50, 200)
+
+
+def make_string(token, size):
+    return ' '.join([token] * size)
+
+
+def time_call(function, number):
+    return timeit.timeit(function, number=number) / number
+
+
+def bench_split(unittype, token, sizes=SIZES, number=20):
+    grouping = unittype.template.groupings[0]
+    results = []
+    for size in sizes:
+        string = make_string(token, size)
+        split = time_call(lambda: grouping._split_string(string, {}), number)
+        parse = time_call(lambda: unittype(string), number)
+        results.append((len(string), split, parse))
+    return results
+
+
+def main():
+    for unittype, token in ((units.Local, LOCAL_TOKEN),
+                            (units.Item, ITEM_TOKEN)):
+        print('{}:'.format(unittype.__name__))
+        print('    {:>8}  {:>14}  {:>14}'.format('chars', 'split (ms)',
+                                                 'parse (ms)'))
+        for length, split, parse in bench_split(unittype, token):
+            row = (length, split * 1000, parse * 1000)
+            print('    {:>8}  {:>14.3f}  {:>14.3f}'.format(*row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""Benchmarks for parsing, sorting, and RangeSet operations.
+
+Each benchmark function takes a corpus ``size`` and a ``repeat`` count
+and returns a list of result dicts, one per case it times. Each
+result has the benchmark name, the params that identify the case, the
+number of items processed, and the best and mean times over
+``repeat`` runs, in seconds.
+"""
+
+from __future__ import unicode_literals
+import collections
+import operator
+import timeit
+
+import pycallnumber as pycn
+from pycallnumber.set import RangeSet
+
+from benchmarks.corpus import GENERATORS, make_corpus
+
+
+UNIT_KINDS = sorted(GENERATORS)
+RANGESET_OPERATIONS = (('|', operator.or_), ('&', operator.and_),
+                       ('-', operator.sub))
+
+
+def make_result(benchmark, params, items, times):
+    return {
+        'benchmark': benchmark,
+        'params': params,
+        'items': items,
+        'best': min(times),
+        'mean': sum(times) / len(times),
+    }
+
+
+def time_runs(function, repeat, setup=None):
+    # ``setup`` runs before each timed run but is not timed.
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        times.append(timeit.timeit(function, number=1))
+    return times
+
+
+def parse_corpus(kind, size, seed=0):
+    unittype = getattr(pycn.units, kind)
+    return [unittype(cnstr) for cnstr in make_corpus(kind, size, seed)]
+
+
+def cache_clearer(units):
+    # Units (and their parts) cache their sort keys, so runs that use
+    # them start with cleared caches.
+    def clear_caches():
+        pending = list(units)
+        while pending:
+            unit = pending.pop()
+            unit.clear_cache()
+            pending.extend([part for part in getattr(unit, '_parts', [])
+                            if part is not None])
+    return clear_caches
+
+
+def bench_dispatch(size, repeat):
+    """Time the ``callnumber`` factory detecting the type of each
+    string in a mixed corpus."""
+    corpus = make_corpus('mixed', size)
+    times = time_runs(lambda: [pycn.callnumber(c, quiet=True)
+                               for c in corpus], repeat)
+    return [make_result('dispatch', {'size': size}, size, times)]
+
+
+def bench_parse(size, repeat):
+    """Time parsing strings of each kind as that Unit type."""
+    results = []
+    for kind in UNIT_KINDS:
+        unittype, corpus = getattr(pycn.units, kind), make_corpus(kind, size)
+        times = time_runs(lambda: [unittype(c) for c in corpus], repeat)
+        results.append(make_result('parse', {'type': kind, 'size': size},
+                                   size, times))
+    return results
+
+
+def bench_for_sort(size, repeat):
+    """Time ``for_sort`` on parsed Units of each kind, starting each
+    run with no cached sort keys."""
+    results = []
+    for kind in UNIT_KINDS:
+        units = parse_corpus(kind, size)
+        times = time_runs(lambda: [unit.for_sort() for unit in units],
+                          repeat, cache_clearer(units))
+        results.append(make_result('for_sort', {'type': kind, 'size': size},
+                                   size, times))
+    return results
+
+
+def bench_sorted(size, repeat):
+    """Time ``sorted`` on parsed Units of each kind and of a mixed
+    corpus, starting each run with no cached sort keys."""
+    results = []
+    for kind in UNIT_KINDS + ['mixed']:
+        if kind == 'mixed':
+            units = [pycn.callnumber(c) for c in make_corpus(kind, size)]
+        else:
+            units = parse_corpus(kind, size)
+        times = time_runs(lambda: sorted(units), repeat,
+                          cache_clearer(units))
+        results.append(make_result('sorted', {'type': kind, 'size': size},
+                                   size, times))
+    return results
+
+
+def make_rangeset(size, seed):
+    units = sorted(parse_corpus('LC', size * 2, seed))
+    return RangeSet(*zip(units[::2], units[1::2]))
+
+
+def bench_rangeset(size, repeat):
+    """Time RangeSet union, intersection, and difference for two sets
+    of ``size`` LC ranges each, and ``in`` for ``size`` LC call numbers
+    against one set."""
+    rset1, rset2 = make_rangeset(size, 1), make_rangeset(size, 2)
+    results = []
+    for symbol, op in RANGESET_OPERATIONS:
+        times = time_runs(lambda: op(rset1, rset2), repeat)
+        results.append(make_result('rangeset', {'op': symbol, 'size': size},
+                                   size, times))
+    probes = parse_corpus('LC', size, 3)
+    times = time_runs(lambda: [probe in rset1 for probe in probes], repeat)
+    results.append(make_result('rangeset', {'op': 'in', 'size': size}, size,
+                               times))
+    return results
+
+
+BENCHMARKS = collections.OrderedDict([
+    ('dispatch', bench_dispatch),
+    ('parse', bench_parse),
+    ('for_sort', bench_for_sort),
+    ('sorted', bench_sorted),
+    ('rangeset', bench_rangeset),
+])
+
+
+def run(names=None, sizes=(100, 1000), repeat=3):
+    """Run the named benchmarks (default: all) at each size and return
+    a list of all of the results."""
+    results = []
+    for name in names or list(BENCHMARKS):
+        for size in sizes:
+            results.extend(BENCHMARKS[name](size, repeat))
+    return results
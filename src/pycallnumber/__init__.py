@@ -6,40 +6,66 @@ them.
 """
 
 from __future__ import absolute_import
-
-try:
-    from importlib import metadata
-except ImportError:
-    import importlib_metadata as metadata
+import sys
 
 from pycallnumber import settings
 from pycallnumber.exceptions import CallNumberError, CallNumberWarning,\
                                     InvalidCallNumberStringError,\
+                                    ValidationFailure,\
                                     SettingsError, MethodError, OptionsError,\
                                     UtilsError, RangeSetError, BadRange
 from pycallnumber.options import Options, ObjectWithOptions
 from pycallnumber.template import Template, SimpleTemplate, CompoundTemplate,\
                                   Grouping
 from pycallnumber.unit import Unit, SimpleUnit, CompoundUnit
-from pycallnumber.set import RangeSet
+from pycallnumber.set import RangeSet, RangeSetClassifier
 from pycallnumber import units
 from pycallnumber import utils
-from pycallnumber.factories import callnumber, cnrange, cnset
+from pycallnumber.factories import callnumber, callnumbers, cnrange, cnset,\
+                                   sort_key
 
-_md = metadata.metadata('pycallnumber')
-__version__ = metadata.version('pycallnumber')
 __name__ = 'pycallnumber'
-__url__ = _md['Home-page']
-__description__ = _md['Summary']
-__license__ = _md['License']
-__author__ = _md['Author']
-__author_email__ = _md['Author-email']
-__maintainer__ = _md['Maintainer']
-__keywords__ = _md['Keywords']
 __all__ = ['settings', 'CallNumberError', 'CallNumberWarning',
-           'InvalidCallNumberStringError', 'SettingsError', 'MethodError',
+           'InvalidCallNumberStringError', 'ValidationFailure',
+           'SettingsError', 'MethodError',
            'OptionsError', 'UtilsError', 'RangeSetError', 'BadRange',
            'Options', 'ObjectWithOptions', 'Template', 'SimpleTemplate',
            'CompoundTemplate', 'Grouping', 'Unit', 'SimpleUnit',
-           'CompoundUnit', 'RangeSet', 'units',
-           'utils', 'callnumber', 'cnrange', 'cnset']
+           'CompoundUnit', 'RangeSet', 'RangeSetClassifier', 'units',
+           'utils', 'callnumber', 'callnumbers', 'cnrange', 'cnset',
+           'sort_key']
+
+# Reading the package metadata is relatively slow, so the metadata
+# attributes are only looked up when one of them is first used.
+_METADATA_FIELDS = {
+    '__url__': 'Home-page',
+    '__description__': 'Summary',
+    '__license__': 'License',
+    '__author__': 'Author',
+    '__author_email__': 'Author-email',
+    '__maintainer__': 'Maintainer',
+    '__keywords__': 'Keywords',
+}
+
+
+def _load_metadata():
+    try:
+        from importlib import metadata
+    except ImportError:
+        import importlib_metadata as metadata
+    md = metadata.metadata('pycallnumber')
+    values = {name: md[field] for name, field in _METADATA_FIELDS.items()}
+    values['__version__'] = metadata.version('pycallnumber')
+    globals().update(values)
+    return values
+
+
+def __getattr__(name):
+    if name == '__version__' or name in _METADATA_FIELDS:
+        return _load_metadata()[name]
+    msg = 'module {!r} has no attribute {!r}'
+    raise AttributeError(msg.format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    _load_metadata()
@@ -0,0 +1,10 @@
+"""Run the pycallnumber command-line tool; see ``pycallnumber.cli``."""
+
+from __future__ import absolute_import
+import sys
+
+from pycallnumber.cli import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""Normalize call numbers in CSV/TSV data from the command line.
+
+Reads rows from a file or stdin, parses the call number in one column
+of each row, and writes each row back out with ``for_sort``,
+``for_search``, ``unittype``, and ``error`` columns added. Run
+``python -m pycallnumber --help`` for usage.
+"""
+
+from __future__ import unicode_literals
+from __future__ import absolute_import
+from builtins import zip
+import argparse
+import io
+import itertools
+import sys
+
+from pycallnumber import settings
+from pycallnumber.exceptions import CallNumberError
+from pycallnumber.parallel import normalize
+from pycallnumber.registry import UnitRegistry
+from pycallnumber import utils as u
+
+
+OUTPUT_COLUMNS = ['for_sort', 'for_search', 'unittype', 'error']
+
+
+def normalize_rows(rows, column=0, useropts=None, unittypes=None, workers=1,
+                   chunksize=500):
+    """Normalize the call number in one column of each row.
+
+    ``rows`` is an iterable of lists of strings (such as a
+    ``csv.reader``), and ``column`` is the index of the column that
+    contains the call number; rows that are too short are padded with
+    blanks to include it. Yields each row, in input order, with the
+    values of OUTPUT_COLUMNS appended (blank where there is no value).
+    Rows are read lazily, so only a few chunks of rows per worker are
+    in memory at a time. Other args work as they do for
+    ``parallel.normalize``.
+    """
+    cnstr_rows, output_rows = itertools.tee(rows)
+    cnstrs = (row[column] if len(row) > column else ''
+              for row in cnstr_rows)
+    results = normalize(cnstrs, useropts=useropts, unittypes=unittypes,
+                        workers=workers, chunksize=chunksize)
+    for row, result in zip(output_rows, results):
+        row = list(row) + [''] * (column + 1 - len(row))
+        extra = [result.for_sort, result.for_search, result.unittype,
+                 result.error]
+        yield row + ['' if val is None else val for val in extra]
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m pycallnumber',
+        description=('Normalize the call numbers in one column of CSV or TSV '
+                     'data, adding {} columns to each row.'
+                     ''.format(', '.join(OUTPUT_COLUMNS))))
+    parser.add_argument('infile', nargs='?', default='-',
+                        help='the file to read (default: stdin)')
+    parser.add_argument('-o', '--outfile', default='-',
+                        help='the file to write (default: stdout)')
+    parser.add_argument('-c', '--column', default='1',
+                        help=('the column containing call numbers, as a '
+                              '1-based number or a header name '
+                              '(default: 1)'))
+    parser.add_argument('-d', '--delimiter', default=',',
+                        help='the field delimiter (default: ",")')
+    parser.add_argument('-t', '--tsv', action='store_const', dest='delimiter',
+                        const='\t', help='use tabs as the field delimiter')
+    parser.add_argument('--no-header', action='store_false', dest='header',
+                        help='the input does not have a header row')
+    parser.add_argument('-u', '--unit-types', nargs='+', metavar='TYPE',
+                        help=('path strings for the Unit types to try, in '
+                              'order (default: settings.DEFAULT_UNIT_TYPES)'))
+    parser.add_argument('--definitions', metavar='FILE',
+                        help=('a JSON or TOML Unit type definitions file; '
+                              'its default_types are tried, in order'))
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='the number of worker processes (default: 1)')
+    parser.add_argument('--chunksize', type=int, default=500,
+                        help=('the number of rows sent to a worker at a time '
+                              '(default: 500)'))
+    parser.add_argument('--encoding', default='utf-8',
+                        help='the input and output encoding (default: utf-8)')
+    return parser
+
+
+def main(argv=None):
+    """Run the command-line tool. Returns the exit status."""
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunksize < 1:
+        parser.error('--workers and --chunksize must be at least 1')
+    try:
+        unittypes = _get_unittypes(args)
+    except (CallNumberError, EnvironmentError, ValueError) as e:
+        parser.error('could not load unit types: {}'.format(e))
+    infile = _open(args.infile, 'r', sys.stdin, args.encoding)
+    outfile = _open(args.outfile, 'w', sys.stdout, args.encoding)
+    try:
+        reader = u.csv_reader(infile, args.delimiter)
+        writer = u.csv_writer(outfile, args.delimiter, lineterminator='\n')
+        header = next(reader, None) if args.header else None
+        column = _get_column_index(args.column, header)
+        if column is None:
+            parser.error('column {!r} not found'.format(args.column))
+        if header is not None:
+            writer.writerow(header + OUTPUT_COLUMNS)
+        writer.writerows(normalize_rows(reader, column, unittypes=unittypes,
+                                        workers=args.workers,
+                                        chunksize=args.chunksize))
+    finally:
+        _close(infile, args.infile)
+        _close(outfile, args.outfile)
+    return 0
+
+
+def _get_unittypes(args):
+    if args.definitions:
+        return UnitRegistry(args.definitions).default_types
+    return args.unit_types or settings.DEFAULT_UNIT_TYPES
+
+
+def _get_column_index(column, header):
+    if column.isdigit():
+        index = int(column) - 1
+        return index if index >= 0 else None
+    if header is not None and column in header:
+        return header.index(column)
+    return None
+
+
+def _open(filename, mode, std_stream, encoding):
+    if filename != '-':
+        return io.open(filename, mode, encoding=encoding, newline='')
+    # On Python 3, stdin/stdout are wrapped to use the given encoding.
+    if hasattr(std_stream, 'buffer'):
+        return io.TextIOWrapper(std_stream.buffer, encoding=encoding,
+                                newline='')
+    # On Python 2, they are byte streams, so they're reopened as text.
+    if sys.version_info < (3,):
+        return io.open(std_stream.fileno(), mode, encoding=encoding,
+                       newline='', closefd=False)
+    return std_stream
+
+
+def _close(fh, filename):
+    if filename != '-':
+        fh.close()
+    elif isinstance(fh, io.TextIOWrapper):
+        # Detaching leaves the underlying stdin/stdout stream open.
+        fh.flush()
+        fh.detach()
@@ -2,6 +2,7 @@
 
 
 from __future__ import unicode_literals
+from builtins import object
 
 
 class CallNumberError(Exception):
@@ -19,6 +20,65 @@ class InvalidCallNumberStringError(CallNumberError):
     pass
 
 
+class ValidationFailure(object):
+    """Describe why a call number string failed validation.
+
+    The ``validate`` methods on Templates and Units return one of these
+    (instead of raising an InvalidCallNumberStringError) when called
+    with ``quiet=True``; when not quiet, it's what the raised error
+    wraps. Instances are always falsy.
+
+    ``reason`` is a short code for the type of failure, such as
+    'no_match', 'invalid_grouping', 'invalid_separator',
+    'out_of_range', or 'no_matching_type'.
+
+    Building a useful error message can take much more work than
+    validation itself, so the ``message`` is generated only when it's
+    first accessed. It may be given as a plain string; as a format
+    string, which is formatted with ``args``; or as a callable, which
+    is called with ``args`` and should return the message string.
+    """
+
+    def __init__(self, reason, message='', *args):
+        self.reason = reason
+        self._message = message
+        self._args = args
+
+    @classmethod
+    def from_error(cls, error, reason='invalid'):
+        """Get a ValidationFailure from an InvalidCallNumberStringError.
+
+        Returns the ValidationFailure that ``error`` was raised with,
+        if there is one; otherwise creates a new one using ``reason``
+        and the error message.
+        """
+        detail = error.args[0] if error.args else ''
+        if isinstance(detail, cls):
+            return detail
+        return cls(reason, detail)
+
+    @property
+    def message(self):
+        if callable(self._message):
+            self._message = self._message(*self._args)
+        elif self._args:
+            self._message = self._message.format(*self._args)
+        self._args = ()
+        return self._message
+
+    def __str__(self):
+        return self.message
+
+    def __repr__(self):
+        return '<{} \'{}\'>'.format(type(self).__name__, self.reason)
+
+    def __bool__(self):
+        return False
+
+    def __reduce__(self):
+        return (type(self), (self.reason, self.message))
+
+
 class SettingsError(CallNumberError):
     """General problem with settings passed to a Template or Unit."""
     pass
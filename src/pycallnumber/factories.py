@@ -1,12 +1,17 @@
 """Use factories to generate call number units and ranges."""
 from __future__ import absolute_import
+import collections
 
 from pycallnumber import settings
-from pycallnumber.utils import create_unit, load_class
-from pycallnumber.exceptions import InvalidCallNumberStringError, SettingsError
+from pycallnumber.utils import create_unit, create_unit_from_filtered,\
+                               filter_useropts_for_types, load_class,\
+                               pack_sort_key
+from pycallnumber.exceptions import InvalidCallNumberStringError,\
+                                    ValidationFailure, SettingsError
+from pycallnumber.normalizers import for_sort_from_filtered
 
 
-def callnumber(cnstr, name='', useropts=None, unittypes=None):
+def callnumber(cnstr, name='', useropts=None, unittypes=None, quiet=False):
     """Create a Unit object from a callnumber string.
 
     This function generates a Unit object that best matches the
@@ -25,19 +30,93 @@ def callnumber(cnstr, name='', useropts=None, unittypes=None):
     the given call number string is returned, so order matters.
     Defaults are found in settings.DEFAULT_UNIT_TYPES. Pass your own
     list to override the default.
+
+    By default, an InvalidCallNumberStringError is raised if the call
+    number string does not match any of the Unit types. Set ``quiet``
+    to True to return a (falsy) ValidationFailure object instead; its
+    error message is only generated if you access it, which saves
+    time when you expect many strings not to match.
     """
     useropts = useropts or {}
     utypes = unittypes or [load_class(t) for t in settings.DEFAULT_UNIT_TYPES]
     cn_unit = create_unit(cnstr, utypes, useropts, name)
     if cn_unit is None:
-        types_str = ', '.join(['{}'.format(ut.__name__) for ut in utypes])
-        msg = ('The provided call number string \'{}\' did not match any '
-               'of the following known call number types: {}'
-               ''.format(cnstr, types_str))
-        raise InvalidCallNumberStringError(msg)
+        failure = ValidationFailure('no_matching_type',
+                                    _generate_no_matching_type_message,
+                                    cnstr, utypes)
+        if quiet:
+            return failure
+        raise InvalidCallNumberStringError(failure)
     return cn_unit
 
 
+ParseResult = collections.namedtuple('ParseResult', ['cnstr', 'unit', 'error'])
+
+
+def callnumbers(cnstrs, name='', useropts=None, unittypes=None):
+    """Create Unit objects from an iterable of call number strings.
+
+    This is a generator that works like calling ``callnumber`` on each
+    string in ``cnstrs``, but it is more efficient for large batches:
+    the list of Unit types is resolved, and ``useropts`` are filtered
+    for each type, only once for the whole batch.
+
+    Each string produces a ParseResult namedtuple, with fields
+    ``cnstr``, ``unit``, and ``error``, in the same order as the input.
+    Invalid strings do not raise errors. When a string does not match
+    any of the Unit types, ``unit`` is None and ``error`` is a (falsy)
+    ValidationFailure object; otherwise ``error`` is None.
+
+    The ``name``, ``useropts``, and ``unittypes`` kwargs work the same
+    as they do for ``callnumber``.
+    """
+    utypes = unittypes or [load_class(t) for t in settings.DEFAULT_UNIT_TYPES]
+    types_and_opts = filter_useropts_for_types(utypes, useropts)
+    for cnstr in cnstrs:
+        cn_unit = create_unit_from_filtered(cnstr, types_and_opts, name)
+        error = None
+        if cn_unit is None:
+            error = ValidationFailure('no_matching_type',
+                                      _generate_no_matching_type_message,
+                                      cnstr, utypes)
+        yield ParseResult(cnstr, cn_unit, error)
+
+
+def sort_key(cnstr, useropts=None, unittypes=None, packed=False):
+    """Get the sort string for a call number string.
+
+    This returns exactly what ``callnumber(cnstr).for_sort()`` would,
+    given the same ``useropts`` and ``unittypes``, or None if the call
+    number string does not match any of the Unit types. But it is much
+    faster when all you need is a sort key, such as for sorting or
+    indexing a large number of call numbers: for most Unit types, the
+    string is normalized directly from the template regexes, and no
+    Unit objects are created.
+
+    Unit types that customize how they sort or validate in other
+    ways, such as the date types (which may be part of an Item), are
+    still created as Unit objects, but only for the part of the call
+    number string that matches that type.
+
+    ``useropts`` and ``unittypes`` work the same as they do for
+    ``callnumber``. Set ``packed`` to True to get the sort string
+    packed into a compact bytes key (see ``utils.pack_sort_key``).
+    """
+    utypes = unittypes or [load_class(t) for t in settings.DEFAULT_UNIT_TYPES]
+    types_and_opts = filter_useropts_for_types(utypes, useropts)
+    key = for_sort_from_filtered(cnstr, types_and_opts)
+    if packed and key is not None:
+        return pack_sort_key(key)
+    return key
+
+
+def _generate_no_matching_type_message(cnstr, utypes):
+    types_str = ', '.join(['{}'.format(ut.__name__) for ut in utypes])
+    return ('The provided call number string \'{}\' did not match any of '
+            'the following known call number types: {}'
+            ''.format(cnstr, types_str))
+
+
 def cnrange(start, end, startname='', endname='', useropts=None,
             unittypes=None, rangesettype=None):
     """Create a contiguous RangeSet-type object.
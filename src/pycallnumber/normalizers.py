@@ -0,0 +1,473 @@
+"""Generate call number sort keys without creating Unit objects."""
+
+from __future__ import unicode_literals
+from __future__ import absolute_import
+from builtins import str
+import collections
+
+from pycallnumber import settings
+from pycallnumber.options import Options
+from pycallnumber.exceptions import InvalidCallNumberStringError
+from pycallnumber.unit import Unit, SimpleUnit, CompoundUnit
+from pycallnumber import utils as u
+
+
+SortPart = collections.namedtuple('SortPart', ['for_sort', 'is_separator',
+                                               'is_formatting'])
+
+
+def for_sort_from_filtered(cnstr, types_and_opts):
+    """Return the sort string for the first type ``cnstr`` matches.
+
+    ``types_and_opts`` is a list of (unit_type, opts) tuples, as
+    returned by ``utils.filter_useropts_for_types``. The return value
+    is the same as calling ``for_sort`` on the Unit that
+    ``utils.create_unit_from_filtered`` would create, or None if no
+    type matches.
+    """
+    normalizers = [(get_sort_normalizer(t), opts)
+                   for t, opts in types_and_opts]
+    part = _first_sort_part(cnstr, normalizers)
+    return None if part is None else part.for_sort
+
+
+@u.memoize(maxsize=1000)
+def get_sort_normalizer(unittype):
+    """Get a function that normalizes strings as ``unittype``.
+
+    The returned function takes a string and a dict of options, like
+    the ``cnstr`` and ``useropts`` you would use to instantiate
+    ``unittype``, and returns a SortPart namedtuple, with the
+    ``for_sort`` value, ``is_separator``, and ``is_formatting`` of the
+    equivalent Unit. It returns None if the string is not valid.
+
+    Units that use the standard validation and ``for_sort`` behavior
+    (including all of the basic simple, compound, and number types),
+    as well as the label parts of Item and the SuDoc types, are
+    normalized directly from their templates. Any Unit type that
+    customizes ``__init__``, ``validate``, or ``for_sort`` in some
+    other way (such as the date types), or that is defined outside of
+    pycallnumber and overrides any methods, or has a template that
+    does, is normalized by creating a Unit object as usual, but only
+    for the part of the string that matched that type.
+
+    Normalizers are cached for up to 1000 Unit types.
+    """
+    if _has_custom_methods(unittype) or\
+            _has_custom_methods(type(unittype.template)):
+        return _make_unit_normalizer(unittype)
+    init, validate = _get_function(unittype, '__init__'),\
+        _get_function(unittype, 'validate')
+    for_sort = _get_function(unittype, 'for_sort')
+    simple_validators, simple_sorters, compound_inits, compound_validators,\
+        compound_sorters = _get_known_functions()
+    if issubclass(unittype, SimpleUnit):
+        supported = (init is _get_function(Unit, '__init__') and
+                     validate in simple_validators and
+                     for_sort in simple_sorters)
+        if supported:
+            return _make_simple_normalizer(unittype, simple_sorters[for_sort])
+    elif issubclass(unittype, CompoundUnit):
+        supported = (init in compound_inits and
+                     validate in compound_validators and
+                     for_sort in compound_sorters)
+        if supported:
+            return _make_compound_normalizer(unittype, compound_inits[init],
+                                             compound_validators[validate],
+                                             compound_sorters[for_sort])
+    return _make_unit_normalizer(unittype)
+
+
+# The base ``object`` is in ``builtins`` (``__builtin__`` on Python 2,
+# where ``builtins.object`` is from ``future``).
+_OWN_MODULES = ('pycallnumber', 'builtins', '__builtin__', 'future')
+
+
+def _has_custom_methods(cls):
+    # Methods of pycallnumber's own classes are either reimplemented
+    # here or don't affect sorting; a method defined anywhere else
+    # might do anything. Classes (such as Unit types made via
+    # ``derive``) that only set attributes are fine.
+    for base in cls.__mro__:
+        if base.__module__.split('.')[0] in _OWN_MODULES:
+            continue
+        for value in vars(base).values():
+            if isinstance(value, (classmethod, staticmethod, property)) or\
+                    (callable(value) and not isinstance(value, type)):
+                return True
+    return False
+
+
+def _get_function(unittype, attribute):
+    method = getattr(unittype, attribute)
+    return getattr(method, '__func__', method)
+
+
+def _make_unit_normalizer(unittype):
+    def normalize(cnstr, opts):
+        if not u.could_be_unit_type(cnstr, unittype):
+            return None
+        try:
+            unit = unittype(cnstr, **opts)
+        except InvalidCallNumberStringError:
+            return None
+        return SortPart(unit.for_sort(), unit.is_separator, unit.is_formatting)
+    return normalize
+
+
+def _make_simple_normalizer(unittype, sorter):
+    regex = unittype.get_template_regex(match_whole=True)
+    # Unit.validate only checks the same regex.
+    check_value = (_get_function(unittype, 'validate') is not
+                   _get_function(Unit, 'validate'))
+
+    def normalize(cnstr, opts):
+        if not regex.match(cnstr):
+            return None
+        options = Options.get_shared(unittype, opts)
+        if check_value and not unittype.validate(cnstr, options, quiet=True):
+            return None
+        return SortPart(sorter(unittype, cnstr, options),
+                        options['is_separator'], unittype.is_formatting)
+    return normalize
+
+
+def _make_compound_normalizer(unittype, adjust_parts, value_is_valid,
+                              sorter):
+    template = unittype.template
+    regex = template.get_regex(True, True)
+    groupings = [_CompiledGrouping(g) for g in template.groupings]
+
+    def normalize(cnstr, opts):
+        match = regex.match(cnstr)
+        if match is None:
+            return None
+        options = Options.get_shared(unittype, opts)
+        if not value_is_valid(unittype, cnstr):
+            return None
+        try:
+            parts = _match_to_sort_parts(template, groupings, match, cnstr,
+                                         options)
+            if adjust_parts is not None:
+                parts = adjust_parts(unittype, match, parts)
+        except (InvalidCallNumberStringError, IndexError):
+            # The Unit would fall back to parsing ``cnstr`` one
+            # grouping at a time. And a part's sort value is computed
+            # here while parsing, but a Unit only computes it (raising
+            # an IndexError if a compound's first part is formatting
+            # that is used in sorting) if ``cnstr`` parses. So in
+            # either case, let the Unit decide.
+            return _make_unit_normalizer(unittype)(cnstr, opts)
+        return SortPart(sorter(unittype, cnstr, parts),
+                        options['is_separator'], unittype.is_formatting)
+    return normalize
+
+
+class _CompiledGrouping(object):
+    """Hold what's needed to normalize the parts of one Grouping.
+
+    The regexes come from the Grouping. The normalizers for each of
+    the possible Unit types, paired with the options to pass to them,
+    depend on the options of the parent Unit; these are created the
+    first time they are needed for a given (shared) Options object.
+    Like shared Options objects, no more than
+    ``settings.DEFAULT_MAX_SHARED_OPTIONS`` of these are kept; the
+    least recently used are discarded first.
+    """
+
+    def __init__(self, grouping):
+        self.grouping = grouping
+        self.part_regex = grouping._get_split_part_regex()
+        self.sep_regex = grouping.get_inner_separator_regex()
+        self.outer_sep_regex = None
+        if grouping.outer_sep_group:
+            self.outer_sep_regex = grouping._get_outer_sep_split_regex()
+        self._normalizers = collections.OrderedDict()
+
+    def get_normalizers(self, options):
+        """Get normalizers for parts, inner seps, and outer seps.
+
+        Returns a tuple of three lists of (normalizer, opts) tuples.
+        """
+        entry = self._normalizers.pop(id(options), None)
+        if entry is None or entry[0] is not options:
+            g = self.grouping
+            osep_types = getattr(g.outer_sep_group, 'types', [])
+            entry = (options, (_pair_normalizers(g.types, options),
+                               _pair_normalizers([g.inner_sep_type], options,
+                                                 True),
+                               _pair_normalizers(osep_types, options, True)))
+        # Keeping a reference to ``options`` means its id can't be
+        # reused while it's in the cache.
+        if options.is_shared:
+            if len(self._normalizers) >= settings.DEFAULT_MAX_SHARED_OPTIONS:
+                self._normalizers.popitem(last=False)
+            self._normalizers[id(options)] = entry
+        return entry[1]
+
+
+def _pair_normalizers(unittypes, useropts, is_separator=False):
+    types_and_opts = u.filter_useropts_for_types(
+        [t for t in unittypes if t is not None], useropts, is_separator)
+    return [(get_sort_normalizer(t), opts) for t, opts in types_and_opts]
+
+
+def _match_to_sort_parts(template, groupings, match, cnstr, options):
+    # Mirrors CompoundTemplate._match_to_parts.
+    partlist, blank_so_far = [], True
+    for cg in groupings:
+        name = cg.grouping.name
+        match_str = match.group(name) or ''
+        parts = _grouping_to_sort_parts(cg, match_str, options)
+        is_last = match_str and match.end(name) == len(cnstr)
+        is_first = match_str and blank_so_far
+        blank_so_far = False if is_first else blank_so_far
+        if not template._part_separator_is_valid(parts, is_first, is_last):
+            raise InvalidCallNumberStringError()
+        partlist.extend([p for p in parts if p is not None])
+    return partlist
+
+
+def _grouping_to_sort_parts(cg, string, options):
+    # Mirrors Grouping.cnstr_to_units. Multiple parts are combined
+    # into one part, as they are by a MultiUnitWrapper.
+    grouping = cg.grouping
+    normalizers, sep_normalizers, osep_normalizers =\
+        cg.get_normalizers(options)
+    outer_sep_part = None
+    if cg.outer_sep_regex is not None:
+        match = cg.outer_sep_regex.search(string)
+        match_str = match.group(0) if match else ''
+        if match_str:
+            outer_sep_part = _first_sort_part(match_str, osep_normalizers)
+            if outer_sep_part is None:
+                raise InvalidCallNumberStringError()
+            string = '{}{}'.format(string[:match.start()],
+                                   string[match.end():])
+    parts = _split_string_to_sort_parts(cg, string, normalizers,
+                                        sep_normalizers)
+    if len(parts) == 0:
+        parts = None
+    elif grouping.max == 1:
+        parts = parts[0]
+    else:
+        parts = SortPart(_join_sort_parts(parts, CompoundUnit.sort_break),
+                         False, False)
+    if grouping.outer_sep_group:
+        if grouping.outer_sep_placement == 'before':
+            return outer_sep_part, parts
+        elif grouping.outer_sep_placement == 'after':
+            return parts, outer_sep_part
+    return (parts,)
+
+
+def _split_string_to_sort_parts(cg, string, normalizers, sep_normalizers):
+    # Mirrors Grouping._split_string.
+    parts = []
+    part_regex, sep_regex = cg.part_regex, cg.sep_regex
+    pos, end = 0, len(string)
+    while pos < end:
+        match = part_regex.match(string, pos)
+        if not match or match.end() == pos:
+            raise InvalidCallNumberStringError()
+        part = _first_sort_part(match.group(0), normalizers)
+        if part is None:
+            raise InvalidCallNumberStringError()
+        parts.append(part)
+        pos = match.end()
+
+        if pos < end:
+            match = sep_regex.match(string, pos)
+            if match and match.end() > pos:
+                sep = match.group(0)
+                pos = match.end()
+                if pos == end:
+                    raise InvalidCallNumberStringError()
+                part = _first_sort_part(sep, sep_normalizers)
+                if part is None:
+                    raise InvalidCallNumberStringError()
+                parts.append(part)
+    return parts
+
+
+def _first_sort_part(cnstr, normalizers):
+    # Mirrors utils.create_unit_from_filtered; each normalizer returns
+    # None right away if ``cnstr`` doesn't match its type's regex.
+    for normalize, opts in normalizers:
+        part = normalize(cnstr, opts)
+        if part is not None:
+            return part
+    return None
+
+
+def _join_sort_parts(parts, sort_break):
+    # Mirrors CompoundUnit.for_sort.
+    strings, join = ([], False)
+    for p in parts:
+        is_sep_or_formatting = p.is_separator or p.is_formatting
+        if (is_sep_or_formatting and p.for_sort) or join:
+            strings[-1] = '{}{}'.format(strings[-1], p.for_sort)
+        elif p.for_sort:
+            strings.append(p.for_sort)
+        join = True if is_sep_or_formatting and p.for_sort else False
+    return sort_break.join(strings)
+
+
+def _sort_unit(unittype, cnstr, options):
+    return cnstr
+
+
+def _sort_alphabetic(unittype, cnstr, options):
+    if cnstr == '':
+        return ' '
+    case = options['sort_case']
+    if case == 'lower':
+        return cnstr.lower()
+    elif case == 'upper':
+        return cnstr.upper()
+    return cnstr
+
+
+def _sort_numeric(unittype, cnstr, options):
+    return cnstr.zfill(unittype.numeric_zfill)
+
+
+def _sort_formatting(unittype, cnstr, options):
+    return cnstr if options['use_formatting_in_sort'] else ''
+
+
+def _any_value_is_valid(unittype, cnstr):
+    return True
+
+
+def _compound_number_value_is_valid(unittype, cnstr):
+    # Mirrors the range check in BaseCompoundNumber.validate.
+    too_low, too_high = False, False
+    try:
+        cnval = unittype.string_to_value(cnstr)
+        too_low = unittype.min_val is not None and cnval < unittype.min_val
+        too_high = unittype.max_val is not None and cnval > unittype.max_val
+    except Exception:
+        pass
+    return not (too_low or too_high)
+
+
+def _sort_blank(unittype, cnstr, options):
+    return ''
+
+
+def _sort_alphabetic_first(unittype, cnstr, options):
+    # Mirrors the ``for_sort`` of sudoc.LettersFirst.
+    return '{}{}'.format(CompoundUnit.sort_break,
+                         _sort_alphabetic(unittype, cnstr, options))
+
+
+def _sort_compound(unittype, cnstr, parts):
+    return _join_sort_parts(parts, unittype.sort_break)
+
+
+def _sort_compound_after_break(unittype, cnstr, parts):
+    # Mirrors the ``for_sort`` of Item.LabelThenNumber and
+    # Item.NumberThenLabel.
+    return '{}{}'.format(CompoundUnit.sort_break,
+                         _sort_compound(unittype, cnstr, parts))
+
+
+def _sort_whole_number(unittype, cnstr, parts):
+    value = unittype.string_to_value(cnstr)
+    return str(int(value)).zfill(unittype.numeric_zfill)
+
+
+def _sort_number(unittype, cnstr, parts):
+    sortval = _sort_compound(unittype, cnstr, parts)
+    if '.' in sortval:
+        (whole, dec) = sortval.split('.')
+        if int(dec) == 0:
+            return whole
+    return sortval
+
+
+def _adjust_sudoc_parts(unittype, match, parts):
+    # Mirrors SuDoc.__init__, which adds a blank related series (which
+    # sorts as a sort break) to a stem's series if it has none. Only
+    # AgencyDotSeries stems have a series, and it's their last part,
+    # so the sort break goes at the end of the stem's sort value. The
+    # regexes tell which type the stem is and whether its series has a
+    # related series, the same way their Units' regexes would; any
+    # case they don't cover is left to the Unit.
+    template, xjhs_regex, stem_regex, series_sep_regex, series_regex =\
+        _get_sudoc_regexes()
+    if unittype.template is not template:
+        raise InvalidCallNumberStringError()
+    stem = match.group('stem')
+    if xjhs_regex.match(stem):
+        return parts
+    stem_match = stem_regex.match(stem)
+    if stem_match is None:
+        raise InvalidCallNumberStringError()
+    series = stem_match.group('series')
+    sep_match = series_sep_regex.search(series)
+    if sep_match:
+        series = '{}{}'.format(series[:sep_match.start()],
+                               series[sep_match.end():])
+    series_match = series_regex.match(series)
+    if series_match is None:
+        raise InvalidCallNumberStringError()
+    if series_match.group('related_series'):
+        return parts
+    stem_part = parts[0]
+    return [stem_part._replace(for_sort='{}{}'.format(
+        stem_part.for_sort, CompoundUnit.sort_break))] + parts[1:]
+
+
+@u.memoize
+def _get_sudoc_regexes():
+    from pycallnumber.units.callnumbers.sudoc import SuDoc,\
+        AgencyDotSeries, XjhsAgency, Series
+    series_grouping = [g for g in AgencyDotSeries.template.groupings
+                       if g.name == 'series'][0]
+    return (SuDoc.template, XjhsAgency.get_template_regex(match_whole=True),
+            AgencyDotSeries.template.get_regex(True, True),
+            series_grouping._get_outer_sep_split_regex(),
+            Series.template.get_regex(True, True))
+
+
+@u.memoize
+def _get_known_functions():
+    # The unit types whose methods the normalizers reimplement live in
+    # ``pycallnumber.units``, which is only imported when first needed.
+    from pycallnumber.units.simple import Alphabetic, Numeric, Formatting
+    from pycallnumber.units.numbers import BaseCompoundNumber,\
+        WholeNumUSGB1000sSep, Number
+    from pycallnumber.units.callnumbers.parts import Item
+    from pycallnumber.units.callnumbers.sudoc import SuDoc, LettersFirst
+    simple_validators = (_get_function(Unit, 'validate'),
+                         _get_function(Numeric, 'validate'))
+    simple_sorters = {
+        _get_function(Unit, 'for_sort'): _sort_unit,
+        _get_function(Alphabetic, 'for_sort'): _sort_alphabetic,
+        _get_function(Numeric, 'for_sort'): _sort_numeric,
+        _get_function(Formatting, 'for_sort'): _sort_formatting,
+        _get_function(Item.Label, 'for_sort'): _sort_blank,
+        _get_function(LettersFirst, 'for_sort'): _sort_alphabetic_first,
+    }
+    compound_inits = {
+        _get_function(CompoundUnit, '__init__'): None,
+        _get_function(SuDoc, '__init__'): _adjust_sudoc_parts,
+    }
+    compound_validators = {
+        _get_function(Unit, 'validate'): _any_value_is_valid,
+        _get_function(BaseCompoundNumber, 'validate'):
+            _compound_number_value_is_valid,
+    }
+    compound_sorters = {
+        _get_function(CompoundUnit, 'for_sort'): _sort_compound,
+        _get_function(WholeNumUSGB1000sSep, 'for_sort'): _sort_whole_number,
+        _get_function(Number, 'for_sort'): _sort_number,
+        _get_function(Item.LabelThenNumber, 'for_sort'):
+            _sort_compound_after_break,
+        _get_function(Item.NumberThenLabel, 'for_sort'):
+            _sort_compound_after_break,
+    }
+    return (simple_validators, simple_sorters, compound_inits,
+            compound_validators, compound_sorters)
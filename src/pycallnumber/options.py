@@ -4,22 +4,161 @@
 from __future__ import unicode_literals
 from __future__ import absolute_import
 from builtins import object
+import collections
+
 from pycallnumber.exceptions import OptionsError
+from pycallnumber import settings
+from pycallnumber import utils as u
+
+
+_NOT_SET = object()
 
 
 class Options(dict):
 
+    __slots__ = ('parent_class', 'sources', 'is_shared')
+    _shared = collections.OrderedDict()
+    _class_state_version = 0
+
     def __init__(self, parent_class, useropts=None, override_class_opts=False,
                  **argopts):
         useropts = useropts or argopts
+        self.is_shared = False
         self.reset_options(parent_class, useropts, override_class_opts)
 
+    def __getstate__(self):
+        return self.parent_class, self.sources
+
+    def __setstate__(self, state):
+        self.parent_class, self.sources = state
+        self.is_shared = False
+
+    @classmethod
+    def get_shared(cls, parent_class, useropts=None,
+                   override_class_opts=False):
+        """Get a shared, read-only Options object.
+
+        Objects of the same class that are created with the same
+        options can all use one Options object instead of each
+        building and validating its own. This returns the shared
+        Options object for the given arguments, creating it the first
+        time. Changes to the parent class's ``options_defaults`` or to
+        any class attributes that set options still apply to objects
+        created afterward. No more than
+        ``settings.DEFAULT_MAX_SHARED_OPTIONS`` shared Options objects
+        are kept; the least recently used ones are discarded first.
+
+        Shared Options objects are read-only: trying to change one
+        (e.g., via ``set_option``, ``reset_options``, or setting an
+        item) raises an OptionsError. Use ``copy`` to get a copy that
+        can be changed. If any ``useropts`` values are unhashable, a
+        new, unshared Options object is returned instead.
+        """
+        useropts = useropts or {}
+        try:
+            key = (parent_class, override_class_opts,
+                   frozenset(useropts.items()))
+            entry = cls._shared.pop(key, None)
+        except TypeError:
+            return cls(parent_class, useropts, override_class_opts)
+        class_state = cls._get_class_state(parent_class)
+        if entry is None or entry[1] is not class_state:
+            options = cls(parent_class, useropts, override_class_opts)
+            options.is_shared = True
+            entry = (options, class_state)
+            if len(cls._shared) >= settings.DEFAULT_MAX_SHARED_OPTIONS:
+                cls._shared.popitem(last=False)
+        cls._shared[key] = entry
+        return entry[0]
+
+    @classmethod
+    def _get_class_state(cls, parent_class):
+        # The options a class sets via class attributes and its
+        # ``options_defaults`` are cached on the class. The cache is
+        # invalidated when any class sets an option attribute (see
+        # ObjectWithOptionsType) and when ``options_defaults`` is
+        # changed in place, which a (fast) dict comparison detects.
+        defaults = parent_class.options_defaults
+        state = parent_class.__dict__.get('_options_class_state')
+        if (state is None or state[0] != cls._class_state_version or
+                state[1] != defaults):
+            classopts = tuple(getattr(parent_class, option, _NOT_SET)
+                              for option in defaults)
+            state = (cls._class_state_version, dict(defaults), classopts)
+            type.__setattr__(parent_class, '_options_class_state', state)
+        return state
+
+    @classmethod
+    def clear_shared(cls):
+        """Discard all shared Options objects."""
+        cls._shared.clear()
+        cls._class_state_version += 1
+
+    def copy(self):
+        """Return an unshared copy of this Options object."""
+        options = type(self).__new__(type(self))
+        options.update(self)
+        options.parent_class = self.parent_class
+        options.sources = self.sources.copy()
+        options.is_shared = False
+        return options
+
+    def _raise_if_shared(self):
+        # Unpickling sets items before ``is_shared`` is restored.
+        if getattr(self, 'is_shared', False):
+            msg = ('Shared Options objects cannot be changed; use ``copy`` '
+                   'to get a copy that can be.')
+            raise OptionsError(msg)
+
+    def __setitem__(self, key, value):
+        self._raise_if_shared()
+        super(Options, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._raise_if_shared()
+        super(Options, self).__delitem__(key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        self._raise_if_shared()
+        super(Options, self).update(*args, **kwargs)
+
+    def setdefault(self, key, default=None):
+        self._raise_if_shared()
+        return super(Options, self).setdefault(key, default)
+
+    def pop(self, *args):
+        self._raise_if_shared()
+        return super(Options, self).pop(*args)
+
+    def popitem(self):
+        self._raise_if_shared()
+        return super(Options, self).popitem()
+
+    def clear(self):
+        self._raise_if_shared()
+        super(Options, self).clear()
+
+    @property
+    def parent_classname(self):
+        return self.parent_class.__name__
+
+    @property
+    def classopts(self):
+        return self.parent_class.get_classopts()
+
+    @property
+    def defopts(self):
+        return self.parent_class.options_defaults
+
     def reset_options(self, parent_class, useropts=None,
                       override_class_opts=False):
+        self._raise_if_shared()
         useropts = useropts or {}
-        self.parent_classname = parent_class.__name__
-        self.classopts = parent_class.get_classopts()
-        self.defopts = parent_class.options_defaults
+        self.parent_class = parent_class
         self.sources = {}
         self.validate_options(useropts)
         for option, default in self.defopts.items():
@@ -29,8 +168,8 @@ class Options(dict):
             else:
                 value = default
                 is_from_defaults = True
-            self.set_option(option, value, is_from_defaults,
-                            override_class_opts)
+            self._set_option(option, value, is_from_defaults,
+                             override_class_opts)
 
     def validate_option(self, option):
         if option not in self.defopts:
@@ -44,9 +183,14 @@ class Options(dict):
 
     def set_option(self, option, value, is_from_defaults=False,
                    override_class_opts=False):
+        self._raise_if_shared()
         self.validate_option(option)
-        if not override_class_opts and option in self.classopts:
-            self[option] = self.classopts[option]
+        self._set_option(option, value, is_from_defaults, override_class_opts)
+
+    def _set_option(self, option, value, is_from_defaults,
+                    override_class_opts):
+        if not override_class_opts and hasattr(self.parent_class, option):
+            self[option] = getattr(self.parent_class, option)
             self.sources[option] = 'class'
         else:
             self[option] = value
@@ -56,7 +200,35 @@ class Options(dict):
                 self.sources[option] = 'argument'
 
 
-class ObjectWithOptions(object):
+class ObjectWithOptionsType(type):
+    """The metaclass for ObjectWithOptions.
+
+    Setting or deleting a class attribute that sets an option (or
+    ``options_defaults``) tells Options to recheck the options that
+    classes set, so that shared Options objects reflect the change.
+    """
+
+    def __setattr__(cls, name, value):
+        super(ObjectWithOptionsType, cls).__setattr__(name, value)
+        cls._class_options_changed(name)
+
+    def __delattr__(cls, name):
+        super(ObjectWithOptionsType, cls).__delattr__(name)
+        cls._class_options_changed(name)
+
+    def _class_options_changed(cls, name):
+        if (name == 'options_defaults' or
+                name in getattr(cls, 'options_defaults', ())):
+            Options._class_state_version += 1
+
+
+# Creating the base class this way works with both the Python 2 and
+# Python 3 syntax for metaclasses.
+_ObjectWithOptionsBase = ObjectWithOptionsType(
+    u.native_str('_ObjectWithOptionsBase'), (object,), {})
+
+
+class ObjectWithOptions(_ObjectWithOptionsBase):
 
     options_defaults = {}
 
@@ -101,17 +273,23 @@ class ObjectWithOptions(object):
                 other.set_option(option, self.options.get(option, value))
 
     def reset_options(self, useropts=None, override_class_opts=False):
-        self.options = Options(type(self), useropts, override_class_opts)
+        self.options = Options.get_shared(type(self), useropts,
+                                          override_class_opts)
         self.apply_options_to_self()
 
     def get_option_source(self, option):
         return self.options.sources[option]
 
     def set_option(self, option, value, override_class_opts=False):
+        if self.options.is_shared:
+            self.options = self.options.copy()
         self.options.set_option(option, value,
                                 override_class_opts=override_class_opts)
-        setattr(self, option, self.options[option])
+        self.apply_option_to_self(option, self.options[option])
 
     def apply_options_to_self(self):
         for option, value in self.options.items():
-            setattr(self, option, value)
+            self.apply_option_to_self(option, value)
+
+    def apply_option_to_self(self, option, value):
+        setattr(self, option, value)
@@ -0,0 +1,133 @@
+"""Normalize large batches of call number strings in parallel."""
+
+from __future__ import unicode_literals
+from __future__ import absolute_import
+import collections
+import itertools
+import multiprocessing
+
+from pycallnumber import settings
+from pycallnumber import utils as u
+
+
+NormalizedCallNumber = collections.namedtuple('NormalizedCallNumber', [
+    'cnstr', 'unittype', 'for_sort', 'for_search', 'for_print', 'error'
+])
+
+_worker_state = {}
+
+
+def normalize(cnstrs, useropts=None, unittypes=None, workers=None,
+              chunksize=500):
+    """Normalize call number strings using a pool of worker processes.
+
+    Returns an iterator that parses each string in ``cnstrs`` the same
+    way the ``callnumber`` factory does and yields a
+    NormalizedCallNumber namedtuple for each, in input order. Unit
+    objects themselves never cross process boundaries; each result
+    only contains plain strings:
+
+        ``cnstr``: the input string.
+        ``unittype``: the name of the matching Unit type, or None.
+        ``for_sort``, ``for_search``, ``for_print``: the normalized
+        forms of the call number, or None if it is invalid.
+        ``error``: None, or the ValidationFailure reason code (e.g.,
+        'no_matching_type') if the string is invalid. If parsing or
+        normalizing a string raises any other error, the result for
+        that string has the code 'normalization_error', and the other
+        strings are still processed.
+
+    ``useropts`` and ``unittypes`` work as they do for ``callnumber``,
+    except ``unittypes`` may also contain path strings, like
+    settings.DEFAULT_UNIT_TYPES.
+
+    ``workers`` is the number of worker processes to use; it defaults
+    to the number of CPUs. If it is 1, strings are processed in the
+    current process. ``chunksize`` is the number of strings sent to a
+    worker at a time. Input is read lazily, a few chunks per worker
+    ahead of the output, so ``cnstrs`` may be arbitrarily large.
+
+    Where the platform supports it, worker processes are started by
+    forking, so Unit types created at runtime (e.g., via
+    ``Unit.derive``) are available to workers without needing to be
+    pickled. Otherwise the ``unittypes`` must be importable, or given
+    as path strings.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    unittypes = unittypes or settings.DEFAULT_UNIT_TYPES
+    chunks = _chunk_iterable(cnstrs, chunksize)
+    if workers == 1:
+        types_and_opts = _get_types_and_opts(unittypes, useropts)
+        return (r for chunk in chunks
+                for r in _normalize_chunk(chunk, types_and_opts))
+    return _normalize_with_pool(chunks, unittypes, useropts, workers)
+
+
+def _normalize_with_pool(chunks, unittypes, useropts, workers):
+    pool = _get_mp_context().Pool(workers, _init_worker,
+                                  (unittypes, useropts))
+    pending = collections.deque()
+    try:
+        for chunk in itertools.islice(chunks, workers * 2):
+            pending.append(pool.apply_async(_normalize_chunk, (chunk,)))
+        while pending:
+            results = pending.popleft().get()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.apply_async(_normalize_chunk, (chunk,)))
+            for result in results:
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _get_mp_context():
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        return multiprocessing
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return get_context('fork')
+    return get_context()
+
+
+def _chunk_iterable(iterable, chunksize):
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunksize))
+
+
+def _get_types_and_opts(unittypes, useropts):
+    unittypes = [u.load_class(t) if isinstance(t, u.string_types) else t
+                 for t in unittypes]
+    return u.filter_useropts_for_types(unittypes, useropts)
+
+
+def _init_worker(unittypes, useropts):
+    # Only pool workers use the module-level state; each worker process
+    # belongs to exactly one pool, so it can't be overwritten.
+    _worker_state['types_and_opts'] = _get_types_and_opts(unittypes,
+                                                          useropts)
+
+
+def _normalize_chunk(cnstrs, types_and_opts=None):
+    if types_and_opts is None:
+        types_and_opts = _worker_state['types_and_opts']
+    return [_normalize_one(cnstr, types_and_opts) for cnstr in cnstrs]
+
+
+def _normalize_one(cnstr, types_and_opts):
+    try:
+        unit = u.create_unit_from_filtered(cnstr, types_and_opts)
+        if unit is None:
+            return NormalizedCallNumber(cnstr, None, None, None, None,
+                                        'no_matching_type')
+        return NormalizedCallNumber(cnstr, type(unit).__name__,
+                                    unit.for_sort(), unit.for_search(),
+                                    unit.for_print(), None)
+    except Exception:
+        # One bad string shouldn't end the whole batch.
+        return NormalizedCallNumber(cnstr, None, None, None, None,
+                                    'normalization_error')
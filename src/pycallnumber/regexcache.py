@@ -0,0 +1,242 @@
+"""Cache compiled template regexes on disk, for use across processes.
+
+Compiling the (large) regexes that templates generate is most of the
+work a new process does the first time it parses each type of call
+number. When a cache directory is configured (see
+``settings.DEFAULT_PATTERN_CACHE_DIR``), each regex is compiled only
+once: the compiled form is saved to the cache directory, and any
+later process that needs the same pattern loads it from there instead
+of compiling it again.
+
+Compiled regexes can't be saved directly, so the cache stores the
+output of the ``re`` module's own parser and compiler, as JSON, and
+passes it to ``_sre.compile``. This output is only valid for the
+exact Python build that produced it, so cache entries are kept in a
+subdirectory that is specific to the pycallnumber version and to the
+Python implementation, version, and regex engine. Entries are plain
+data (never pickles) and are checked against the pattern and flags
+being compiled before they are used, since the cache directory may be
+shared. If anything about this fails, regexes are compiled normally.
+
+Only the compiled regexes are cached. Each process still builds the
+pattern strings and group information from its templates, which is
+much less work than compiling them. Saving and loading compiled
+regexes also relies on ``sre_compile._code`` and ``_sre.compile``,
+which are private and change between Python versions. Before the
+cache is first used, a small test pattern is compiled through it; if
+that doesn't work on the running interpreter, a CallNumberWarning is
+issued and regexes are just compiled normally, without caching.
+"""
+
+from __future__ import unicode_literals
+from __future__ import absolute_import
+import hashlib
+import io
+import json
+import numbers
+import os
+import re
+import sys
+import tempfile
+import warnings
+
+try:
+    import _sre
+    try:
+        from re import _compiler as sre_compile, _parser as sre_parse
+    except ImportError:
+        import sre_compile
+        import sre_parse
+except ImportError:
+    _sre = None
+
+from pycallnumber import settings
+from pycallnumber import utils as u
+from pycallnumber.exceptions import CallNumberWarning
+
+
+_compiled = {}
+_supported = None
+_TEST_PATTERN = r'^(?P<a>[A-Z]+)(\d*)\.?(?P<b>a|b)$'
+_TEST_STRINGS = ('AB12.a', 'C.b', 'ab1.a', 'A1.c', '')
+
+
+def compile_pattern(pattern, flags=0):
+    """Compile a regex pattern string, using the cache if enabled.
+
+    Returns the same thing as ``re.compile(pattern, flags)``. If
+    ``settings.DEFAULT_PATTERN_CACHE_DIR`` is set, compiled regexes
+    are also kept in memory and saved to (and loaded from) that
+    directory.
+    """
+    cache_dir = settings.DEFAULT_PATTERN_CACHE_DIR
+    if not cache_dir or not is_supported():
+        return re.compile(pattern, flags)
+    try:
+        return _compiled[(pattern, flags)]
+    except KeyError:
+        pass
+    try:
+        path = os.path.join(get_cache_path(cache_dir),
+                            _get_entry_name(pattern, flags))
+    except Exception:
+        regex = re.compile(pattern, flags)
+    else:
+        regex = _load_entry(path, pattern, flags)
+        if regex is None:
+            try:
+                entry = _make_entry(pattern, flags)
+                regex = _compile_entry(entry, pattern, flags)
+            except Exception:
+                regex = re.compile(pattern, flags)
+            else:
+                _save_entry(path, entry)
+    _compiled[(pattern, flags)] = regex
+    return regex
+
+
+def get_cache_path(cache_dir=None):
+    """Get the subdirectory of ``cache_dir`` used by this process.
+
+    ``cache_dir`` defaults to ``settings.DEFAULT_PATTERN_CACHE_DIR``.
+    """
+    cache_dir = cache_dir or settings.DEFAULT_PATTERN_CACHE_DIR
+    return os.path.join(cache_dir, 'pycallnumber-{}-{}'.format(
+        _get_package_version(), _get_interpreter_key()))
+
+
+def is_supported():
+    """Check whether compiled regexes can be cached on this Python.
+
+    The check is done once, by compiling a small test pattern through
+    the cache and comparing it against ``re.compile``. The first time
+    it fails, a CallNumberWarning is issued.
+    """
+    global _supported
+    if _supported is None:
+        _supported = _check_support()
+        if not _supported:
+            warnings.warn('Compiled regexes cannot be cached on this '
+                          'version of Python, so the pattern cache '
+                          'directory will not be used.', CallNumberWarning)
+    return _supported
+
+
+def clear():
+    """Discard compiled regexes that are kept in memory.
+
+    Files in the cache directory are not removed. Whether caching is
+    supported is checked again the next time a pattern is compiled.
+    """
+    global _supported
+    _compiled.clear()
+    _supported = None
+
+
+@u.memoize
+def _get_package_version():
+    # Imported here, since importing importlib.metadata is slow and is
+    # only needed if the cache is enabled.
+    try:
+        from importlib import metadata
+    except ImportError:
+        import importlib_metadata as metadata
+    return metadata.version('pycallnumber')
+
+
+@u.memoize
+def _get_interpreter_key():
+    implementation = getattr(sys, 'implementation', None)
+    details = (sys.version, getattr(implementation, 'cache_tag', None),
+               getattr(_sre, 'MAGIC', None), getattr(_sre, 'CODESIZE', None))
+    return hashlib.sha1(repr(details).encode('utf-8')).hexdigest()[:16]
+
+
+def _check_support():
+    if _sre is None:
+        return False
+    try:
+        entry = _make_entry(_TEST_PATTERN, 0)
+        regex = _compile_entry(json.loads(json.dumps(entry)),
+                               _TEST_PATTERN, 0)
+        expected = re.compile(_TEST_PATTERN)
+        for string in _TEST_STRINGS:
+            if _match_data(regex, string) != _match_data(expected, string):
+                return False
+    except Exception:
+        return False
+    return regex.groupindex == expected.groupindex
+
+
+def _match_data(regex, string):
+    match = regex.match(string)
+    return match and (match.groups(), match.groupdict(), match.span())
+
+
+def _get_entry_name(pattern, flags):
+    key = '{}:{}'.format(flags, pattern).encode('utf-8')
+    return '{}.json'.format(hashlib.sha1(key).hexdigest())
+
+
+def _make_entry(pattern, flags):
+    # Records what ``sre_compile.compile`` would pass to
+    # ``_sre.compile``, as JSON-serializable data.
+    parsed = sre_parse.parse(pattern, flags)
+    code = sre_compile._code(parsed, flags)
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    return {'pattern': pattern, 'flags': flags,
+            'compiled_flags': flags | state.flags,
+            'code': [int(c) for c in code], 'groups': state.groups,
+            'groupindex': dict(state.groupdict)}
+
+
+def _is_int(value, minimum, maximum):
+    return (isinstance(value, numbers.Integral) and
+            not isinstance(value, bool) and minimum <= value <= maximum)
+
+
+def _compile_entry(entry, pattern, flags):
+    # Raises a ValueError if ``entry`` isn't a valid entry for exactly
+    # this pattern and these flags. ``_sre.compile`` itself rejects
+    # code values that aren't integers and checks that the code is
+    # well formed, so the code only needs a (fast) range check here.
+    compiled_flags, code = entry['compiled_flags'], entry['code']
+    groups, groupindex = entry['groups'], entry['groupindex']
+    if (entry['pattern'] != pattern or entry['flags'] != flags or
+            not _is_int(compiled_flags, 0, sys.maxsize) or
+            compiled_flags & flags != flags or
+            not isinstance(code, list) or not code or
+            min(code) < 0 or max(code) > 0xffffffff or
+            not _is_int(groups, 1, len(pattern) + 1) or
+            not isinstance(groupindex, dict) or
+            not all(_is_int(i, 1, groups - 1) for i in groupindex.values())):
+        raise ValueError('Invalid regex cache entry.')
+    indexgroup = [None] * groups
+    for name, index in groupindex.items():
+        indexgroup[index] = name
+    return _sre.compile(pattern, compiled_flags, code, groups - 1,
+                        groupindex, tuple(indexgroup))
+
+
+def _load_entry(path, pattern, flags):
+    try:
+        with io.open(path, encoding='utf-8') as cachefile:
+            return _compile_entry(json.load(cachefile), pattern, flags)
+    except Exception:
+        return None
+
+
+def _save_entry(path, entry):
+    # Each entry is written to a temporary file first and then renamed,
+    # so that processes sharing the cache never see a partial entry.
+    directory, temp_path = os.path.dirname(path), None
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        handle, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(handle, 'wb') as cachefile:
+            cachefile.write(json.dumps(entry).encode('ascii'))
+        getattr(os, 'replace', os.rename)(temp_path, path)
+    except Exception:
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,324 @@
+"""Load Unit types from declarative definitions in a JSON or TOML file.
+
+A definitions file describes each Unit type the way you would write a
+call to ``derive``, using type names in place of Unit classes, e.g.:
+
+    {
+        "unit_types": {
+            "ShelfLetters": {"derive_from": "Alphabetic",
+                             "min_length": 1, "max_length": 3},
+            "ShelfNumber": {"derive_from": "Numeric", "max_val": 9999},
+            "Shelf": {
+                "derive_from": "AlphaNumericSymbol",
+                "groups": [
+                    {"name": "letters", "min": 1, "max": 1,
+                     "type": "ShelfLetters"},
+                    {"name": "number", "min": 1, "max": 1,
+                     "type": "ShelfNumber"},
+                    {"name": "cutter", "min": 0, "max": 1,
+                     "type": "Cutter"}
+                ]
+            }
+        },
+        "default_types": ["Shelf"]
+    }
+"""
+
+from __future__ import unicode_literals
+from __future__ import absolute_import
+from builtins import object
+import collections
+import copyreg
+import io
+import json
+import os
+import uuid
+import weakref
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+from pycallnumber.exceptions import SettingsError
+from pycallnumber.options import ObjectWithOptionsType
+from pycallnumber.unit import Unit
+from pycallnumber.normalizers import get_sort_normalizer
+from pycallnumber import units
+from pycallnumber import utils as u
+
+
+class UnitRegistry(object):
+    """A set of Unit types loaded from declarative definitions.
+
+    Definitions are a dict (or a JSON or TOML file containing one)
+    with these elements:
+
+        ``unit_types``: a mapping of class names to definitions. Each
+        definition has a ``derive_from`` element, the name of the Unit
+        type to derive the new type from, and any other attributes to
+        pass to ``derive``. ``groups`` and ``separator_type`` work as
+        they do for a CompoundTemplate, except that each ``type``,
+        ``possible_types``, and ``separator_type`` value is a type
+        name instead of a Unit class.
+        ``default_types``: (optional) a list of type names, in the
+        order that the factory functions should try them. Defaults to
+        all of the ``unit_types``, in order.
+
+    A type name is the name of another type in the same definitions,
+    the name of a type in ``pycallnumber.units`` (such as 'Alphabetic'
+    or 'Cutter'), or a full path string, like the ones in
+    ``settings.DEFAULT_UNIT_TYPES``.
+
+    When the registry loads new definitions, each type is reused as
+    long as its definition and the definitions of the types it refers
+    to don't change. Reused types keep the regexes they've already
+    compiled. Use ``refresh`` to pick up changes to the definitions
+    file without restarting the process.
+
+    The derived types can be pickled, e.g., to pass them to worker
+    processes. A pickled type is derived again from its definitions
+    when it is unpickled in another process, and it is unpickled as
+    the original type in the process that derived it, so units that
+    come back from workers are instances of the registry's types.
+    """
+
+    def __init__(self, path=None, definitions=None):
+        self.path = path
+        self.types = collections.OrderedDict()
+        self.default_types = []
+        self._file_state = None
+        self._derived_types = {}
+        if path is not None:
+            self.refresh()
+        elif definitions is not None:
+            self.load_definitions(definitions)
+
+    def __getitem__(self, name):
+        return self.types[name]
+
+    def __contains__(self, name):
+        return name in self.types
+
+    def refresh(self):
+        """Reload the definitions file if it has changed since it was
+        last loaded. Returns True if the file was reloaded.
+        """
+        stat = os.stat(self.path)
+        file_state = (stat.st_mtime, stat.st_size)
+        if file_state == self._file_state:
+            return False
+        self.load_definitions(read_definitions(self.path))
+        self._file_state = file_state
+        return True
+
+    def load_definitions(self, definitions):
+        """Replace this registry's types with those in the given
+        definitions dict.
+
+        Raises a SettingsError if the definitions are invalid. In that
+        case, the registry keeps the types it had before.
+        """
+        try:
+            unit_types = definitions['unit_types']
+            default_names = definitions.get('default_types',
+                                            list(unit_types))
+        except (KeyError, TypeError, AttributeError):
+            msg = ('Definitions must be a mapping with a ``unit_types`` '
+                   'element that maps names to Unit type definitions.')
+            raise SettingsError(msg)
+        try:
+            definitions_json = json.dumps(definitions)
+        except (TypeError, ValueError):
+            msg = ('Definitions may only contain strings, numbers, '
+                   'booleans, lists, and mappings (not, e.g., dates).')
+            raise SettingsError(msg)
+        resolver = _DefinitionResolver(unit_types, definitions_json,
+                                       uuid.uuid4().hex, self._derived_types)
+        types = collections.OrderedDict((name, resolver.resolve(name)[0])
+                                        for name in unit_types)
+        default_types = [resolver.resolve(name)[0] for name in default_names]
+        self.types, self.default_types = types, default_types
+        # Only the types in the current definitions are kept for reuse.
+        self._derived_types = resolver.derived_types
+
+    def compile(self):
+        """Compile the regexes for parsing and sorting each Unit type.
+
+        Otherwise, each type's regexes are compiled the first time the
+        type is used. If ``settings.DEFAULT_PATTERN_CACHE_DIR`` is set,
+        this lets one process save the compiled regexes for all types
+        so that other processes can load them.
+        """
+        for unittype in self.types.values():
+            unittype.template.get_regex(True, True)
+            get_sort_normalizer(unittype)
+
+
+def read_definitions(path):
+    """Read a Unit type definitions dict from a JSON or TOML file.
+
+    Files with a ``.toml`` extension are read as TOML, which requires
+    Python 3.11+ or the ``tomli`` package; others are read as JSON.
+    """
+    if os.path.splitext(path)[1].lower() == '.toml':
+        if tomllib is None:
+            msg = ('Reading TOML files requires Python 3.11+ or the '
+                   '``tomli`` package.')
+            raise SettingsError(msg)
+        with open(path, 'rb') as deffile:
+            return tomllib.load(deffile)
+    with io.open(path, encoding='utf-8') as deffile:
+        return json.load(deffile, object_pairs_hook=collections.OrderedDict)
+
+
+def _load_unit_type(name):
+    try:
+        if '.' in name:
+            unittype = u.load_class(name)
+        else:
+            unittype = getattr(units, name)
+    except (AttributeError, ImportError, TypeError, ValueError):
+        unittype = None
+    if not (isinstance(unittype, type) and issubclass(unittype, Unit)):
+        raise SettingsError('``{}`` is not a known Unit type.'.format(name))
+    return unittype
+
+
+class _RegistryType(ObjectWithOptionsType):
+    # The metaclass for types derived by a UnitRegistry. They can't be
+    # imported by name, so ``_reduce_registry_type`` pickles them as
+    # the definitions needed to derive them again, plus a token that
+    # identifies the original set of types.
+    pass
+
+
+# Maps (token, name) to each registry type that exists in this process.
+_registry_types = weakref.WeakValueDictionary()
+
+
+def _reduce_registry_type(unittype):
+    definitions_json = unittype.__dict__.get('_registry_definitions')
+    if definitions_json is None:
+        # A type derived from a registry type outside of the registry
+        # is pickled by name, like any other class.
+        return unittype.__name__
+    return _load_registry_type, (definitions_json, unittype.__name__,
+                                 unittype._registry_token)
+
+
+copyreg.pickle(_RegistryType, _reduce_registry_type)
+
+
+def _load_registry_type(definitions_json, name, token):
+    try:
+        return _registry_types[(token, name)]
+    except KeyError:
+        return _load_registry(definitions_json, token)[name]
+
+
+@u.memoize(maxsize=16)
+def _load_registry(definitions_json, token):
+    # Types unpickled from the same definitions share one set of types,
+    # which keep the original token. So, pickling one of them again
+    # (e.g., to send a unit back from a worker) gives a type that
+    # unpickles as the original in the process that derived it.
+    unit_types = json.loads(definitions_json,
+                            object_pairs_hook=collections.OrderedDict
+                            )['unit_types']
+    resolver = _DefinitionResolver(unit_types, definitions_json, token, {})
+    return dict((name, resolver.resolve(name)[0]) for name in unit_types)
+
+
+class _DefinitionResolver(object):
+    # Derives the types in one set of definitions, reusing the types in
+    # ``previous`` whose keys haven't changed. Each type's key combines
+    # its definition with the keys of the types it refers to, so a key
+    # identifies a derived type across reloads.
+
+    def __init__(self, definitions, definitions_json, token, previous):
+        self.definitions = definitions
+        self.definitions_json = definitions_json
+        self.token = token
+        self.previous = previous
+        self.derived_types = {}
+        self.resolved = {}
+        self.resolving = set()
+
+    def resolve(self, name):
+        if name not in self.definitions:
+            return _load_unit_type(name), name
+        if name in self.resolved:
+            return self.resolved[name]
+        if name in self.resolving:
+            msg = ('The definition for ``{}`` refers to itself, directly or '
+                   'indirectly.'.format(name))
+            raise SettingsError(msg)
+        self.resolving.add(name)
+        attributes, key = self._resolve_definition(name)
+        key = json.dumps([name, key], sort_keys=True)
+        try:
+            unittype = self.previous[key]
+        except KeyError:
+            unittype = self._derive(name, attributes)
+        self.derived_types[key] = unittype
+        self.resolving.discard(name)
+        self.resolved[name] = (unittype, key)
+        return unittype, key
+
+    def _derive(self, name, attributes):
+        # Bases may override ``derive``, so the type is derived as usual
+        # and then recreated with the same bases and attributes, under
+        # the _RegistryType metaclass.
+        base = attributes.pop('derive_from')
+        derived = base.derive(classname=name, **attributes)
+        namespace = dict(derived.__dict__)
+        namespace.pop('__dict__', None)
+        namespace.pop('__weakref__', None)
+        namespace['__module__'] = __name__
+        namespace['_registry_definitions'] = self.definitions_json
+        namespace['_registry_token'] = self.token
+        unittype = _RegistryType(u.native_str(name), derived.__bases__,
+                                 namespace)
+        _registry_types[(self.token, name)] = unittype
+        return unittype
+
+    def _resolve_definition(self, name):
+        definition = self.definitions[name]
+        if not (isinstance(definition, dict) and
+                definition.get('derive_from')):
+            msg = ('The definition for ``{}`` must be a mapping with a '
+                   '``derive_from`` element.'.format(name))
+            raise SettingsError(msg)
+        attributes, key = {}, {}
+        for attr, value in definition.items():
+            attr = u.native_str(attr)
+            if attr == 'groups':
+                attributes[attr], key[attr] = self._resolve_groups(value)
+            elif attr in ('derive_from', 'separator_type') and value:
+                attributes[attr], key[attr] = self.resolve(value)
+            else:
+                attributes[attr] = key[attr] = value
+        return attributes, key
+
+    def _resolve_groups(self, groups):
+        # Invalid ``groups`` are passed along as-is, for CompoundTemplate
+        # to raise the appropriate error.
+        if not isinstance(groups, (list, tuple)):
+            return groups, groups
+        groups_attr, groups_key = [], []
+        for group in groups:
+            group_attr, group_key = dict(group), dict(group)
+            if 'type' in group:
+                group_attr['type'], group_key['type'] = self.resolve(
+                    group['type'])
+            if 'possible_types' in group:
+                resolved = [self.resolve(t) for t in group['possible_types']]
+                group_attr['possible_types'] = [t for t, _ in resolved]
+                group_key['possible_types'] = [k for _, k in resolved]
+            groups_attr.append(group_attr)
+            groups_key.append(group_key)
+        return groups_attr, groups_key
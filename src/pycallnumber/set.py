@@ -4,10 +4,12 @@
 from __future__ import unicode_literals
 from __future__ import absolute_import
 from builtins import object
+import bisect
 import operator
 import copy
 from functools import reduce
 
+from pycallnumber import settings
 from pycallnumber.exceptions import RangeSetError, BadRange
 from pycallnumber.unit import Unit
 from pycallnumber import utils as u
@@ -290,12 +292,11 @@ class Range(NonDiscreteSet):
             msg = ('All args passed to ``union`` must be the same type and '
                    'use the same Unit type.')
             raise TypeError(msg)
-        rsort_others = tuple(sort((self,) + others, reverse=True))
-        results, ranges = (rsort_others[0],), rsort_others[1:]
+        ranges = sorted((self,) + others, key=operator.attrgetter('start'))
+        results = []
         for range_ in ranges:
-            if not range_.issubset(results[0]):
-                results = (results[0] | range_) + results[1:]
-        return results
+            _append_range(results, range_)
+        return tuple(results)
 
     def intersection(self, *others):
         if any(not self._is_valid_arg_for_set_manipulation(other)
@@ -344,10 +345,12 @@ class RangeSet(NonDiscreteSet):
                     msg = '``__init__`` args must be tuples or Ranges.'
                     raise RangeSetError(msg)
         try:
-            self.ranges = join(ranges) or []
+            joined = join(ranges)
         except TypeError:
             msg = '``__init__`` range args must all use the same Unit type.'
             raise RangeSetError(msg)
+        # ``join`` returns sorted, non-overlapping ranges already.
+        self._set_ranges(list(joined or []), True)
         try:
             self.unittype = self.ranges[0].unittype
         except IndexError:
@@ -359,7 +362,34 @@ class RangeSet(NonDiscreteSet):
 
     @ranges.setter
     def ranges(self, user_ranges):
-        self._ranges = sort(user_ranges)
+        ranges = sort(user_ranges)
+        disjoint = all(r1.end <= r2.start for r1, r2
+                       in zip(ranges, ranges[1:]))
+        self._set_ranges(ranges, disjoint)
+
+    @classmethod
+    def _from_normalized(cls, ranges):
+        # Set operations produce ranges that are already sorted,
+        # non-overlapping, and joined, so results can skip the
+        # ``join`` and ``sort`` that ``__init__`` would do on them.
+        # Subclasses that override ``__init__`` may set up other state
+        # there, so they're still created via ``__init__``.
+        init = getattr(cls.__init__, '__func__', cls.__init__)
+        if init is not getattr(RangeSet.__init__, '__func__',
+                               RangeSet.__init__):
+            return cls(*ranges)
+        rangeset = cls.__new__(cls)
+        rangeset._set_ranges(ranges, True)
+        try:
+            rangeset.unittype = ranges[0].unittype
+        except IndexError:
+            rangeset.unittype = None
+        return rangeset
+
+    def _set_ranges(self, ranges, disjoint):
+        self._ranges = ranges
+        self._starts = [r.start for r in ranges]
+        self._ranges_are_disjoint = disjoint
         if self._ranges:
             self.start, self.end = self._ranges[0].start, self._ranges[-1].end
         else:
@@ -381,53 +411,75 @@ class RangeSet(NonDiscreteSet):
         o_rngs_in_self = (r == o_rngs[i] for i, r in enumerate(self.ranges))
         return len(o_rngs) == len(self.ranges) and all(o_rngs_in_self)
 
+    def _get_normalized_ranges(self):
+        # Set operations need sorted, non-overlapping ranges, which
+        # self.ranges always are unless they were set directly.
+        if self._ranges_are_disjoint:
+            return self._ranges
+        return list(join(self._ranges) or [])
+
     def __contains__(self, other):
         try:
             other_list = other.ranges
         except AttributeError:
             other_list = [other]
         # All ranges in other must be in at least one of self's ranges
-        return all(any(o in r for r in self.ranges) for o in other_list)
+        return all(self._contains_one(o) for o in other_list)
+
+    def _contains_one(self, other):
+        # Normally self.ranges are disjoint and sorted, so the only
+        # range that could contain ``other`` is the last one that
+        # starts at or before it, which we can find via binary search.
+        if not self._ranges_are_disjoint:
+            return any(other in r for r in self.ranges)
+        try:
+            start = other.start
+        except AttributeError:
+            start = other
+        i = bisect.bisect_right(self._starts, start) - 1
+        return i >= 0 and other in self._ranges[i]
 
     def __or__(self, other):
         try:
             if not self._is_valid_arg_for_set_manipulation(other):
                 raise TypeError
-            joined = other.ranges + self.ranges
+            joined = _merge_union(self._get_normalized_ranges(),
+                                  other._get_normalized_ranges())
         except (TypeError, AttributeError):
             self.raise_op_type_error(other, 'bitwise ``or`` (|)')
-        mytype = type(self)
-        return mytype(*joined)
+        return type(self)._from_normalized(joined)
 
     def __and__(self, other):
         try:
             if not self._is_valid_arg_for_set_manipulation(other):
                 raise TypeError
-            intersected = [r & o for r in self.ranges for o in other.ranges]
+            intersected = _merge_intersection(self._get_normalized_ranges(),
+                                              other._get_normalized_ranges())
         except (TypeError, AttributeError):
             self.raise_op_type_error(other, 'bitwise ``and`` (&)')
-        mytype = type(self)
-        return mytype(*[r for r in intersected if r is not None])
+        return type(self)._from_normalized(intersected)
 
     def __sub__(self, other):
         try:
             if not self._is_valid_arg_for_set_manipulation(other):
                 raise TypeError
-            diff = [r.difference(*other.ranges) for r in self.ranges]
+            diff = _merge_difference(self._get_normalized_ranges(),
+                                     other._get_normalized_ranges())
         except (TypeError, AttributeError):
             self.raise_op_type_error(other, 'subtraction (-)')
-        mytype = type(self)
-        return mytype(*[r for tup in diff if tup is not None for r in tup])
+        return type(self)._from_normalized(diff)
 
     def __xor__(self, other):
         try:
             if not self._is_valid_arg_for_set_manipulation(other):
                 raise TypeError
-            sub = self - other
-        except TypeError:
+            ranges = self._get_normalized_ranges()
+            other_ranges = other._get_normalized_ranges()
+        except (TypeError, AttributeError):
             self.raise_op_type_error(other, 'xor (^)')
-        revsub = other - self
-        return sub | revsub
+        sub = _merge_difference(ranges, other_ranges)
+        revsub = _merge_difference(other_ranges, ranges)
+        return type(self)._from_normalized(_merge_union(sub, revsub))
 
     def overlaps(self, other):
         try:
@@ -464,6 +516,74 @@ class RangeSet(NonDiscreteSet):
             raise TypeError(msg)
 
 
+class RangeSetClassifier(object):
+    """Find which of many named RangeSets contain a call number.
+
+    Initialize with a mapping (e.g., a dict) of names to RangeSet
+    objects, such as subject areas and the call number ranges that
+    belong to each. Range objects may be used in place of RangeSets.
+
+    Boundaries from all of the RangeSets are merged into one sorted
+    table of breakpoints, each paired with the set of names whose
+    RangeSets include the span from that breakpoint to the next one.
+    Classifying a Unit is then a single binary search, no matter how
+    many RangeSets there are.
+    """
+
+    def __init__(self, rangesets):
+        events = []
+        for name, rangeset in rangesets.items():
+            if not isinstance(rangeset, NonDiscreteSet):
+                msg = ('RangeSetClassifier values must be RangeSet or Range '
+                       'objects.')
+                raise RangeSetError(msg)
+            # Each name's ranges must not overlap, or the end of one
+            # would deactivate the name while another is still open.
+            ranges = [rangeset]
+            if isinstance(rangeset, RangeSet):
+                ranges = rangeset._get_normalized_ranges()
+            for range_ in ranges:
+                events.extend([(range_.start, True, name),
+                               (range_.end, False, name)])
+        events.sort(key=operator.itemgetter(0))
+        self.names = frozenset(rangesets.keys())
+        self.breakpoints, self.labels, active = [], [], set()
+        for point, is_start, name in events:
+            if not self.breakpoints or point != self.breakpoints[-1]:
+                self.breakpoints.append(point)
+                self.labels.append(None)
+            if is_start:
+                active.add(name)
+            else:
+                active.discard(name)
+            self.labels[-1] = frozenset(active)
+
+    def classify(self, unit):
+        """Return the frozenset of names whose RangeSets contain ``unit``."""
+        i = bisect.bisect_right(self.breakpoints, unit) - 1
+        return self.labels[i] if i >= 0 else frozenset()
+
+    def classify_all(self, items, useropts=None, unittypes=None):
+        """Classify each item in an iterable of Units or strings.
+
+        This is a generator that yields the ``classify`` result for
+        each item, in order. Strings are first parsed into Units the
+        way the ``callnumber`` factory does, using the given
+        ``useropts`` and ``unittypes``; if a string does not match any
+        of the Unit types, None is yielded for it.
+        """
+        utypes = unittypes or [u.load_class(t)
+                               for t in settings.DEFAULT_UNIT_TYPES]
+        types_and_opts = u.filter_useropts_for_types(utypes, useropts)
+        for item in items:
+            if not isinstance(item, Unit):
+                item = u.create_unit_from_filtered(item, types_and_opts)
+                if item is None:
+                    yield None
+                    continue
+            yield self.classify(item)
+
+
 # Range/RangeSet Utility functions
 
 def sort(sets, reverse=False):
@@ -477,6 +597,75 @@ def sort(sets, reverse=False):
     return sorted(start_desc, key=operator.attrgetter('end'), reverse=reverse)
 
 
+def _append_range(ranges, range_, start=None, end=None):
+    # Append a range to a list of sorted, non-overlapping ranges,
+    # extending the last range instead if the new one overlaps or
+    # abuts it. The new range must not start before the last one. Pass
+    # ``start`` and/or ``end`` to append a piece of ``range_`` instead.
+    start = range_.start if start is None else start
+    end = range_.end if end is None else end
+    if ranges and start <= ranges[-1].end:
+        last = ranges[-1]
+        if end > last.end:
+            ranges[-1] = type(last)(last.start, end)
+    elif start is range_.start and end is range_.end:
+        ranges.append(range_)
+    else:
+        ranges.append(type(range_)(start, end))
+
+
+def _merge_union(ranges1, ranges2):
+    # Each ``_merge`` function takes two lists of sorted, non-
+    # overlapping ranges, walks through both in step, and returns a
+    # list of sorted, non-overlapping, non-abutting ranges.
+    results, i, j = [], 0, 0
+    while i < len(ranges1) or j < len(ranges2):
+        if j == len(ranges2) or (i < len(ranges1) and
+                                 ranges1[i].start <= ranges2[j].start):
+            _append_range(results, ranges1[i])
+            i += 1
+        else:
+            _append_range(results, ranges2[j])
+            j += 1
+    return results
+
+
+def _merge_intersection(ranges1, ranges2):
+    results, i, j = [], 0, 0
+    while i < len(ranges1) and j < len(ranges2):
+        r1, r2 = ranges1[i], ranges2[j]
+        start = r1.start if r1.start >= r2.start else r2.start
+        end = r1.end if r1.end <= r2.end else r2.end
+        if start < end:
+            _append_range(results, r1, start, end)
+        if r1.end <= r2.end:
+            i += 1
+        else:
+            j += 1
+    return results
+
+
+def _merge_difference(ranges1, ranges2):
+    results, j = [], 0
+    for r1 in ranges1:
+        start = r1.start
+        while j < len(ranges2) and ranges2[j].end <= start:
+            j += 1
+        k = j
+        while k < len(ranges2) and ranges2[k].start < r1.end:
+            r2 = ranges2[k]
+            if r2.start > start:
+                _append_range(results, r1, start, r2.start)
+            if r2.end > start:
+                start = r2.end
+            if start >= r1.end:
+                break
+            k += 1
+        if start < r1.end:
+            _append_range(results, r1, start)
+    return results
+
+
 def join(sets):
     try:
         return sets[0].union(*sets[1:])
@@ -8,6 +8,8 @@ DO NOT override them by changing these values directly.
 
 """
 
+import os
+
 # ************** OVERRIDABLE UNIT OPTIONS
 # These are default options controlling unit type normalization.
 # Generally, you shouldn't have to override the defaults. But, in case
@@ -76,6 +78,21 @@ DEFAULT_SORT_CASE = 'lower'
 DEFAULT_USE_FORMATTING_IN_SEARCH = False
 DEFAULT_USE_FORMATTING_IN_SORT = False
 
+# SIMPLE UNIT INTERNING Option
+# ----------------------------
+# The `intern_simple_units` option, available on all unit types,
+# controls whether identical SimpleUnit objects (such as separators,
+# punctuation, and common letters and numbers) are reused when parsing
+# call numbers, instead of creating a new object each time. A
+# SimpleUnit is reused only if its type, string, name, and options all
+# match. This can save a lot of time and memory when parsing a large
+# number of call numbers. Since reused objects are shared between call
+# numbers, they are read-only: calling ``set_option`` or
+# ``reset_options`` on one raises an OptionsError.
+#
+# Use True to reuse SimpleUnit objects or False to create new ones.
+DEFAULT_INTERN_SIMPLE_UNITS = False
+
 
 # ************** NON-OVERRIDABLE DEFAULTS
 # DEFAULT_MAX_NUMERIC_ZFILL is used by Numeric and derived classes. You
@@ -84,6 +101,29 @@ DEFAULT_USE_FORMATTING_IN_SORT = False
 # number of digits, it will be adjusted accordingly for that type.
 DEFAULT_MAX_NUMERIC_ZFILL = 10
 
+# DEFAULT_MAX_INTERNED_UNITS is the maximum number of SimpleUnit
+# objects that are kept for reuse when the `intern_simple_units`
+# option is True. When there are more, the least recently used ones
+# are discarded.
+DEFAULT_MAX_INTERNED_UNITS = 10000
+
+# DEFAULT_MAX_SHARED_OPTIONS is the maximum number of shared Options
+# objects (see `Options.get_shared`) that are kept for reuse, one for
+# each Unit type and set of options used. When there are more, the
+# least recently used ones are discarded.
+DEFAULT_MAX_SHARED_OPTIONS = 1000
+
+
+# DEFAULT_PATTERN_CACHE_DIR is a directory where compiled template
+# regexes are saved, so that they can be loaded by later processes
+# instead of being compiled again (see the `regexcache` module). This
+# helps short-lived processes, such as scripts and worker processes,
+# which otherwise spend most of their time compiling regexes the first
+# time they parse each type of call number. It is None (no caching)
+# unless you set the PYCALLNUMBER_PATTERN_CACHE_DIR environment
+# variable.
+DEFAULT_PATTERN_CACHE_DIR = os.environ.get('PYCALLNUMBER_PATTERN_CACHE_DIR',
+                                           None) or None
 
 # ************** `FACTORIES` SETTINGS
 # DEFAULT_UNIT_TYPES is used by the factories.py functions to specify
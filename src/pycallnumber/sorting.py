@@ -0,0 +1,168 @@
+"""Sort files of call numbers that are too large to sort in memory."""
+
+from __future__ import unicode_literals
+from __future__ import absolute_import
+import heapq
+import io
+import itertools
+import os
+import pickle
+import shutil
+import tempfile
+
+from pycallnumber import settings
+from pycallnumber.normalizers import for_sort_from_filtered
+from pycallnumber import utils as u
+
+
+def sort_file(infile, outfile, column=None, delimiter=',', header=False,
+              useropts=None, unittypes=None, run_size=100000,
+              max_open_runs=64, tempdir=None, encoding='utf-8'):
+    """Write the lines of a file to another file in call number order.
+
+    ``infile`` and ``outfile`` are file paths or open text files. By
+    default, each line of ``infile`` is a call number string. If
+    ``column`` is given, each line is instead a row of delimited data
+    (such as CSV; rows can't contain line breaks), and ``column`` is
+    the 0-based index of the column that has the call number. If
+    ``header`` is True, the first line is written first, unsorted.
+
+    Lines are written unchanged, except that a line break is added to
+    the last line if it has none. See ``sort_lines`` for how lines are
+    ordered and for the remaining args. ``encoding`` is used to open
+    file paths.
+    """
+    get_cnstr = None
+    if column is not None:
+        get_cnstr = _make_column_getter(column, delimiter)
+    in_fh = _open(infile, 'r', encoding)
+    out_fh = _open(outfile, 'w', encoding)
+    try:
+        lines = iter(in_fh)
+        if header:
+            first = next(lines, None)
+            if first is not None:
+                out_fh.write(_end_line(first))
+        for line in sort_lines(lines, get_cnstr, useropts, unittypes,
+                               run_size, max_open_runs, tempdir):
+            out_fh.write(_end_line(line))
+    finally:
+        if in_fh is not infile:
+            in_fh.close()
+        if out_fh is not outfile:
+            out_fh.close()
+
+
+def sort_lines(lines, get_cnstr=None, useropts=None, unittypes=None,
+               run_size=100000, max_open_runs=64, tempdir=None):
+    """Sort an iterable of strings in call number order, using little
+    memory.
+
+    Yields each string in ``lines`` in order by the ``for_sort`` key
+    (see ``factories.sort_key``) of its call number, which is the same
+    order that sorting the Unit objects would give. ``get_cnstr`` is a
+    function that returns the call number string for a line; by
+    default, the whole line (minus any line break) is the call number.
+    Lines with equal keys stay in input order, and lines whose call
+    numbers don't match any Unit type come last, in input order.
+    ``useropts`` and ``unittypes`` work as they do for ``callnumber``,
+    except ``unittypes`` may also contain path strings, like
+    settings.DEFAULT_UNIT_TYPES.
+
+    No more than ``run_size`` lines are kept in memory at once. Lines
+    are read and sorted in runs of that size, each run is saved to a
+    temporary file in ``tempdir`` (default: the system temp
+    directory), and then the runs are merged, reading at most
+    ``max_open_runs`` files at a time. If all lines fit in one run, no
+    temporary files are used. Temporary files are removed once all
+    lines have been yielded or the generator is closed.
+
+    A line whose call number raises an unexpected error while it's
+    being normalized is treated like any other line that doesn't
+    match a Unit type.
+    """
+    if run_size < 1 or max_open_runs < 2:
+        raise ValueError('``run_size`` must be at least 1, and '
+                         '``max_open_runs`` must be at least 2.')
+    unittypes = unittypes or settings.DEFAULT_UNIT_TYPES
+    unittypes = [u.load_class(t) if isinstance(t, u.string_types) else t
+                 for t in unittypes]
+    types_and_opts = u.filter_useropts_for_types(unittypes, useropts)
+    get_cnstr = get_cnstr or _strip_line_break
+    records = (_make_record(seq, line, get_cnstr(line), types_and_opts)
+               for seq, line in enumerate(lines))
+    run = sorted(itertools.islice(records, run_size))
+    if len(run) < run_size:
+        for record in run:
+            yield record[-1]
+        return
+    workdir = tempfile.mkdtemp(prefix='pycallnumber-sort-', dir=tempdir)
+    try:
+        run_paths = []
+        while run:
+            run_paths.append(_write_run(workdir, run))
+            run = sorted(itertools.islice(records, run_size))
+        while len(run_paths) > max_open_runs:
+            merging = run_paths[:max_open_runs]
+            run_paths = run_paths[max_open_runs:]
+            run_paths.append(_write_run(workdir, _merge_runs(merging)))
+            for path in merging:
+                os.remove(path)
+        for record in _merge_runs(run_paths):
+            yield record[-1]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _make_record(seq, line, cnstr, types_and_opts):
+    # Records sort as tuples: lines that have keys first, then by key,
+    # then in input order (seq), so the line itself is never compared.
+    try:
+        key = for_sort_from_filtered(cnstr, types_and_opts)
+    except Exception:
+        key = None
+    if key is None:
+        return (1, '', seq, line)
+    return (0, key, seq, line)
+
+
+def _write_run(workdir, records):
+    handle, path = tempfile.mkstemp(dir=workdir, suffix='.run')
+    with os.fdopen(handle, 'wb') as runfile:
+        for record in records:
+            pickle.dump(record, runfile, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path):
+    with open(path, 'rb') as runfile:
+        while True:
+            try:
+                yield pickle.load(runfile)
+            except EOFError:
+                return
+
+
+def _merge_runs(run_paths):
+    return heapq.merge(*[_read_run(path) for path in run_paths])
+
+
+def _make_column_getter(column, delimiter):
+    def get_column(line):
+        row = next(u.csv_reader([line], delimiter), [])
+        return row[column] if len(row) > column else ''
+    return get_column
+
+
+def _strip_line_break(line):
+    return line.rstrip('\r\n')
+
+
+def _end_line(line):
+    return line if line.endswith('\n') else '{}\n'.format(line)
+
+
+def _open(file_or_path, mode, encoding):
+    if hasattr(file_or_path, 'read' if mode == 'r' else 'write'):
+        return file_or_path
+    return io.open(file_or_path, mode, encoding=encoding, newline='')
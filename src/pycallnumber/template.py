@@ -8,7 +8,9 @@ import collections
 
 from pycallnumber.options import ObjectWithOptions
 from pycallnumber.exceptions import InvalidCallNumberStringError,\
-                                    SettingsError, MethodError
+                                    ValidationFailure, SettingsError,\
+                                    MethodError
+from pycallnumber.regexcache import compile_pattern
 from pycallnumber import utils as u
 
 
@@ -59,11 +61,14 @@ class Template(ObjectWithOptions):
     @u.memoize
     def get_regex(self, match_whole=False, use_re_groups=False):
         pattern = self._generate_pattern(match_whole, use_re_groups)
-        return re.compile(pattern)
+        return compile_pattern(pattern)
 
-    def validate(self, cnstr, options=None):
+    def validate(self, cnstr, options=None, quiet=False):
         if not self._str_conforms_to_template(cnstr, options):
-            raise InvalidCallNumberStringError()
+            failure = ValidationFailure('no_match')
+            if quiet:
+                return failure
+            raise InvalidCallNumberStringError(failure)
         return True
 
 
@@ -211,7 +216,7 @@ class Grouping(ObjectWithOptions):
             patterns.append(p)
         pattern = r'|'.join(patterns)
         pattern = u.convert_re_groups_to_noncapturing(pattern)
-        return re.compile(pattern)
+        return compile_pattern(pattern)
 
     @u.memoize
     def get_full_regex(self, include_re_group=False):
@@ -224,7 +229,7 @@ class Grouping(ObjectWithOptions):
             pattern = r'(?:{})'.format(pattern)
         if self.is_optional:
             pattern = r'{}?'.format(pattern)
-        return re.compile(pattern)
+        return compile_pattern(pattern)
 
     def _generate_pattern_with_inner_sep(self):
         pattern = ''
@@ -268,73 +273,81 @@ class Grouping(ObjectWithOptions):
         return (parts,)
 
     def _split_outer_sep(self, string, useropts):
-        pattern = self.get_outer_separator_regex().pattern
-        if self.outer_sep_placement == 'before':
-            pattern = r'^{}'.format(pattern)
-        elif self.outer_sep_placement == 'after':
-            pattern = r'{}$'.format(pattern)
         unit = None
-        match = re.search(pattern, string)
+        match = self._get_outer_sep_split_regex().search(string)
         match_str = match.group(0) if match else ''
         if match_str:
             unit = u.create_unit(match_str, self.outer_sep_group.types,
                                  useropts, self.outer_sep_group.name, True)
             if unit is None:
                 msg = ('Could not create outer_sep Unit object from string '
-                       '\'{}\' based on allowable outer_sep unit types: {}.'
-                       ''.format(match_str,
-                                 ', '.join(self.outer_sep_group.types)))
-                raise InvalidCallNumberStringError(msg)
-            string = re.sub(pattern, '', string)
+                       '\'{}\' based on allowable outer_sep unit types: {}.')
+                failure = ValidationFailure('no_match', msg, match_str,
+                                            self.outer_sep_group.types)
+                raise InvalidCallNumberStringError(failure)
+            string = '{}{}'.format(string[:match.start()],
+                                   string[match.end():])
         return (unit, string)
 
     def _split_string(self, string, useropts):
         parts = []
-        is_first, is_last = True, False
-        while string:
-            match_str = self._get_split_part_regex().match(string).group(0)
-            if not match_str:
-                msg = ('Could not match \'{}\' to /{}/.'
-                       ''.format(string, self._get_split_part_regex().pattern))
-                raise InvalidCallNumberStringError(msg)
+        part_regex = self._get_split_part_regex()
+        sep_regex = self.get_inner_separator_regex()
+        pos, end = 0, len(string)
+        while pos < end:
+            match = part_regex.match(string, pos)
+            if not match or match.end() == pos:
+                failure = ValidationFailure('no_match',
+                                            'Could not match \'{}\' to /{}/.',
+                                            string[pos:], part_regex.pattern)
+                raise InvalidCallNumberStringError(failure)
+            match_str = match.group(0)
             unit = u.create_unit(match_str, self.types, useropts, self.name)
             if unit is None:
                 msg = ('Could not create Unit object for \'{}\' based on '
-                       'allowable unit types: {}.'
-                       ''.format(match_str, str(self.types)))
-                raise InvalidCallNumberStringError(msg)
+                       'allowable unit types: {}.')
+                failure = ValidationFailure('no_match', msg, match_str,
+                                            self.types)
+                raise InvalidCallNumberStringError(failure)
             parts.append(unit)
-            remove = re.escape(match_str)
-            string = re.sub(r'^{}'.format(remove), '', string)
-            if is_first and match_str:
-                is_first = False
-
-            if string:
-                sep = self.get_inner_separator_regex().match(string).group(0)
-                if sep:
-                    string = re.sub(r'^{}'.format(re.escape(sep)), '', string)
-                    if not string:
-                        is_last = True
-                    if is_first or is_last:
+            pos = match.end()
+
+            if pos < end:
+                match = sep_regex.match(string, pos)
+                if match and match.end() > pos:
+                    sep = match.group(0)
+                    pos = match.end()
+                    if pos == end:
                         msg = ('A grouping cannot begin or end with an inner '
                                'separator.')
-                        raise InvalidCallNumberStringError(msg)
+                        failure = ValidationFailure('invalid_separator', msg)
+                        raise InvalidCallNumberStringError(failure)
                     unit = u.create_unit(sep, [self.inner_sep_type], useropts,
                                          is_separator=True)
                     if unit is None:
                         msg = ('Could not create inner_sep Unit object of '
-                               'type {} from string \'{}\'.'
-                               ''.format(self.inner_sep_type, sep))
-                        raise InvalidCallNumberStringError(msg)
+                               'type {} from string \'{}\'.')
+                        failure = ValidationFailure('invalid_separator', msg,
+                                                    self.inner_sep_type, sep)
+                        raise InvalidCallNumberStringError(failure)
                     parts.append(unit)
         return parts
 
+    @u.memoize
+    def _get_outer_sep_split_regex(self):
+        pattern = self.get_outer_separator_regex().pattern
+        if self.outer_sep_placement == 'before':
+            pattern = r'^{}'.format(pattern)
+        elif self.outer_sep_placement == 'after':
+            pattern = r'{}$'.format(pattern)
+        return compile_pattern(pattern)
+
     @u.memoize
     def _get_split_part_regex(self):
         base_p = self.get_base_regex().pattern
         next_p = self.get_inner_separator_regex().pattern or base_p
         pattern = r'(?:(?:{0})$|(?:{0})(?=(?:{1})))'.format(base_p, next_p)
-        return re.compile(pattern)
+        return compile_pattern(pattern)
 
 
 class CompoundTemplate(Template):
@@ -461,13 +474,17 @@ class CompoundTemplate(Template):
                 names.append(g.name)
         return names
 
-    def validate(self, cnstr, u_opts=None):
+    def validate(self, cnstr, u_opts=None, quiet=False):
         try:
             parts = self.cnstr_to_parts(cnstr, u_opts)
         except InvalidCallNumberStringError as e:
+            detail = ValidationFailure.from_error(e)
             msg = ('**** Here is what was found while attempting to parse '
-                   '\'{}\' ****\n\n{}').format(cnstr, e)
-            raise InvalidCallNumberStringError(msg)
+                   '\'{}\' ****\n\n{}')
+            failure = ValidationFailure(detail.reason, msg, cnstr, detail)
+            if quiet:
+                return failure
+            raise InvalidCallNumberStringError(failure)
         return parts
 
     def _generate_pattern(self, match_whole=False, use_re_groups=False):
@@ -478,40 +495,88 @@ class CompoundTemplate(Template):
         return pattern
 
     def cnstr_to_parts(self, cnstr, u_opts):
-        partlist, msg, blank_so_far = [], '', True
+        match = self.get_regex(True, True).match(cnstr)
+        if match:
+            try:
+                return self._match_to_parts(match, cnstr, u_opts)
+            except InvalidCallNumberStringError:
+                pass
+        return self._cnstr_to_parts_stepwise(cnstr, u_opts)
+
+    def _match_to_parts(self, match, cnstr, u_opts):
+        """Build the parts list for ``cnstr`` from a single match.
+
+        ``match`` is the result of matching ``cnstr`` against the
+        full, anchored regex for this template, which has one named
+        group per grouping; each grouping's span is sliced out of the
+        original string directly. Raises an (empty)
+        InvalidCallNumberStringError if anything doesn't validate, in
+        which case ``_cnstr_to_parts_stepwise`` should be used to
+        generate a useful error message.
+        """
+        partlist, blank_so_far = [], True
+        for g in self.groupings:
+            match_str = match.group(g.name) or ''
+            parts = g.cnstr_to_units(match_str, u_opts)
+            partlist.extend(parts)
+            is_last = match_str and match.end(g.name) == len(cnstr)
+            is_first = match_str and blank_so_far
+            blank_so_far = False if is_first else blank_so_far
+            if not self._part_separator_is_valid(parts, is_first, is_last):
+                raise InvalidCallNumberStringError()
+        return self.partlist_type(*partlist)
+
+    def _cnstr_to_parts_stepwise(self, cnstr, u_opts):
+        partlist, matched, blank_so_far = [], [], True
         for i, g in enumerate(self.groupings):
             match = self._get_right_anchored_grouping_regex(g, i).match(cnstr)
             match_str, cnstr = self._process_part_match(match, cnstr, g.name)
             if match_str is None:
-                error_text = self._generate_non_match_error(cnstr, g, i)
-                msg = '{}{}'.format(msg, error_text)
-                raise InvalidCallNumberStringError(msg)
+                failure = ValidationFailure(
+                    'no_match', self._generate_stepwise_error, matched,
+                    self._generate_non_match_error, cnstr, g, i)
+                raise InvalidCallNumberStringError(failure)
             try:
                 parts = g.cnstr_to_units(match_str, u_opts)
             except InvalidCallNumberStringError as e:
-                msg = ('{}While parsing the {} grouping, \'{}\' was found to '
-                       'be invalid. {} {}'
-                       ''.format(msg, g.name, match_str, e.args[0],
-                                 g.describe()))
-                raise InvalidCallNumberStringError(msg)
+                detail = ValidationFailure.from_error(e)
+                failure = ValidationFailure(
+                    'invalid_grouping', self._generate_stepwise_error, matched,
+                    self._generate_invalid_grouping_error, g, match_str,
+                    detail)
+                raise InvalidCallNumberStringError(failure)
             partlist.extend(parts)
-            msg = ('{}\'{}\' matched the {} grouping.\n'
-                   ''.format(msg, match_str, g.name))
+            matched.append((match_str, g.name))
 
             is_last = match_str and not cnstr
             is_first = match_str and blank_so_far
             blank_so_far = False if is_first else blank_so_far
             if not self._part_separator_is_valid(parts, is_first, is_last):
-                msg = ('{}While parsing the {} grouping, \'{}\' was found to '
-                       'contain a separator that was not valid: separators '
-                       'must not appear at the beginning or end of a call '
-                       'number string, and the grouping immediately preceding '
-                       'or following the separator must exist.'
-                       ''.format(msg, g.name, match_str))
-                raise InvalidCallNumberStringError(msg)
+                failure = ValidationFailure(
+                    'invalid_separator', self._generate_stepwise_error,
+                    matched, self._generate_invalid_separator_error, g,
+                    match_str)
+                raise InvalidCallNumberStringError(failure)
 
         return self.partlist_type(*partlist)
 
+    def _generate_stepwise_error(self, matched, generate_error, *args):
+        msg = ''.join(['\'{}\' matched the {} grouping.\n'.format(m, name)
+                       for m, name in matched])
+        return '{}{}'.format(msg, generate_error(*args))
+
+    def _generate_invalid_grouping_error(self, grouping, match_str, detail):
+        return ('While parsing the {} grouping, \'{}\' was found to be '
+                'invalid. {} {}'.format(grouping.name, match_str, detail,
+                                        grouping.describe()))
+
+    def _generate_invalid_separator_error(self, grouping, match_str):
+        return ('While parsing the {} grouping, \'{}\' was found to contain '
+                'a separator that was not valid: separators must not appear '
+                'at the beginning or end of a call number string, and the '
+                'grouping immediately preceding or following the separator '
+                'must exist.'.format(grouping.name, match_str))
+
     @u.memoize
     def _get_right_anchored_grouping_regex(self, grouping, grouping_index):
         pattern = grouping.get_full_regex(True).pattern
@@ -525,7 +590,7 @@ class CompoundTemplate(Template):
             next_patterns.append('$')
         if next_patterns:
             pattern = '{}(?={})'.format(pattern, ''.join(next_patterns))
-        return re.compile(pattern)
+        return compile_pattern(pattern)
 
     def _generate_non_match_error(self, cnstr, grouping, grouping_index):
         err_group, msg = None, ''
@@ -3,11 +3,13 @@
 
 from __future__ import unicode_literals
 from __future__ import absolute_import
-import inspect
+import sys
 
 from pycallnumber.options import ObjectWithOptions
-from pycallnumber.exceptions import InvalidCallNumberStringError
+from pycallnumber.exceptions import InvalidCallNumberStringError,\
+                                    ValidationFailure, OptionsError
 from pycallnumber.template import Template, SimpleTemplate, CompoundTemplate
+from pycallnumber import settings
 from pycallnumber import utils as u
 
 
@@ -15,13 +17,15 @@ class Unit(u.ComparableObjectMixin, ObjectWithOptions):
 
     options_defaults = {
         'definition': None,
-        'is_separator': False
+        'is_separator': False,
+        'intern_simple_units': settings.DEFAULT_INTERN_SIMPLE_UNITS
     }
     template = Template()
     is_formatting = False
     is_simple = False
     is_alphabetic = False
     is_numeric = False
+    is_interned = False
 
     def __init__(self, cnstr, name='', **useropts):
         super(Unit, self).__init__(**useropts)
@@ -31,14 +35,12 @@ class Unit(u.ComparableObjectMixin, ObjectWithOptions):
 
     @classmethod
     def _get_derive_calling_module_name(cls, stacklevel):
-        caller_frm = inspect.stack()[stacklevel+1][0]
+        # ``sys._getframe`` is much cheaper than ``inspect.stack``, which
+        # builds source context for every frame on the stack.
         try:
-            name = inspect.getmodule(caller_frm).__name__
-        except Exception:
-            name = None
-        finally:
-            del caller_frm
-        return name
+            return sys._getframe(stacklevel + 1).f_globals['__name__']
+        except (AttributeError, KeyError, ValueError):
+            return None
 
     @classmethod
     def derive(cls, stacklevel=1, **attributes):
@@ -62,17 +64,24 @@ class Unit(u.ComparableObjectMixin, ObjectWithOptions):
         return newclass
 
     @classmethod
-    def validate(cls, cnstr, instance_options=None):
+    def validate(cls, cnstr, instance_options=None, quiet=False):
         instance_options = instance_options or cls.options_defaults.copy()
-        try:
-            validate_result = cls.template.validate(cnstr, instance_options)
-        except InvalidCallNumberStringError as e:
-            msg = ('\'{}\' is not a valid {} Unit. It should be {}.'
-                   '').format(cnstr, cls.__name__, cls.describe_short(False))
-            if str(e):
-                msg = '{}\n\n{}'.format(msg, e)
-            raise InvalidCallNumberStringError(msg)
-        return validate_result
+        result = cls.template.validate(cnstr, instance_options, quiet=True)
+        if isinstance(result, ValidationFailure):
+            result = ValidationFailure(result.reason,
+                                       cls._generate_invalid_message, cnstr,
+                                       result)
+            if not quiet:
+                raise InvalidCallNumberStringError(result)
+        return result
+
+    @classmethod
+    def _generate_invalid_message(cls, cnstr, detail):
+        msg = ('\'{}\' is not a valid {} Unit. It should be {}.'
+               '').format(cnstr, cls.__name__, cls.describe_short(False))
+        if str(detail):
+            msg = '{}\n\n{}'.format(msg, detail)
+        return msg
 
     @classmethod
     def describe_short(cls, include_pattern=False):
@@ -109,6 +118,64 @@ class Unit(u.ComparableObjectMixin, ObjectWithOptions):
     def __contains__(self, other):
         return True if str(other) in str(self) else False
 
+    def __getattr__(self, name):
+        # Only called when normal attribute lookup fails. Option values
+        # that aren't stored on the instance (see
+        # ``apply_option_to_self``) come from ``self.options``.
+        try:
+            return self.__dict__['options'][name]
+        except KeyError:
+            msg = '\'{}\' object has no attribute \'{}\''
+            raise AttributeError(msg.format(type(self).__name__, name))
+
+    def reset_options(self, useropts=None, override_class_opts=False):
+        self._raise_if_interned()
+        super(Unit, self).reset_options(useropts, override_class_opts)
+        self.clear_cache()
+
+    def set_option(self, option, value, override_class_opts=False):
+        self._raise_if_interned()
+        super(Unit, self).set_option(option, value, override_class_opts)
+        self.clear_cache()
+
+    def _raise_if_interned(self):
+        # Interned Units are shared by every call number that contains
+        # them (see ``settings.DEFAULT_INTERN_SIMPLE_UNITS``).
+        if self.is_interned:
+            msg = ('The options on an interned {} cannot be changed; create '
+                   'a new Unit with the options you want instead.'
+                   ''.format(type(self).__name__))
+            raise OptionsError(msg)
+
+    def __getstate__(self):
+        # A copy of an interned Unit isn't shared, so it can be changed.
+        state = self.__dict__.copy()
+        state.pop('is_interned', None)
+        return state
+
+    def apply_option_to_self(self, option, value):
+        # Units are created in large numbers, so an option value is
+        # only stored as an instance attribute if the class has an
+        # attribute with the same name and a different value. Other
+        # option values are available via ``__getattr__``.
+        cls_value = getattr(type(self), option, value)
+        if cls_value is not value:
+            setattr(self, option, value)
+        else:
+            self.__dict__.pop(option, None)
+
+    def clear_cache(self):
+        """Clear cached values, such as sort keys, for this Unit.
+
+        Sort and search keys are computed once and then cached, since
+        they're used for every comparison. Changing options via
+        ``set_option`` or ``reset_options`` clears the cache
+        automatically, but the cache on a CompoundUnit is not cleared
+        when the options on one of its parts change; call this method
+        on the parent if you change options on a part directly.
+        """
+        self.__dict__.pop('_cache', None)
+
     def for_sort(self):
         return self._string
 
@@ -118,9 +185,21 @@ class Unit(u.ComparableObjectMixin, ObjectWithOptions):
     def for_print(self):
         return self._string
 
-    def cmp_key(self, other, op):
+    def for_sort_packed(self):
+        """Return the ``for_sort`` value packed into a bytes key.
+
+        Packed keys sort the same way ``for_sort`` values do, but they
+        are more compact. See ``utils.pack_sort_key``.
+        """
+        return u.pack_sort_key(self.for_sort())
+
+    @u.memoize
+    def _get_sort_key(self):
         return self.for_sort()
 
+    def cmp_key(self, other, op):
+        return self._get_sort_key()
+
 
 class SimpleUnit(Unit):
 
@@ -138,17 +217,58 @@ class CompoundUnit(Unit):
     )
     options_defaults = Unit.options_defaults.copy()
     sort_break = '!'
-
-    def __init__(self, cnstr, name='default', **options):
-        super(CompoundUnit, self).__init__(cnstr, name, **options)
-        self._generate_parts_and_attributes()
+    has_part_names = True
+
+    def __init__(self, cnstr, name='default', lazy=False, **options):
+        """Create a CompoundUnit from the string ``cnstr``.
+
+        If ``lazy`` is True, ``cnstr`` is only matched against the
+        template's regex, and the spans for each grouping are kept.
+        The parts for a grouping are not created until they are first
+        needed, e.g., when accessing that part as an attribute or
+        calling ``for_sort``. Use this only for strings you know are
+        valid: a lazy Unit skips any validation beyond the regex, so
+        an invalid string may raise an InvalidCallNumberStringError
+        later, when a part is created. If ``cnstr`` does not match the
+        regex, the Unit is created normally.
+        """
+        match = None
+        if lazy:
+            match = self.template.get_regex(True, True).match(cnstr)
+        if match is None:
+            super(CompoundUnit, self).__init__(cnstr, name, **options)
+            self._generate_parts_and_attributes()
+        else:
+            super(Unit, self).__init__(**options)
+            self._string = str(cnstr)
+            self.name = name
+            self._lazy_spans = [match.span(g.name)
+                                for g in self.template.groupings]
+            self._lazy_groups = {}
+
+    def __getattr__(self, name):
+        if self.__dict__.get('_lazy_spans') is not None:
+            if name in ('_parts', 'part_names'):
+                self._generate_lazy_parts_and_attributes()
+                return getattr(self, name)
+            for i, g in enumerate(self.template.groupings):
+                osep_name = getattr(g.outer_sep_group, 'name', None)
+                if name in (g.name, osep_name):
+                    self._generate_lazy_grouping(i)
+                    if name in self.__dict__:
+                        return self.__dict__[name]
+                    break
+        return super(CompoundUnit, self).__getattr__(name)
 
     def _generate_parts_and_attributes(self):
+        validate_result = self.__dict__.pop('_validate_result')
+        self._set_parts_and_attributes(zip(validate_result._fields,
+                                           validate_result))
+
+    def _set_parts_and_attributes(self, names_and_values):
         self._parts = []
         self.part_names = []
-        self.has_part_names = True
-        for name in self._validate_result._fields:
-            value = getattr(self._validate_result, name)
+        for name, value in names_and_values:
             if isinstance(value, list):
                 value = MultiUnitWrapper(value, value[0].name)
             if not getattr(value, 'is_separator', False):
@@ -157,6 +277,37 @@ class CompoundUnit(Unit):
             if value is not None:
                 self._parts.append(value)
 
+    def _generate_lazy_grouping(self, index):
+        try:
+            return self._lazy_groups[index]
+        except KeyError:
+            pass
+        g = self.template.groupings[index]
+        start, end = self._lazy_spans[index]
+        values = g.cnstr_to_units(self._string[start:end], self.options)
+        if g.outer_sep_group and g.outer_sep_placement == 'before':
+            names = (g.outer_sep_group.name, g.name)
+        elif g.outer_sep_group and g.outer_sep_placement == 'after':
+            names = (g.name, g.outer_sep_group.name)
+        else:
+            names = (g.name,)
+        names_and_values = []
+        for name, value in zip(names, values):
+            if isinstance(value, list):
+                value = MultiUnitWrapper(value, value[0].name)
+            if not getattr(value, 'is_separator', False):
+                setattr(self, name, value)
+            names_and_values.append((name, value))
+        self._lazy_groups[index] = names_and_values
+        return names_and_values
+
+    def _generate_lazy_parts_and_attributes(self):
+        names_and_values = []
+        for i in range(len(self._lazy_spans)):
+            names_and_values.extend(self._generate_lazy_grouping(i))
+        del self._lazy_spans, self._lazy_groups
+        self._set_parts_and_attributes(names_and_values)
+
     def __contains__(self, other):
         if isinstance(other, type):
             return other == type(self) or self._contains_part_with_type(other)
@@ -173,6 +324,7 @@ class CompoundUnit(Unit):
         return any([(type(other) == type(p) and other == p or
                      type(other) in p and other in p) for p in self._parts])
 
+    @u.memoize
     def for_sort(self):
         strings, join = ([], False)
         for p in self._parts:
@@ -185,6 +337,7 @@ class CompoundUnit(Unit):
             join = True if is_sep_or_formatting and for_sort else False
         return self.sort_break.join(strings)
 
+    @u.memoize
     def for_search(self):
         return ''.join([p.for_search() for p in self._parts])
 
@@ -194,12 +347,13 @@ class CompoundUnit(Unit):
 
 class MultiUnitWrapper(CompoundUnit):
 
+    has_part_names = False
+
     def __init__(self, parts, name='', is_separator=False):
         self.name = name
         self.is_separator = is_separator
         self._parts = parts
         self._parts_without_separators = self._remove_separators(self._parts)
-        self.has_part_names = False
 
     def __len__(self):
         return len(self._parts_without_separators)
@@ -1,18 +1,56 @@
-"""Work with predefined types of call numbers and call number parts."""
+"""Work with predefined types of call numbers and call number parts.
+
+Unit types are imported from their modules the first time they're
+used, so importing this package doesn't load (and compile templates
+for) every call number type.
+"""
 from __future__ import absolute_import
+import sys
+
+from pycallnumber import utils as u
 
-from pycallnumber.units.simple import Alphabetic, Numeric, Formatting
-from pycallnumber.units.compound import AlphaNumeric, AlphaSymbol,\
-                                        NumericSymbol, AlphaNumericSymbol
-from pycallnumber.units.numbers import Number, OrdinalNumber
-from pycallnumber.units.dates import DateString
-from pycallnumber.units.callnumbers.parts import Cutter, Edition, Item
-from pycallnumber.units.callnumbers import LC, LcClass, Dewey, DeweyClass,\
-                                           SuDoc, Agency, AgencyDotSeries,\
-                                           Local
+_LAZY_ATTRIBUTES = {
+    'Alphabetic': 'pycallnumber.units.simple',
+    'Numeric': 'pycallnumber.units.simple',
+    'Formatting': 'pycallnumber.units.simple',
+    'AlphaNumeric': 'pycallnumber.units.compound',
+    'AlphaSymbol': 'pycallnumber.units.compound',
+    'NumericSymbol': 'pycallnumber.units.compound',
+    'AlphaNumericSymbol': 'pycallnumber.units.compound',
+    'Number': 'pycallnumber.units.numbers',
+    'OrdinalNumber': 'pycallnumber.units.numbers',
+    'DateString': 'pycallnumber.units.dates.datestring',
+    'Cutter': 'pycallnumber.units.callnumbers.parts',
+    'Edition': 'pycallnumber.units.callnumbers.parts',
+    'Item': 'pycallnumber.units.callnumbers.parts',
+    'LC': 'pycallnumber.units.callnumbers.lc',
+    'LcClass': 'pycallnumber.units.callnumbers.lc',
+    'Dewey': 'pycallnumber.units.callnumbers.dewey',
+    'DeweyClass': 'pycallnumber.units.callnumbers.dewey',
+    'SuDoc': 'pycallnumber.units.callnumbers.sudoc',
+    'Agency': 'pycallnumber.units.callnumbers.sudoc',
+    'AgencyDotSeries': 'pycallnumber.units.callnumbers.sudoc',
+    'Local': 'pycallnumber.units.callnumbers.local',
+    'simple': 'pycallnumber.units.simple',
+    'compound': 'pycallnumber.units.compound',
+    'numbers': 'pycallnumber.units.numbers',
+    'dates': 'pycallnumber.units.dates',
+    'callnumbers': 'pycallnumber.units.callnumbers',
+}
 
 __all__ = ['Alphabetic', 'Numeric', 'Formatting', 'AlphaNumeric',
            'AlphaSymbol', 'NumericSymbol', 'AlphaNumericSymbol', 'Number',
            'OrdinalNumber', 'DateString', 'Cutter', 'Edition', 'Item', 'LC',
            'LcClass', 'Dewey', 'DeweyClass', 'SuDoc', 'Agency',
            'AgencyDotSeries', 'Local']
+
+__getattr__ = u.create_lazy_getattr(globals(), _LAZY_ATTRIBUTES)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
@@ -1,10 +1,35 @@
 """Work with standard call number types."""
 from __future__ import absolute_import
+import sys
 
-from pycallnumber.units.callnumbers.dewey import Dewey, DeweyClass
-from pycallnumber.units.callnumbers.lc import LC, LcClass
-from pycallnumber.units.callnumbers.sudoc import SuDoc, Agency, AgencyDotSeries
-from pycallnumber.units.callnumbers.local import Local
+from pycallnumber import utils as u
+
+_LAZY_ATTRIBUTES = {
+    'Dewey': 'pycallnumber.units.callnumbers.dewey',
+    'DeweyClass': 'pycallnumber.units.callnumbers.dewey',
+    'LC': 'pycallnumber.units.callnumbers.lc',
+    'LcClass': 'pycallnumber.units.callnumbers.lc',
+    'SuDoc': 'pycallnumber.units.callnumbers.sudoc',
+    'Agency': 'pycallnumber.units.callnumbers.sudoc',
+    'AgencyDotSeries': 'pycallnumber.units.callnumbers.sudoc',
+    'Local': 'pycallnumber.units.callnumbers.local',
+    'dewey': 'pycallnumber.units.callnumbers.dewey',
+    'lc': 'pycallnumber.units.callnumbers.lc',
+    'sudoc': 'pycallnumber.units.callnumbers.sudoc',
+    'local': 'pycallnumber.units.callnumbers.local',
+    'parts': 'pycallnumber.units.callnumbers.parts',
+}
 
 __all__ = ['Dewey', 'DeweyClass', 'LC', 'LcClass', 'SuDoc', 'Agency',
            'AgencyDotSeries', 'Local']
+
+__getattr__ = u.create_lazy_getattr(globals(), _LAZY_ATTRIBUTES)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
@@ -63,6 +63,12 @@ Colon = Formatting.derive(
     base_pattern=r'\s*:\s*'
 )
 
+# SuDoc uses this as the related series for series that don't have one.
+BlankRelatedSeries = Formatting.derive(
+    min_length=0,
+    for_sort=lambda x: CompoundUnit.sort_break
+)
+
 
 class Agency(AlphaNumericSymbol):
 
@@ -213,8 +219,4 @@ class SuDoc(AlphaNumericSymbol):
         super(SuDoc, self).__init__(cnstr, name, **options)
         if hasattr(self.stem, 'series'):
             if not getattr(self.stem.series, 'related_series'):
-                blank_related_series = Formatting.derive(
-                    min_length=0,
-                    for_sort=lambda x: CompoundUnit.sort_break
-                )('')
-                self.stem.series._parts.append(blank_related_series)
+                self.stem.series._parts.append(BlankRelatedSeries(''))
@@ -9,7 +9,8 @@ import math
 import copy
 
 from pycallnumber import settings
-from pycallnumber.exceptions import InvalidCallNumberStringError, SettingsError
+from pycallnumber.exceptions import InvalidCallNumberStringError,\
+                                    ValidationFailure, SettingsError
 from pycallnumber.template import CompoundTemplate
 import pycallnumber.utils as u
 from pycallnumber.units.simple import Alphabetic, Numeric, Formatting
@@ -80,7 +81,7 @@ class BaseCompoundNumber(AlphaNumericSymbol):
     max_decimal_places = 0
 
     @classmethod
-    def validate(cls, cnstr, instance_options=None):
+    def validate(cls, cnstr, instance_options=None, quiet=False):
         too_low, too_high = False, False
         try:
             cnval = cls.string_to_value(cnstr)
@@ -90,9 +91,14 @@ class BaseCompoundNumber(AlphaNumericSymbol):
             pass
         if too_low or too_high:
             min_max_text = u.min_max_to_text(cls.min_val, cls.max_val, 'less')
-            msg = 'Value for {} must be {}'.format(cls.__name__, min_max_text)
-            raise InvalidCallNumberStringError(msg)
-        return super(BaseCompoundNumber, cls).validate(cnstr, instance_options)
+            failure = ValidationFailure('out_of_range',
+                                        'Value for {} must be {}',
+                                        cls.__name__, min_max_text)
+            if quiet:
+                return failure
+            raise InvalidCallNumberStringError(failure)
+        return super(BaseCompoundNumber, cls).validate(cnstr, instance_options,
+                                                       quiet)
 
     @classmethod
     def string_to_value(cls, cnstr):
@@ -8,7 +8,8 @@ import math
 from pycallnumber import settings
 from pycallnumber.template import SimpleTemplate
 from pycallnumber.unit import SimpleUnit
-from pycallnumber.exceptions import InvalidCallNumberStringError, SettingsError
+from pycallnumber.exceptions import InvalidCallNumberStringError,\
+                                    ValidationFailure, SettingsError
 from pycallnumber import utils as u
 
 
@@ -66,15 +67,22 @@ class Numeric(SimpleUnit):
     )
 
     @classmethod
-    def validate(cls, cnstr, instance_options=None):
-        validate_result = super(Numeric, cls).validate(cnstr, instance_options)
+    def validate(cls, cnstr, instance_options=None, quiet=False):
+        validate_result = super(Numeric, cls).validate(cnstr, instance_options,
+                                                       quiet)
+        if isinstance(validate_result, ValidationFailure):
+            return validate_result
         cnval = cls.string_to_value(cnstr)
         too_low = cls.min_val is not None and cnval < cls.min_val
         too_high = cls.max_val is not None and cnval > cls.max_val
         if too_low or too_high:
             min_max_text = u.min_max_to_text(cls.min_val, cls.max_val, 'less')
-            msg = 'Value for {} must be {}'.format(cls.__name__, min_max_text)
-            raise InvalidCallNumberStringError(msg)
+            failure = ValidationFailure('out_of_range',
+                                        'Value for {} must be {}',
+                                        cls.__name__, min_max_text)
+            if quiet:
+                return failure
+            raise InvalidCallNumberStringError(failure)
         return validate_result
 
     @classmethod
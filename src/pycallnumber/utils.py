@@ -5,19 +5,40 @@ from __future__ import absolute_import
 from builtins import str
 from builtins import range
 from builtins import object
+from builtins import bytes
+import collections
+import csv
 import functools
 import inspect
+import io
 import re
 import struct
+import sys
 import importlib
 import types
 
+from pycallnumber import settings
 from pycallnumber.exceptions import InvalidCallNumberStringError
 
+try:
+    from future.utils import native_str, string_types
+except ImportError:
+    # Python 3 without ``future`` installed
+    native_str, string_types = str, (str,)
 
-def memoize(function):
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize'])
+
+_interned_units = collections.OrderedDict()
+
+
+def memoize(function=None, maxsize=None):
     """Decorate a function/method so it caches its return value.
 
+    Use as ``@memoize``, or as ``@memoize(maxsize=N)`` to keep no more
+    than N values in each cache, discarding the least recently used
+    values first.
+
     If the function is called as a method, then the cache is attached
     to the object used as the first arg passed to the method (e.g.,
     ``self`` or ``cls``) and can be accessed directly via a ``_cache``
@@ -28,46 +49,106 @@ def memoize(function):
     the cache is attached to the function itself via a ``_cache``
     attribute.
 
-    Cache keys are calculated based on the argument values--both
-    positional and keyword. In cases where a function uses default
-    values for kwargs, the key will be the same no matter whether the
-    call to the method includes the kwargs or relies on the default
-    values. Order of args in the key will follow the order in the
-    function's signature, even if kwargs are called out of order.
+    ``_cache`` is a dict that maps the name of each memoized function
+    to that function's cache: a dict whose keys are tuples of argument
+    values--both positional and keyword. In cases where a function
+    uses default values for kwargs, the key will be the same no matter
+    whether the call to the method includes the kwargs or relies on
+    the default values. Order of args in the key will follow the order
+    in the function's signature, even if kwargs are called out of
+    order. Calls with unhashable argument values are not cached.
+
+    The decorated function gets a ``cache_info`` method, which returns
+    a CacheInfo namedtuple with the total number of cache ``hits`` and
+    ``misses`` so far, along with the ``maxsize``.
     """
+    if function is None:
+        return functools.partial(memoize, maxsize=maxsize)
+
     try:
         sig = inspect.signature(function)
     except AttributeError:
-        argnames, _, _, _ = inspect.getargspec(function)
+        argspec = inspect.getargspec(function)
+        argnames = argspec.args
+        defaults = dict(zip(reversed(argnames),
+                            reversed(argspec.defaults or ())))
+        has_only_simple_args = not (argspec.varargs or argspec.keywords)
     else:
         argnames = [arg for arg in sig.parameters.keys()]
-
-    if len(argnames) > 0 and argnames[0] in ('self', 'cls'):
+        defaults = {name: param.default
+                    for name, param in sig.parameters.items()
+                    if param.default is not param.empty}
+        has_only_simple_args = all([p.kind == p.POSITIONAL_OR_KEYWORD
+                                    for p in sig.parameters.values()])
+
+    name, num_args = function.__name__, len(argnames)
+    if num_args > 0 and argnames[0] in ('self', 'cls'):
         function_is_method = True
-        argnames = argnames[1:]
+        first_keyed_arg = 1
     else:
         function_is_method = False
+        first_keyed_arg = 0
         function._cache = {}
-
-    def generate_key(base, args, kwargs):
+    stats = {'hits': 0, 'misses': 0}
+
+    def generate_key(args, kwargs):
+        if not kwargs and len(args) == num_args:
+            return args[first_keyed_arg:]
+        if has_only_simple_args and len(args) <= num_args:
+            vals = list(args[first_keyed_arg:])
+            unused_kwargs = len(kwargs)
+            for argname in argnames[len(args):]:
+                if argname in kwargs:
+                    vals.append(kwargs[argname])
+                    unused_kwargs -= 1
+                elif argname in defaults:
+                    vals.append(defaults[argname])
+                else:
+                    break
+            else:
+                if not unused_kwargs:
+                    return tuple(vals)
         argsmap = inspect.getcallargs(function, *args, **kwargs)
-        argvals_as_strings = [str(argsmap[argname]) for argname in argnames]
-        argstr = '_{}'.format('_'.join(argvals_as_strings)) if argnames else ''
-        return '{}{}'.format(base, argstr)
+        return tuple([argsmap[argname]
+                      for argname in argnames[first_keyed_arg:]])
+
+    def get_function_cache(obj):
+        try:
+            obj_cache = obj._cache
+        except AttributeError:
+            obj_cache = obj._cache = {}
+        try:
+            return obj_cache[name]
+        except KeyError:
+            cache = {} if maxsize is None else collections.OrderedDict()
+            obj_cache[name] = cache
+            return cache
 
     @functools.wraps(function)
     def wrapper(*args, **kwargs):
-        if function_is_method:
-            obj = args[0]
+        cache = get_function_cache(args[0] if function_is_method else function)
+        key = generate_key(args, kwargs)
+        try:
+            value = cache[key]
+        except KeyError:
+            stats['misses'] += 1
+        except TypeError:
+            return function(*args, **kwargs)
         else:
-            obj = function
-        cache = getattr(obj, '_cache', {})
-        key = generate_key(function.__name__, args, kwargs)
-        if key not in cache:
-            cache[key] = function(*args, **kwargs)
-            obj._cache = cache
-        return obj._cache[key]
-
+            stats['hits'] += 1
+            if maxsize is not None:
+                cache[key] = cache.pop(key)
+            return value
+        value = function(*args, **kwargs)
+        cache[key] = value
+        if maxsize is not None and len(cache) > maxsize:
+            cache.popitem(last=False)
+        return value
+
+    def cache_info():
+        return CacheInfo(stats['hits'], stats['misses'], maxsize)
+
+    wrapper.cache_info = cache_info
     return wrapper
 
 
@@ -128,20 +209,238 @@ def load_class(class_string):
     return getattr(importlib.import_module(module), class_)
 
 
+def create_lazy_getattr(namespace, lazy_attributes):
+    """Create a module ``__getattr__`` that imports names on demand.
+
+    ``namespace`` is the ``globals()`` dict of the module (usually a
+    package ``__init__``) that will use the function, and
+    ``lazy_attributes`` maps each lazily loaded name to the full path
+    of the module that provides it. If the name is the last part of
+    the module path, the module itself is returned (e.g., a
+    subpackage); otherwise the attribute with that name is taken from
+    the module. Each value is stored in ``namespace`` once it's
+    loaded, so later lookups don't go through ``__getattr__``.
+
+    Module-level ``__getattr__`` functions (PEP 562) are only used by
+    Python 3.7+. On earlier versions, call the returned function for
+    each name in ``lazy_attributes`` to load everything immediately.
+    """
+    def __getattr__(name):
+        try:
+            module_path = lazy_attributes[name]
+        except KeyError:
+            msg = 'module {!r} has no attribute {!r}'
+            raise AttributeError(msg.format(namespace['__name__'], name))
+        value = importlib.import_module(module_path)
+        if module_path.split('.')[-1] != name:
+            value = getattr(value, name)
+        namespace[name] = value
+        return value
+    return __getattr__
+
+
+def could_be_unit_type(cnstr, unittype):
+    """Quickly check whether a string might be a valid ``unittype``.
+
+    Returns False only if the string does not match the unit type's
+    full template regex, which means it could never validate as that
+    type; the (much more expensive) full parse can be skipped. Returns
+    True otherwise. Types whose templates cannot generate a regex are
+    always considered possible matches.
+    """
+    try:
+        regex = unittype.get_template_regex(match_whole=True)
+    except (NotImplementedError, AttributeError):
+        return True
+    return bool(regex.match(cnstr))
+
+
 def create_unit(cnstr, possible_types, useropts, name='', is_separator=False):
+    types_and_opts = filter_useropts_for_types(possible_types, useropts,
+                                               is_separator)
+    return create_unit_from_filtered(cnstr, types_and_opts, name)
+
+
+def filter_useropts_for_types(possible_types, useropts, is_separator=False):
+    """Pair each of a list of Unit types with its valid ``useropts``.
+
+    Returns a list of (unit_type, opts) tuples, in the same order as
+    ``possible_types``, where each ``opts`` dict is filtered down to
+    the options that the type accepts. The result can be reused with
+    ``create_unit_from_filtered`` to create any number of units
+    without filtering the options again each time.
+    """
     useropts = useropts or {}
+    types_and_opts = []
     for t in possible_types:
         opts = t.filter_valid_useropts(useropts)
         opts['is_separator'] = is_separator
+        types_and_opts.append((t, opts))
+    return types_and_opts
+
+
+def create_unit_from_filtered(cnstr, types_and_opts, name=''):
+    """Create a Unit from the first type that ``cnstr`` validates as.
+
+    ``types_and_opts`` is a list of (unit_type, opts) tuples, as
+    returned by ``filter_useropts_for_types``. Returns None if no type
+    matches.
+
+    If a type is a SimpleUnit type and its ``opts`` set the
+    ``intern_simple_units`` option to True, then an existing Unit
+    with the same type, string, name, and options is returned if
+    there is one (see ``settings.DEFAULT_INTERN_SIMPLE_UNITS``).
+    Interned Units are read-only: changing their options raises an
+    OptionsError.
+    """
+    for t, opts in types_and_opts:
+        key = None
+        if t.is_simple and opts.get('intern_simple_units'):
+            key = _get_interned_unit_key(t, cnstr, name, opts)
+            unit = _interned_units.pop(key, None)
+            if unit is not None:
+                _interned_units[key] = unit
+                return unit
+        if not could_be_unit_type(cnstr, t):
+            continue
         try:
             unit = t(cnstr, name=name, **opts)
         except InvalidCallNumberStringError:
             pass
         else:
+            if key is not None:
+                _intern_unit(key, unit)
             return unit
     return None
 
 
+def _get_interned_unit_key(unittype, cnstr, name, opts):
+    try:
+        key = (unittype, cnstr, name, frozenset(opts.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _intern_unit(key, unit):
+    if len(_interned_units) >= settings.DEFAULT_MAX_INTERNED_UNITS:
+        _interned_units.popitem(last=False)
+    # Units stay read-only after they're discarded here, because call
+    # numbers created before that may still share them.
+    unit.is_interned = True
+    _interned_units[key] = unit
+
+
+def clear_interned_units():
+    """Discard all SimpleUnit objects kept for reuse.
+
+    See ``settings.DEFAULT_INTERN_SIMPLE_UNITS``.
+    """
+    _interned_units.clear()
+
+
+def pack_sort_key(sort_string):
+    """Pack a sort string (e.g. from ``for_sort``) into a bytes key.
+
+    Comparing two packed keys gives the same result as comparing the
+    sort strings they were made from, but packed keys are shorter and
+    are compared as plain bytes, which makes them better suited for
+    storing in database indexes or external sort files.
+
+    ASCII characters take one byte each, except that each digit is
+    packed into one byte along with whatever character follows it: a
+    pair of digits shares one byte, so the zero-filled numbers that
+    ``for_sort`` generates take up half as much space. Characters
+    outside of ASCII take an escape byte followed by their UTF-8
+    encoding.
+    """
+    packed = bytearray()
+    pos, end = 0, len(sort_string)
+    while pos < end:
+        code = ord(sort_string[pos])
+        pos += 1
+        if code < _PACK_ZERO:
+            packed.append(code)
+        elif code <= _PACK_NINE:
+            digit_byte = _PACK_ZERO + (code - _PACK_ZERO) * _PACK_DIGIT_RANGE
+            next_code = ord(sort_string[pos]) if pos < end else -1
+            if _PACK_ZERO <= next_code <= _PACK_NINE:
+                packed.append(digit_byte + 1 + next_code - _PACK_ZERO)
+                pos += 1
+            elif next_code < _PACK_ZERO:
+                packed.append(digit_byte)
+            else:
+                packed.append(digit_byte + _PACK_DIGIT_RANGE - 1)
+        elif code < _PACK_NON_ASCII:
+            packed.append(code + _PACK_HIGH_ASCII_OFFSET)
+        else:
+            packed.append(_PACK_ESCAPE)
+            packed.extend(sort_string[pos - 1].encode('utf-8'))
+    return bytes(packed)
+
+
+# Each digit gets a range of 12 byte values, in order: followed by
+# the end of the string or a character lower than '0'; followed by
+# each of the digits 0-9; followed by a character higher than '9'.
+_PACK_ZERO, _PACK_NINE, _PACK_NON_ASCII = ord('0'), ord('9'), 0x80
+_PACK_DIGIT_RANGE = 12
+_PACK_HIGH_ASCII_OFFSET = _PACK_ZERO + 10 * _PACK_DIGIT_RANGE - _PACK_NINE - 1
+_PACK_ESCAPE = _PACK_NON_ASCII + _PACK_HIGH_ASCII_OFFSET
+
+
+def csv_reader(lines, delimiter=','):
+    """Read rows of text strings from an iterable of lines of text.
+
+    This is ``csv.reader``, except that on Python 2, where the csv
+    module only reads byte strings, each line is encoded as UTF-8 and
+    each value is decoded again.
+    """
+    if sys.version_info >= (3,):
+        return csv.reader(lines, delimiter=delimiter)
+    rows = csv.reader((line.encode('utf-8') for line in lines),
+                      delimiter=native_str(delimiter))
+    return ([value.decode('utf-8') for value in row] for row in rows)
+
+
+def csv_writer(fh, delimiter=',', lineterminator='\r\n'):
+    """Get an object that writes rows of text strings to a text file.
+
+    This is ``csv.writer``, except that on Python 2, where the csv
+    module only writes byte strings, it returns a CsvTextWriter.
+    """
+    if sys.version_info >= (3,):
+        return csv.writer(fh, delimiter=delimiter,
+                          lineterminator=lineterminator)
+    return CsvTextWriter(fh, delimiter, lineterminator)
+
+
+class CsvTextWriter(object):
+    """Write rows of text strings to a text file on Python 2.
+
+    Each row is written as UTF-8 to a buffer by a ``csv.writer`` and
+    then decoded and written to the file.
+    """
+
+    def __init__(self, fh, delimiter=',', lineterminator='\r\n'):
+        self.fh = fh
+        self.buffer = io.BytesIO()
+        self.writer = csv.writer(self.buffer,
+                                 delimiter=native_str(delimiter),
+                                 lineterminator=native_str(lineterminator))
+
+    def writerow(self, row):
+        self.writer.writerow(['{}'.format(val).encode('utf-8')
+                              for val in row])
+        self.fh.write(self.buffer.getvalue().decode('utf-8'))
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+
 def get_terminal_size(default_width=100, default_height=50):
     try:
         terminal_size = _get_terminal_size_unixlike()
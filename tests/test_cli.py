@@ -0,0 +1,128 @@
+from __future__ import unicode_literals
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from pycallnumber import factories as f
+from pycallnumber import cli
+
+
+# Fixtures, factories, and test data
+
+CNSTRS = ['MT 1001 .C35 B40 1992 no. 1', '500.1 C226t bk.2',
+          'A 1.2:C 35/2-3/994', 'LPCD 100,001 a', '']
+
+
+def expected_columns(cnstr, unittypes=None):
+    unit = f.callnumber(cnstr, unittypes=unittypes, quiet=True)
+    if not unit:
+        return ['', '', '', unit.reason]
+    return [unit.for_sort(), unit.for_search(), type(unit).__name__, '']
+
+
+@pytest.fixture
+def run_cli(tmpdir):
+    def _run_cli(input_text, *args):
+        infile, outfile = tmpdir.join('in.txt'), tmpdir.join('out.txt')
+        with io.open(str(infile), 'w', encoding='utf-8', newline='') as fh:
+            fh.write(input_text)
+        status = cli.main([str(infile), '-o', str(outfile)] + list(args))
+        with io.open(str(outfile), encoding='utf-8', newline='') as fh:
+            return status, fh.read()
+    return _run_cli
+
+
+# Tests
+
+@pytest.mark.parametrize('workers, chunksize', [
+    (1, 500),
+    (2, 2),
+])
+def test_normalize_rows_adds_columns_in_order(workers, chunksize):
+    """``normalize_rows`` should yield each input row, in order, with
+    the ``for_sort``, ``for_search``, ``unittype``, and ``error``
+    values for the call number in the given column appended."""
+    rows = [[str(i), cnstr] for i, cnstr in enumerate(CNSTRS)]
+    results = list(cli.normalize_rows(iter(rows), 1, workers=workers,
+                                      chunksize=chunksize))
+    assert results == [row + expected_columns(row[1]) for row in rows]
+
+
+def test_normalize_rows_pads_short_rows():
+    """``normalize_rows`` should treat a row that doesn't have the call
+    number column as having a blank call number, padding it so the
+    added columns line up."""
+    results = list(cli.normalize_rows([['1']], 1))
+    assert results == [['1', ''] + expected_columns('')]
+
+
+def test_main_csv_with_header(run_cli):
+    """The CLI should read CSV data with a header row, find the call
+    number column by name, and write the header and rows with the new
+    columns added."""
+    status, output = run_cli('id,cn\n1,"LPCD 100,001 a"\n2,500.1 C226t\n',
+                             '--column', 'cn')
+    assert status == 0
+    assert output == ('id,cn,for_sort,for_search,unittype,error\n'
+                      '1,"LPCD 100,001 a",{}\n'
+                      '2,500.1 C226t,{}\n'
+                      ''.format(','.join(expected_columns('LPCD 100,001 a')),
+                                ','.join(expected_columns('500.1 C226t'))))
+
+
+def test_main_tsv_without_header(run_cli):
+    """The CLI should read TSV data without a header row, using the
+    first column by default."""
+    status, output = run_cli('QA 76\n\n', '--tsv', '--no-header',
+                             '--workers', '2')
+    assert status == 0
+    assert output == '{}\n{}\n'.format(
+        '\t'.join(['QA 76'] + expected_columns('QA 76')),
+        '\t'.join([''] + expected_columns('')))
+
+
+def test_main_uses_definitions_file(run_cli, tmpdir):
+    """The CLI should use the default_types from a definitions file
+    passed via ``--definitions``."""
+    definitions = tmpdir.join('types.json')
+    definitions.write(json.dumps({'unit_types': {
+        'Shelf': {'derive_from': 'Alphabetic', 'max_length': 3}
+    }}))
+    status, output = run_cli('abc\nabcd\n', '--no-header', '--definitions',
+                             str(definitions))
+    assert status == 0
+    assert output == 'abc,abc,abc,Shelf,\nabcd,,,,no_matching_type\n'
+
+
+def test_main_reads_stdin_and_writes_stdout():
+    """Running ``python -m pycallnumber`` should read rows from stdin
+    and write them to stdout in the given encoding, including quoted
+    and non-ASCII values, using the given delimiter."""
+    input_text = 'cn\tnote\n"QA 76"\t\u00e9t\u00e9\nLPCD 100,001 a\t\n'
+    process = subprocess.Popen([sys.executable, '-m', 'pycallnumber',
+                                '--tsv', '--workers', '2'],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    output = process.communicate(input_text.encode('utf-8'))[0]
+    assert process.returncode == 0
+    assert output.decode('utf-8') == '\n'.join([
+        '\t'.join(['cn', 'note'] + cli.OUTPUT_COLUMNS),
+        '\t'.join(['QA 76', '\u00e9t\u00e9'] + expected_columns('QA 76')),
+        '\t'.join(['LPCD 100,001 a', ''] +
+                  expected_columns('LPCD 100,001 a')),
+        ''])
+
+
+@pytest.mark.parametrize('args', [
+    ['--column', 'missing'],
+    ['--column', '0'],
+    ['--workers', '0'],
+    ['--unit-types', 'pycallnumber.units.NotAUnitType', '--definitions',
+     'missing.json'],
+])
+def test_main_invalid_args_exit(run_cli, args):
+    """The CLI should exit with an error for invalid arguments."""
+    with pytest.raises(SystemExit):
+        run_cli('cn\nQA 76\n', *args)
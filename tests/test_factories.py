@@ -6,6 +6,9 @@ from pycallnumber import template as t
 from pycallnumber import exceptions as e
 from pycallnumber import set as s
 from pycallnumber import factories as f
+from pycallnumber import normalizers as n
+from pycallnumber import settings
+from pycallnumber.options import Options
 
 
 # Fixtures, factories, and test data
@@ -37,6 +40,21 @@ class AnotherFactoryTestType(un.CompoundUnit):
     )
 
 
+class ReversedAlphabetic(uns.Alphabetic):
+    """An Alphabetic type that overrides a method other than
+    ``for_sort`` that affects its sort value."""
+
+    def _get_cased_string(self, case):
+        return super(ReversedAlphabetic, self)._get_cased_string(case)[::-1]
+
+
+ReversedAlphaNumeric = uns.AlphaNumeric.derive(
+    classname='ReversedAlphaNumeric',
+    groups=[{'name': 'parts', 'min': 1, 'max': None,
+             'possible_types': [ReversedAlphabetic, uns.Numeric]}]
+)
+
+
 class FactoryTestRangeSetType(s.RangeSet):
     pass
 
@@ -105,6 +123,151 @@ def test_callnumber_sets_unitname_using_name_kwarg():
     assert custom.name == 'test_unit'
 
 
+@pytest.mark.callnumber_factory
+def test_callnumber_returns_failure_using_quiet_kwarg():
+    """Calls to the ``callnumber`` factory should return a falsy
+    ValidationFailure object instead of raising an error when the given
+    call number string does not match any of the Unit types given and
+    the ``quiet`` kwarg is True.
+    """
+    types = [FactoryTestType, AnotherFactoryTestType]
+    result = f.callnumber('AA 0 AA 0', unittypes=types, quiet=True)
+    assert isinstance(result, e.ValidationFailure) and not result
+    assert result.reason == 'no_matching_type'
+    assert 'FactoryTestType, AnotherFactoryTestType' in result.message
+
+
+@pytest.mark.callnumber_factory
+def test_callnumbers_yields_results_in_order():
+    """The ``callnumbers`` factory should yield one ParseResult per
+    input string, in input order, each with the same Unit that the
+    ``callnumber`` factory returns for that string.
+    """
+    types = [FactoryTestType, AnotherFactoryTestType]
+    cnstrs = ['AA 0', 'AA 0 AA 0', 'AA 100']
+    results = list(f.callnumbers(cnstrs, unittypes=types))
+    assert [r.cnstr for r in results] == cnstrs
+    assert results[0].unit == f.callnumber('AA 0', unittypes=types)
+    assert results[2].unit == f.callnumber('AA 100', unittypes=types)
+    assert results[0].error is None and results[2].error is None
+
+
+@pytest.mark.callnumber_factory
+def test_callnumbers_returns_errors_for_invalid_strings():
+    """The ``callnumbers`` factory should not raise an error when an
+    input string does not match any of the Unit types; the ParseResult
+    for that string should have a ``unit`` of None and a falsy
+    ValidationFailure as its ``error``.
+    """
+    types = [FactoryTestType, AnotherFactoryTestType]
+    results = list(f.callnumbers(['AA 0 AA 0', 'AA 0'], unittypes=types))
+    assert results[0].unit is None and not results[0].error
+    assert results[0].error.reason == 'no_matching_type'
+    assert results[1].unit == f.callnumber('AA 0', unittypes=types)
+
+
+@pytest.mark.callnumber_factory
+def test_callnumbers_uses_useropts_and_name_kwargs():
+    """The ``callnumbers`` factory should apply the given ``useropts``
+    and ``name`` to every Unit it creates.
+    """
+    opts = {'test_option': False}
+    types = [FactoryTestType]
+    results = f.callnumbers(['AA 0', 'AA 1'], name='test_unit',
+                            useropts=opts, unittypes=types)
+    assert all(r.unit.test_option is False and r.unit.name == 'test_unit'
+               for r in results)
+
+
+@pytest.mark.sort_key_factory
+def test_sort_key_uses_useropts_and_unittypes_kwargs():
+    """The ``sort_key`` factory should return the sort string for the
+    first of the given ``unittypes`` that matches, using the given
+    ``useropts`` where they apply.
+    """
+    types = [FactoryTestType, AnotherFactoryTestType]
+    opts = {'sort_case': 'upper'}
+    assert f.sort_key('aa 1', opts, types) == 'AA!0000000001'
+    assert f.sort_key('1 aa', opts, types) == '0000000001!aa'
+
+
+@pytest.mark.sort_key_factory
+def test_sort_key_returns_none_for_invalid_string():
+    """The ``sort_key`` factory should return None if the call number
+    string does not match any of the Unit types.
+    """
+    assert f.sort_key('A 1', unittypes=[AnotherFactoryTestType]) is None
+
+
+@pytest.mark.sort_key_factory
+@pytest.mark.parametrize('cnstr', [
+    'MT 1001 .C35 B40 1992 v. 1 c. 2',
+    'A 1.2:C 35/2-3/994',
+    'X/A 1.2/a-b:C 35',
+    'XJH:1',
+])
+def test_sort_key_does_not_create_units(cnstr, monkeypatch):
+    """The ``sort_key`` factory should not create any Unit objects for
+    call numbers that have no dates, including SuDocs and LC call
+    numbers with labeled Item parts, once the normalizers for the
+    default Unit types have been created.
+    """
+    expected = f.callnumber(cnstr).for_sort()
+    assert f.sort_key(cnstr) == expected
+
+    def fail(*args, **kwargs):
+        raise AssertionError('No Unit objects should be created.')
+
+    monkeypatch.setattr(un.Unit, '__init__', fail)
+    monkeypatch.setattr(un.CompoundUnit, '__init__', fail)
+    assert f.sort_key(cnstr) == expected
+
+
+@pytest.mark.sort_key_factory
+@pytest.mark.parametrize('unittype, cnstr', [
+    (ReversedAlphabetic, 'abc'),
+    (ReversedAlphaNumeric, 'abc123de'),
+])
+def test_sort_key_uses_units_for_types_with_custom_methods(unittype, cnstr):
+    """The ``sort_key`` factory should match ``for_sort`` for Unit
+    types defined outside of pycallnumber that override methods the
+    normalizers don't know about, and for types that contain them.
+    """
+    expected = unittype(cnstr).for_sort()
+    assert f.sort_key(cnstr, unittypes=[unittype]) == expected
+
+
+@pytest.mark.sort_key_factory
+def test_sort_key_grouping_normalizers_are_limited(monkeypatch):
+    """The part normalizers that a CompoundUnit type's normalizer
+    keeps for each shared Options object should be limited to
+    settings.DEFAULT_MAX_SHARED_OPTIONS, discarding the least recently
+    used first.
+    """
+    monkeypatch.setattr(settings, 'DEFAULT_MAX_SHARED_OPTIONS', 2)
+    grouping = n._CompiledGrouping(uns.AlphaNumeric.template.groupings[0])
+    options = [Options.get_shared(uns.AlphaNumeric, {'sort_case': case})
+               for case in ('lower', 'upper', '')]
+    first = grouping.get_normalizers(options[0])
+    grouping.get_normalizers(options[1])
+    assert grouping.get_normalizers(options[0]) is first
+    grouping.get_normalizers(options[2])
+    assert len(grouping._normalizers) == 2
+    assert grouping.get_normalizers(options[0]) is first
+    assert n.get_sort_normalizer.cache_info().maxsize == 1000
+
+
+@pytest.mark.sort_key_factory
+def test_sort_key_returns_packed_key_using_packed_kwarg():
+    """The ``sort_key`` factory should return the packed version of the
+    sort string if ``packed`` is True.
+    """
+    types = [FactoryTestType]
+    expected = FactoryTestType('aa 1').for_sort_packed()
+    assert f.sort_key('aa 1', unittypes=types, packed=True) == expected
+    assert f.sort_key('A', unittypes=types, packed=True) is None
+
+
 @pytest.mark.cnrange_factory
 @pytest.mark.parametrize('start, end, expected', [
     ('AA 0', 'AA 100', s.RangeSet((aa0, aa100))),
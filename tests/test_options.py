@@ -1,7 +1,11 @@
 from __future__ import unicode_literals
+import pickle
 
+import pytest
 
 from pycallnumber import options
+from pycallnumber import settings
+from pycallnumber.exceptions import OptionsError
 
 
 # Fixtures, factories, and test data
@@ -112,3 +116,129 @@ def test_OWO_set_class_option_via_argument_with_override():
     assert (t.opt1 == 'A' and t.options.sources['opt1'] == 'defaults' and
             t.opt2 == 'C' and t.options.sources['opt2'] == 'argument' and
             t.options.classopts['opt2'] == 'B')
+
+
+def test_OWO_objects_with_same_options_share_options_object():
+    """ObjectWithOptions objects of the same class that are created
+    with the same options should share one Options object, and
+    objects created with different options should not.
+    """
+    t1, t2 = TObjectWithOptions(opt1='C'), TObjectWithOptions(opt1='C')
+    t3 = TObjectWithOptions(opt1='D')
+    assert t1.options is t2.options and t1.options.is_shared
+    assert t1.options is not t3.options and t3.opt1 == 'D'
+
+
+def test_OWO_set_option_copies_shared_options_object():
+    """Using the ``set_option`` method of an ObjectWithOptions object
+    whose Options object is shared should change the options only for
+    that object, not for any others that shared its Options.
+    """
+    t1, t2 = TObjectWithOptions(), TObjectWithOptions()
+    t1.set_option('opt1', 'C')
+    assert t1.opt1 == 'C' and t1.options.sources['opt1'] == 'argument'
+    assert t2.opt1 == 'A' and t2.options.sources['opt1'] == 'defaults'
+    assert not t1.options.is_shared and t2.options.is_shared
+
+
+def test_shared_options_cannot_be_changed():
+    """Trying to change a shared Options object directly should raise
+    an OptionsError, but a copy of one should be changeable.
+    """
+    shared = options.Options.get_shared(TObjectWithOptions)
+    with pytest.raises(OptionsError):
+        shared.set_option('opt1', 'C')
+    with pytest.raises(OptionsError):
+        shared.reset_options(TObjectWithOptions, {'opt1': 'C'})
+    copied = shared.copy()
+    copied.set_option('opt1', 'C')
+    assert copied['opt1'] == 'C' and shared['opt1'] == 'A'
+
+
+@pytest.mark.parametrize('change', [
+    lambda opts: opts.__setitem__('opt1', 'C'),
+    lambda opts: opts.__delitem__('opt1'),
+    lambda opts: opts.update(opt1='C'),
+    lambda opts: opts.setdefault('opt3', 'C'),
+    lambda opts: opts.pop('opt1'),
+    lambda opts: opts.popitem(),
+    lambda opts: opts.clear(),
+])
+def test_shared_options_items_cannot_be_changed(change):
+    """Trying to change the items of a shared Options object as a dict
+    should raise an OptionsError and leave it unchanged.
+    """
+    shared = options.Options.get_shared(TObjectWithOptions)
+    with pytest.raises(OptionsError):
+        change(shared)
+    assert shared == {'opt1': 'A', 'opt2': 'B'}
+
+
+def test_shared_options_can_be_pickled():
+    """Unpickling a shared Options object should give an unshared
+    Options object with the same values.
+    """
+    shared = options.Options.get_shared(TObjectWithOptions)
+    unpickled = pickle.loads(pickle.dumps(shared))
+    assert unpickled == shared and not unpickled.is_shared
+    unpickled.set_option('opt1', 'C')
+    assert unpickled['opt1'] == 'C'
+
+
+def test_shared_options_are_limited(monkeypatch):
+    """No more than ``settings.DEFAULT_MAX_SHARED_OPTIONS`` shared
+    Options objects should be kept, discarding the least recently used
+    ones first.
+    """
+    monkeypatch.setattr(settings, 'DEFAULT_MAX_SHARED_OPTIONS', 2)
+    options.Options.clear_shared()
+    t1, t2 = TObjectWithOptions(opt1='C'), TObjectWithOptions(opt1='D')
+    assert TObjectWithOptions(opt1='C').options is t1.options
+    t3 = TObjectWithOptions(opt1='E')
+    assert len(options.Options._shared) == 2
+    assert TObjectWithOptions(opt1='C').options is t1.options
+    assert TObjectWithOptions(opt1='E').options is t3.options
+    assert TObjectWithOptions(opt1='D').options is not t2.options
+    options.Options.clear_shared()
+
+
+def test_OWO_class_option_changes_apply_to_new_objects():
+    """Changing an ObjectWithOptions class's ``options_defaults`` or
+    an option set as a class attribute should affect objects created
+    afterward, even though Options objects are shared.
+    """
+    class TChangingOptions(TObjectWithOptions):
+        options_defaults = TObjectWithOptions.options_defaults.copy()
+
+    assert TChangingOptions().opt1 == 'A'
+    TChangingOptions.options_defaults['opt1'] = 'C'
+    assert TChangingOptions().opt1 == 'C'
+    TChangingOptions.opt2 = 'D'
+    t = TChangingOptions()
+    assert t.opt2 == 'D' and t.options['opt2'] == 'D'
+
+
+def test_OWO_class_options_are_cached_until_changed():
+    """The options that an ObjectWithOptions class sets should only be
+    looked up again after a class option is changed.
+    """
+    class TChangingOptions(TObjectWithOptions):
+        options_defaults = TObjectWithOptions.options_defaults.copy()
+
+    get_state = options.Options._get_class_state
+    state = get_state(TChangingOptions)
+    assert get_state(TChangingOptions) is state
+    TChangingOptions.opt1 = 'C'
+    assert get_state(TChangingOptions) is not state
+    state = get_state(TChangingOptions)
+    TChangingOptions.options_defaults['opt2'] = 'C'
+    assert get_state(TChangingOptions) is not state
+
+
+def test_OWO_unhashable_option_values_are_not_shared():
+    """Objects created with option values that are unhashable should
+    work normally but get their own, unshared Options objects.
+    """
+    t1, t2 = TObjectWithOptions(opt1=['C']), TObjectWithOptions(opt1=['C'])
+    assert t1.opt1 == ['C'] and t1.options is not t2.options
+    assert not t1.options.is_shared
@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+import multiprocessing
+
+import pytest
+
+from pycallnumber import units as uns
+from pycallnumber import factories as f
+from pycallnumber import parallel as p
+
+
+# Fixtures, factories, and test data
+
+CNSTRS = ['MT 1001 .C35 B40 1992 no. 1', '500.1 C226t bk.2',
+          'A 1.2:C 35/2-3/994', 'LPCD 100,001 a', '']
+
+can_fork = 'fork' in getattr(multiprocessing, 'get_all_start_methods',
+                             lambda: ['fork'])()
+
+
+class BrokenAlphabetic(uns.Alphabetic):
+    """An Alphabetic type whose ``for_sort`` fails for 'bad'."""
+
+    def for_sort(self):
+        if str(self) == 'bad':
+            raise IndexError('for_sort failed')
+        return super(BrokenAlphabetic, self).for_sort()
+
+
+def expected_result(cnstr, unittypes=None, useropts=None):
+    unit = f.callnumber(cnstr, unittypes=unittypes, useropts=useropts,
+                        quiet=True)
+    if not unit:
+        return (cnstr, None, None, None, None, unit.reason)
+    return (cnstr, type(unit).__name__, unit.for_sort(), unit.for_search(),
+            unit.for_print(), None)
+
+
+# Tests
+
+@pytest.mark.parametrize('workers, chunksize', [
+    (1, 500),
+    (2, 500),
+    (2, 2),
+])
+def test_normalize_matches_callnumber_in_order(workers, chunksize):
+    """The ``normalize`` function should yield one NormalizedCallNumber
+    per input string, in input order, containing the same values the
+    ``callnumber`` factory produces for that string, no matter how
+    many workers or what chunksize is used.
+    """
+    results = list(p.normalize(CNSTRS * 3, workers=workers,
+                               chunksize=chunksize))
+    assert results == [expected_result(cnstr) for cnstr in CNSTRS * 3]
+
+
+def test_normalize_accepts_unittypes_and_useropts():
+    """The ``normalize`` function should use the given ``unittypes``
+    and ``useropts`` the same way the ``callnumber`` factory does.
+    """
+    types = [uns.Dewey, 'pycallnumber.units.Local']
+    opts = {'display_case': 'upper'}
+    results = list(p.normalize(CNSTRS, useropts=opts, unittypes=types,
+                               workers=2))
+    expected = [expected_result(cnstr, [uns.Dewey, uns.Local], opts)
+                for cnstr in CNSTRS]
+    assert results == expected
+
+
+@pytest.mark.skipif(not can_fork, reason='requires the fork start method')
+def test_normalize_handles_derived_unittypes():
+    """The ``normalize`` function should work with Unit types created
+    at runtime, which cannot be pickled.
+    """
+    derived_type = uns.Alphabetic.derive(classname='RuntimeAlpha',
+                                         max_length=3)
+    results = list(p.normalize(['abc', 'abcd'], unittypes=[derived_type],
+                               workers=2))
+    assert results == [expected_result('abc', [derived_type]),
+                       expected_result('abcd', [derived_type])]
+    assert results[0].unittype == 'RuntimeAlpha'
+
+
+def test_normalize_interleaved_in_process_calls_are_independent():
+    """With ``workers=1``, each ``normalize`` call should keep using
+    its own ``unittypes``, even if another call is made before its
+    results are consumed.
+    """
+    lc_results = p.normalize(['MT 1001 .C35'], unittypes=[uns.LC],
+                             workers=1)
+    dewey_results = p.normalize(['MT 1001 .C35'], unittypes=[uns.Dewey],
+                                workers=1)
+    assert list(lc_results) == [expected_result('MT 1001 .C35', [uns.LC])]
+    assert list(dewey_results) == [expected_result('MT 1001 .C35',
+                                                   [uns.Dewey])]
+
+
+@pytest.mark.parametrize('workers', [
+    1,
+    pytest.param(2, marks=pytest.mark.skipif(
+        not can_fork, reason='requires the fork start method')),
+])
+def test_normalize_reports_unexpected_errors_per_string(workers):
+    """If normalizing one string raises an error other than an
+    InvalidCallNumberStringError, the ``normalize`` function should
+    report it in that string's result and keep going.
+    """
+    results = list(p.normalize(['abc', 'bad', 'd'], workers=workers,
+                               unittypes=[BrokenAlphabetic], chunksize=2))
+    assert results == [
+        expected_result('abc', [BrokenAlphabetic]),
+        ('bad', None, None, None, None, 'normalization_error'),
+        expected_result('d', [BrokenAlphabetic]),
+    ]
@@ -0,0 +1,198 @@
+from __future__ import unicode_literals
+import json
+import os
+import re
+import subprocess
+import sys
+import warnings
+
+import pytest
+
+from pycallnumber import settings
+from pycallnumber.exceptions import CallNumberWarning
+from pycallnumber import units as uns
+from pycallnumber import regexcache as rc
+
+
+# Fixtures, factories, and test data
+
+PATTERN = r'^(?P<letters>[A-Za-z]+)\s*(?P<numbers>\d+)$'
+
+
+@pytest.fixture
+def cache_dir(tmpdir, monkeypatch):
+    monkeypatch.setattr(settings, 'DEFAULT_PATTERN_CACHE_DIR', str(tmpdir))
+    rc.clear()
+    yield str(tmpdir)
+    rc.clear()
+
+
+def cache_files(cache_dir):
+    return [name for _, _, names in os.walk(cache_dir) for name in names]
+
+
+class MismatchedSre(object):
+    """Stands in for an ``_sre`` module whose ``compile`` function has
+    a different signature than the one the cache uses."""
+
+    MAGIC = CODESIZE = None
+
+    @staticmethod
+    def compile(pattern, flags, code):
+        raise AssertionError('Should not be used with these arguments.')
+
+
+# Tests
+
+def test_compile_pattern_does_not_cache_by_default(tmpdir, monkeypatch):
+    """If ``settings.DEFAULT_PATTERN_CACHE_DIR`` is None,
+    ``compile_pattern`` should just compile the pattern."""
+    monkeypatch.setattr(settings, 'DEFAULT_PATTERN_CACHE_DIR', None)
+    assert rc.compile_pattern(PATTERN) is re.compile(PATTERN)
+
+
+def test_compile_pattern_saves_regex_to_cache(cache_dir):
+    """If ``settings.DEFAULT_PATTERN_CACHE_DIR`` is set,
+    ``compile_pattern`` should return a regex that works like the one
+    that ``re.compile`` returns and save it to the cache directory."""
+    regex, expected = rc.compile_pattern(PATTERN), re.compile(PATTERN)
+    assert regex.pattern == expected.pattern
+    assert regex.groupindex == expected.groupindex
+    assert regex.match('AB 12').groupdict() == {'letters': 'AB',
+                                                'numbers': '12'}
+    assert len(cache_files(cache_dir)) == 1
+    assert rc.get_cache_path().startswith(cache_dir)
+
+
+def test_compile_pattern_loads_regex_from_cache(cache_dir, monkeypatch):
+    """``compile_pattern`` should load a regex that was saved to the
+    cache directory earlier instead of compiling it again."""
+    rc.compile_pattern(PATTERN)
+    rc.clear()
+    assert rc.is_supported()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('The pattern should not be compiled.')
+
+    monkeypatch.setattr(rc, '_make_entry', fail)
+    monkeypatch.setattr(re, 'compile', fail)
+    regex = rc.compile_pattern(PATTERN)
+    assert regex.match('AB 12').group('numbers') == '12'
+
+
+@pytest.mark.parametrize('change', [
+    lambda entry: 'not an entry',
+    lambda entry: dict(entry, pattern=r'(?P<letters>\d+)'),
+    lambda entry: dict(entry, flags=re.IGNORECASE),
+    lambda entry: dict(entry, code=entry['code'] + ['x']),
+    lambda entry: dict(entry, code=entry['code'] + [2.5]),
+    lambda entry: dict(entry, code=entry['code'] + [-1]),
+    lambda entry: dict(entry, code=entry['code'][:-3]),
+    lambda entry: dict(entry, groups=10 ** 9),
+    lambda entry: dict(entry, groupindex={'letters': 99}),
+])
+def test_compile_pattern_ignores_bad_cache_entries(cache_dir, change):
+    """If a file in the cache directory can't be loaded, or it isn't
+    an entry for the same pattern and flags, ``compile_pattern``
+    should compile the pattern normally."""
+    rc.compile_pattern(PATTERN)
+    rc.clear()
+    path = os.path.join(rc.get_cache_path(), cache_files(cache_dir)[0])
+    with open(path) as cachefile:
+        entry = change(json.load(cachefile))
+    with open(path, 'w') as cachefile:
+        json.dump(entry, cachefile)
+    regex = rc.compile_pattern(PATTERN)
+    assert regex.match('AB 12').group('letters') == 'AB'
+    assert regex.groupindex == re.compile(PATTERN).groupindex
+
+
+def test_compile_pattern_uses_flags(cache_dir):
+    """``compile_pattern`` should compile the pattern with the given
+    flags, caching it separately from the same pattern without them."""
+    assert not rc.compile_pattern('^ab$').match('AB')
+    assert rc.compile_pattern('^ab$', re.IGNORECASE).match('AB')
+    assert len(cache_files(cache_dir)) == 2
+
+
+def test_compile_pattern_without_package_version(cache_dir, monkeypatch):
+    """If the installed package version can't be found,
+    ``compile_pattern`` should compile the pattern normally without
+    using the cache."""
+    metadata = pytest.importorskip('importlib.metadata')
+
+    def version(name):
+        raise metadata.PackageNotFoundError(name)
+
+    monkeypatch.setattr(metadata, 'version', version)
+    rc._get_package_version._cache.clear()
+    try:
+        regex = rc.compile_pattern(PATTERN)
+    finally:
+        rc._get_package_version._cache.clear()
+    assert regex.match('AB 12').group('numbers') == '12'
+    assert cache_files(cache_dir) == []
+
+
+@pytest.mark.parametrize('attr, value', [
+    ('_sre', MismatchedSre),
+    ('_sre', None),
+    ('_make_entry', lambda pattern, flags: {}),
+])
+def test_compile_pattern_skips_cache_if_unsupported(cache_dir, monkeypatch,
+                                                    attr, value):
+    """If caching compiled regexes doesn't work on this interpreter,
+    ``compile_pattern`` should warn once, not use the cache directory,
+    and return normally compiled regexes."""
+    monkeypatch.setattr(rc, attr, value)
+    with pytest.warns(CallNumberWarning):
+        regex = rc.compile_pattern(PATTERN)
+    assert regex is re.compile(PATTERN)
+    assert regex.match('AB 12').group('numbers') == '12'
+    assert rc.is_supported() is False
+    assert cache_files(cache_dir) == []
+
+
+def test_compile_pattern_warns_about_unsupported_cache_once(cache_dir,
+                                                            monkeypatch):
+    """The warning about caching not being supported should only be
+    issued the first time a pattern is compiled."""
+    monkeypatch.setattr(rc, '_sre', MismatchedSre)
+    with pytest.warns(CallNumberWarning):
+        rc.compile_pattern(PATTERN)
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter('always')
+        rc.compile_pattern(PATTERN, re.I)
+    assert not [w for w in record if w.category is CallNumberWarning]
+
+
+def test_cache_is_supported_on_this_interpreter():
+    """On the Python versions pycallnumber is tested with, caching
+    compiled regexes should work."""
+    rc.clear()
+    assert rc.is_supported() is True
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='Module __getattr__ requires Python 3.7+')
+def test_importing_pycallnumber_does_not_import_metadata():
+    """Importing ``pycallnumber`` and parsing a call number with the
+    cache disabled should not import ``importlib.metadata``, which is
+    slow to import."""
+    code = ('import sys, pycallnumber; pycallnumber.callnumber("MT 100"); '
+            'print("importlib.metadata" in sys.modules)')
+    env = dict(os.environ)
+    env.pop('PYCALLNUMBER_PATTERN_CACHE_DIR', None)
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    assert output.decode('utf-8').strip() == 'False'
+
+
+def test_units_parse_the_same_using_cache(cache_dir):
+    """Unit types should parse call numbers the same way whether or
+    not their regexes come from the cache."""
+    cnstr = 'MT 1001 .C35 B40 1992 v. 1'
+    expected = uns.LC(cnstr).for_sort()
+    assert uns.LC.derive(classname='CachedLC')(cnstr).for_sort() == expected
+    assert len(cache_files(cache_dir)) > 0
+    rc.clear()
+    assert uns.LC.derive(classname='CachedLC')(cnstr).for_sort() == expected
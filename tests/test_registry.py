@@ -0,0 +1,218 @@
+from __future__ import unicode_literals
+import collections
+import json
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+import pycallnumber as pycn
+from pycallnumber import units as uns
+from pycallnumber import registry as r
+from pycallnumber import parallel
+from pycallnumber.exceptions import SettingsError
+
+
+# Fixtures, factories, and test data
+
+def make_definitions(max_number=9999):
+    return {
+        'unit_types': collections.OrderedDict([
+            ('ShelfLetters', {'derive_from': 'Alphabetic', 'min_length': 1,
+                              'max_length': 3}),
+            ('ShelfNumber', {'derive_from': 'Numeric',
+                             'max_val': max_number}),
+            ('Shelf', {
+                'derive_from': 'AlphaNumericSymbol',
+                'groups': [
+                    {'name': 'letters', 'min': 1, 'max': 1,
+                     'type': 'ShelfLetters'},
+                    {'name': 'number', 'min': 1, 'max': 1,
+                     'type': 'ShelfNumber'},
+                    {'name': 'cutter', 'min': 0, 'max': 1,
+                     'possible_types': ['pycallnumber.units.Cutter']},
+                ]
+            }),
+        ]),
+        'default_types': ['Shelf', 'Dewey']
+    }
+
+
+TOML_DEFINITIONS = """
+default_types = ["Shelf"]
+
+[unit_types.ShelfLetters]
+derive_from = "Alphabetic"
+min_length = 1
+max_length = 3
+
+[unit_types.Shelf]
+derive_from = "AlphaNumericSymbol"
+groups = [
+    {name = "letters", min = 1, max = 1, type = "ShelfLetters"},
+    {name = "number", min = 1, max = 1, type = "Numeric"},
+]
+"""
+
+
+@pytest.fixture
+def json_file(tmpdir):
+    def _json_file(definitions):
+        path = tmpdir.join('unit_types.json')
+        path.write(json.dumps(definitions))
+        return str(path)
+    return _json_file
+
+
+# Tests
+
+def test_registry_derives_types_from_definitions():
+    """A UnitRegistry should derive a Unit type for each definition,
+    using the other types in the definitions or in ``units`` where
+    they are referred to by name."""
+    registry = r.UnitRegistry(definitions=make_definitions())
+    assert list(registry.types) == ['ShelfLetters', 'ShelfNumber', 'Shelf']
+    assert registry.default_types == [registry['Shelf'], uns.Dewey]
+    shelf = registry['Shelf']('AB 123 C35')
+    assert isinstance(shelf.letters, registry['ShelfLetters'])
+    assert isinstance(shelf.cutter, uns.Cutter)
+    assert shelf.for_sort() == 'ab!0123!c!35'
+
+
+def test_registry_types_work_with_factories():
+    """The ``default_types`` of a UnitRegistry should work as the
+    ``unittypes`` for the factory functions."""
+    registry = r.UnitRegistry(definitions=make_definitions())
+    cn = pycn.callnumber('AB 123', unittypes=registry.default_types)
+    assert isinstance(cn, registry['Shelf'])
+    assert pycn.sort_key('AB 123', unittypes=registry.default_types) ==\
+        cn.for_sort()
+
+
+def test_registry_reuses_types_for_unchanged_definitions():
+    """Loading definitions into a registry should reuse the Unit types
+    it created earlier for any definitions that haven't changed,
+    including definitions of the types they refer to, and it should
+    only keep the types for its current definitions."""
+    registry = r.UnitRegistry(definitions=make_definitions())
+    old_types = dict(registry.types)
+    registry.load_definitions(make_definitions(max_number=99))
+    assert registry['ShelfLetters'] is old_types['ShelfLetters']
+    assert registry['ShelfNumber'] is not old_types['ShelfNumber']
+    assert registry['Shelf'] is not old_types['Shelf']
+    assert len(registry._derived_types) == 3
+    registry.load_definitions(make_definitions())
+    assert registry['ShelfNumber'] is not old_types['ShelfNumber']
+
+
+def test_registries_do_not_share_types():
+    """Each UnitRegistry should derive its own types."""
+    registry1 = r.UnitRegistry(definitions=make_definitions())
+    registry2 = r.UnitRegistry(definitions=make_definitions())
+    assert registry2['Shelf'] is not registry1['Shelf']
+
+
+def test_registry_types_can_be_pickled():
+    """Unit types from a UnitRegistry should survive pickling, even in
+    a process that has not loaded the definitions."""
+    registry = r.UnitRegistry(definitions=make_definitions())
+    code = ('import pickle, sys; '
+            'shelf = pickle.loads(getattr(sys.stdin, "buffer", sys.stdin)'
+            '.read()); '
+            'print("{} {}".format(shelf.__name__, '
+            'shelf("AB 123 C35").for_sort()))')
+    process = subprocess.Popen([sys.executable, '-c', code],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    output = process.communicate(pickle.dumps(registry['Shelf'], 2))[0]
+    assert output.decode('utf-8').strip() == 'Shelf ab!0123!c!35'
+    shelf_type = pickle.loads(pickle.dumps(registry['Shelf']))
+    assert shelf_type.__name__ == 'Shelf'
+    assert shelf_type('AB 123').for_sort() == 'ab!0123'
+
+
+def test_registry_types_unpickle_as_the_original_types():
+    """Unpickling a Unit type from a UnitRegistry in the process that
+    loaded it, including after a round trip through another process,
+    should give the registry's own type, not a copy."""
+    registry = r.UnitRegistry(definitions=make_definitions())
+    other = r.UnitRegistry(definitions=make_definitions())
+    shelf_type = registry['Shelf']
+    assert pickle.loads(pickle.dumps(shelf_type)) is shelf_type
+    assert pickle.loads(pickle.dumps(other['Shelf'])) is other['Shelf']
+    code = ('import pickle, sys; '
+            'shelf = pickle.loads(getattr(sys.stdin, "buffer", sys.stdin)'
+            '.read()); '
+            'getattr(sys.stdout, "buffer", sys.stdout).write('
+            'pickle.dumps(shelf, 2))')
+    process = subprocess.Popen([sys.executable, '-c', code],
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    output = process.communicate(pickle.dumps(shelf_type, 2))[0]
+    assert pickle.loads(output) is shelf_type
+
+
+def test_registry_types_work_with_spawned_workers(monkeypatch):
+    """Unit types from a UnitRegistry should work with
+    ``parallel.normalize`` even when worker processes are spawned
+    instead of forked."""
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        pytest.skip('requires multiprocessing start methods')
+    monkeypatch.setattr(parallel, '_get_mp_context',
+                        lambda: get_context('spawn'))
+    registry = r.UnitRegistry(definitions=make_definitions())
+    results = list(parallel.normalize(['AB 123', 'AB 12345'], workers=2,
+                                      unittypes=registry.default_types))
+    assert [(res.unittype, res.for_sort) for res in results] ==\
+        [('Shelf', 'ab!0123'), (None, None)]
+
+
+def test_registry_refresh_reloads_changed_file(json_file):
+    """``UnitRegistry.refresh`` should reload the definitions file only
+    if it has changed."""
+    path = json_file(make_definitions())
+    registry = r.UnitRegistry(path)
+    assert registry['Shelf'].validate('AB 1234', quiet=True)
+    assert registry.refresh() is False
+    json_file(make_definitions(max_number=99))
+    os.utime(path, (0, 0))
+    assert registry.refresh() is True
+    assert not registry['Shelf'].validate('AB 1234', quiet=True)
+
+
+@pytest.mark.skipif(r.tomllib is None, reason='requires a TOML parser')
+def test_registry_loads_toml_files(tmpdir):
+    """A UnitRegistry should load definitions from a TOML file."""
+    path = tmpdir.join('unit_types.toml')
+    path.write(TOML_DEFINITIONS)
+    registry = r.UnitRegistry(str(path))
+    assert registry.default_types == [registry['Shelf']]
+    assert registry['Shelf']('ABC 12').for_sort() == 'abc!0000000012'
+
+
+@pytest.mark.skipif(r.tomllib is None, reason='requires a TOML parser')
+def test_registry_toml_dates_raise_error(tmpdir):
+    """Loading a TOML file with a date in it should raise a
+    SettingsError, since no Unit attributes can be dates."""
+    path = tmpdir.join('unit_types.toml')
+    path.write(TOML_DEFINITIONS.replace('max_length = 3',
+                                        'created = 2020-01-01'))
+    with pytest.raises(SettingsError):
+        r.UnitRegistry(str(path))
+
+
+@pytest.mark.parametrize('definitions', [
+    {},
+    {'unit_types': {'A': {'min_length': 1}}},
+    {'unit_types': {'A': {'derive_from': 'NotAUnitType'}}},
+    {'unit_types': {'A': {'derive_from': 'simple'}}},
+    {'unit_types': {'A': {'derive_from': 'B'}, 'B': {'derive_from': 'A'}}},
+    {'unit_types': {'A': {'derive_from': 'AlphaNumericSymbol',
+                          'groups': [{'name': 'a', 'type': 'A'}]}}},
+])
+def test_registry_invalid_definitions_raise_error(definitions):
+    """Loading invalid definitions should raise a SettingsError."""
+    with pytest.raises(SettingsError):
+        r.UnitRegistry(definitions=definitions)
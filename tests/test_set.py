@@ -1826,6 +1826,15 @@ def test_sort_ranges_reverse():
 
 # Fixtures, factories, and test data
 
+class LabeledRangeSet(s.RangeSet):
+    """A RangeSet subclass that sets up its own state in ``__init__``.
+    """
+
+    def __init__(self, *user_ranges):
+        super(LabeledRangeSet, self).__init__(*user_ranges)
+        self.label = 'range count: {}'.format(len(self.ranges))
+
+
 RSET_DATA = {
     # RangeSet 1    |------|        |------|
     # RangeSet 2    |------|        |------|
@@ -2769,6 +2778,147 @@ def test_rangeset_operations(val_args, op, expected):
         assert op(*test_vals) == expected
 
 
+@pytest.mark.rangeset
+def test_rangeset_contains_with_many_ranges():
+    """When a RangeSet has many ranges, ``in`` should find the one
+    range that contains a given Unit or Range, if there is one.
+    """
+    numbers = [RangeTestType('AA {}'.format(i)) for i in range(0, 100, 2)]
+    rset = s.RangeSet(*zip(numbers[::2], numbers[1::2]))
+    for i in range(len(numbers) - 1):
+        expected = i % 2 == 0
+        assert (numbers[i] in rset) == expected
+        assert (s.Range(numbers[i], numbers[i+1]) in rset) == expected
+    assert aa100 not in rset and RangeTestType('A 0') not in rset
+
+
+@pytest.mark.rangeset
+def test_rangeset_contains_with_overlapping_ranges():
+    """If a RangeSet's ranges are set directly to a list of ranges
+    that overlap, ``in`` should still find a range that contains a
+    given Unit.
+    """
+    rset = s.RangeSet()
+    rset.ranges = [s.Range(aa0, c0), s.Range(aa50, aa100),
+                   s.Range(ab0, ab50)]
+    assert aa9999 in rset and ab100 in rset and ca0 not in rset
+
+
+@pytest.mark.rangeset
+@pytest.mark.parametrize('op', [
+    operator.or_, operator.and_, operator.sub, operator.xor
+])
+def test_rangeset_operation_results_match_new_rangesets(op):
+    """The RangeSet returned from a set operation should be the same
+    as one created from its ranges via ``__init__``, including the
+    attributes that ``__init__`` sets.
+    """
+    numbers = [RangeTestType('AA {}'.format(i)) for i in range(0, 60, 3)]
+    rset1 = s.RangeSet(*zip(numbers[0::4], numbers[2::4]))
+    rset2 = s.RangeSet(*zip(numbers[1::4], numbers[3::4]))
+    result = op(rset1, rset2)
+    expected = s.RangeSet(*result.ranges)
+    assert result == expected
+    assert type(result) is type(expected)
+    assert result.unittype == expected.unittype
+    assert (result.start, result.end) == (expected.start, expected.end)
+    assert all((n in result) == (n in expected) for n in numbers)
+
+
+@pytest.mark.rangeset
+@pytest.mark.parametrize('op', [
+    operator.or_, operator.and_, operator.sub, operator.xor
+])
+def test_rangeset_subclass_operation_results_are_initialized(op):
+    """The result of a set operation on a RangeSet subclass that
+    overrides ``__init__`` should be created via its ``__init__``.
+    """
+    numbers = [RangeTestType('AA {}'.format(i)) for i in range(0, 60, 3)]
+    rset1 = LabeledRangeSet(*zip(numbers[0::4], numbers[2::4]))
+    rset2 = LabeledRangeSet(*zip(numbers[1::4], numbers[3::4]))
+    result = op(rset1, rset2)
+    assert type(result) is LabeledRangeSet
+    assert result.label == 'range count: {}'.format(len(result.ranges))
+    assert result == s.RangeSet(*result.ranges)
+
+
+@pytest.mark.rangeset
+def test_rangeset_operation_results_can_be_empty():
+    """A set operation that results in an empty RangeSet should
+    return one that matches ``RangeSet()``.
+    """
+    rset = s.RangeSet((aa0, aa50))
+    result = rset - rset
+    assert result == s.RangeSet() and result.ranges == []
+    assert result.unittype is None and result.start is None
+
+
+@pytest.mark.rangeset
+@pytest.mark.parametrize('unit, expected', [
+    (RangeTestType('A 0'), set()),
+    (aa0, {'aa', 'all'}),
+    (aa50, {'aa', 'aa_mid', 'all'}),
+    (aa100, {'aa', 'all'}),
+    (ab0, {'ab', 'all'}),
+    (ab100, {'ab', 'all'}),
+    (c0, set()),
+    (ca0, {'ca_up'}),
+])
+def test_rangeset_classifier_classify(unit, expected):
+    """A RangeSetClassifier's ``classify`` method should return the set
+    of names whose RangeSets contain the given Unit.
+    """
+    classifier = s.RangeSetClassifier({
+        'aa': s.RangeSet((aa0, ab0)),
+        'aa_mid': s.RangeSet((aa50, aa100), (aa1000, aa9999)),
+        'ab': s.Range(ab0, c0),
+        'all': s.RangeSet((aa0, c0)),
+        'ca_up': s.RangeSet((ca0, None)),
+    })
+    assert classifier.classify(unit) == expected
+
+
+@pytest.mark.rangeset
+@pytest.mark.parametrize('unit, expected', [
+    (aa0, {'aa'}),
+    (aa50, {'aa'}),
+    (aa100, {'aa'}),
+    (aa1000, {'aa'}),
+    (ab0, set()),
+])
+def test_rangeset_classifier_classify_overlapping_ranges(unit, expected):
+    """A RangeSetClassifier should correctly classify Units using a
+    RangeSet whose ranges were set directly and overlap.
+    """
+    rangeset = s.RangeSet()
+    rangeset.ranges = [s.Range(aa0, aa1000), s.Range(aa50, aa100),
+                       s.Range(aa100, ab0)]
+    classifier = s.RangeSetClassifier({'aa': rangeset})
+    assert classifier.classify(unit) == expected
+
+
+@pytest.mark.rangeset
+def test_rangeset_classifier_classify_all():
+    """A RangeSetClassifier's ``classify_all`` method should classify
+    each Unit or string in the given iterable, yielding None for any
+    string that does not match the given Unit types.
+    """
+    classifier = s.RangeSetClassifier({'aa': s.RangeSet((aa0, ab0)),
+                                       'ab': s.RangeSet((ab0, c0))})
+    results = classifier.classify_all([aa50, 'AB 50', '0 AA'],
+                                      unittypes=[RangeTestType])
+    assert list(results) == [{'aa'}, {'ab'}, None]
+
+
+@pytest.mark.rangeset
+def test_rangeset_classifier_requires_sets():
+    """Initializing a RangeSetClassifier with a mapping whose values
+    are not RangeSet or Range objects should raise a RangeSetError.
+    """
+    with pytest.raises(e.RangeSetError):
+        s.RangeSetClassifier({'aa': (aa0, ab0)})
+
+
 @pytest.mark.rangeset
 def test_sort_rangesets():
     """A list of rangesets passed to ``sort`` should result in a
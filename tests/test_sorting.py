@@ -0,0 +1,97 @@
+from __future__ import unicode_literals
+import io
+import os
+
+import pytest
+
+from pycallnumber import units as uns
+from pycallnumber import factories as f
+from pycallnumber import sorting as s
+
+
+# Fixtures, factories, and test data
+
+CNSTRS = ['MT 1001 .C35 B40 1992', 'not a call number!', '500.1 C226t',
+          'QA 76.73 .P98 C35 2001', 'mt 1001 c35 b40 1992', '500.1 c226t',
+          'A 1.2:C 35/2-3/994', '?', 'MT 100 .C35', '20.3 Z12', 'MT 1001',
+          'E 185.86 .B6 1990', 'LPCD 100,001 a', 'QA 76.73 .P98 C35 1999']
+
+
+class BrokenAlphabetic(uns.Alphabetic):
+    """An Alphabetic type whose ``for_sort`` fails for 'bad'."""
+
+    def for_sort(self):
+        if str(self) == 'bad':
+            raise IndexError('for_sort failed')
+        return super(BrokenAlphabetic, self).for_sort()
+
+
+def expected_order(cnstrs):
+    """Return ``cnstrs`` in the order sorting their Units would give,
+    with strings that don't parse at the end, in input order."""
+    units = [f.callnumber(cnstr, quiet=True) for cnstr in cnstrs]
+    valid = sorted((unit, i) for i, unit in enumerate(units) if unit)
+    invalid = [i for i, unit in enumerate(units) if not unit]
+    return [cnstrs[i] for _, i in valid] + [cnstrs[i] for i in invalid]
+
+
+# Tests
+
+@pytest.mark.parametrize('run_size, max_open_runs', [
+    (100, 64),
+    (3, 64),
+    (2, 2),
+])
+def test_sort_lines_matches_unit_order(run_size, max_open_runs, tmpdir):
+    """``sort_lines`` should yield lines in the same order that sorting
+    the equivalent Unit objects gives, with unparseable lines last,
+    no matter how many runs and merge passes it uses, and it should
+    remove its temporary files when it's done."""
+    lines = ['{}\n'.format(cnstr) for cnstr in CNSTRS]
+    result = list(s.sort_lines(lines, run_size=run_size,
+                               max_open_runs=max_open_runs,
+                               tempdir=str(tmpdir)))
+    assert result == ['{}\n'.format(c) for c in expected_order(CNSTRS)]
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_sort_lines_keeps_equal_keys_in_input_order():
+    """Lines whose call numbers have the same sort key should stay in
+    input order."""
+    lines = ['MT 100 .C35 #2', 'mt 100 c35', 'MT 100 .C35', 'MT100 C35']
+    assert list(s.sort_lines(lines, run_size=2)) == lines[1:] + lines[:1]
+
+
+def test_sort_lines_puts_lines_that_raise_errors_last(tmpdir):
+    """Lines whose call numbers raise an unexpected error while being
+    normalized should be sorted last, in input order, like invalid
+    call numbers, without stopping the sort."""
+    lines = ['d', 'bad', '1', 'abc', 'bad']
+    result = list(s.sort_lines(lines, unittypes=[BrokenAlphabetic],
+                               run_size=2, tempdir=str(tmpdir)))
+    assert result == ['abc', 'd', 'bad', '1', 'bad']
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_sort_lines_invalid_args_raise_error():
+    """``sort_lines`` should raise a ValueError if ``run_size`` is
+    less than 1 or ``max_open_runs`` is less than 2."""
+    with pytest.raises(ValueError):
+        list(s.sort_lines(['MT 100'], run_size=0))
+    with pytest.raises(ValueError):
+        list(s.sort_lines(['MT 100'], max_open_runs=1))
+
+
+def test_sort_file_sorts_rows_by_column(tmpdir):
+    """``sort_file`` should write the header and then each row of a
+    delimited file, unchanged, ordered by the call number in the given
+    column."""
+    infile, outfile = tmpdir.join('in.csv'), tmpdir.join('out.csv')
+    rows = ['{},"{}",x'.format(i, c) for i, c in enumerate(CNSTRS)]
+    infile.write('id,cn,other\n{}'.format('\n'.join(rows)))
+    s.sort_file(str(infile), str(outfile), column=1, header=True,
+                run_size=4)
+    by_cnstr = dict(zip(CNSTRS, rows))
+    expected = ['id,cn,other'] + [by_cnstr[c] for c in expected_order(CNSTRS)]
+    with io.open(str(outfile), encoding='utf-8') as fh:
+        assert fh.read() == '{}\n'.format('\n'.join(expected))
@@ -81,6 +81,19 @@ def test_simple_template_validate_error(params, tstr):
         template.validate(tstr)
 
 
+@pytest.mark.parametrize('params, tstr', SIMPLE_INVALID_PARAMS)
+def test_simple_template_validate_quiet(params, tstr):
+    """The given test string, when passed to a SimpleTemplate object
+    created with the given params' ``validate`` method with
+    ``quiet=True``, should return a falsy ValidationFailure object
+    instead of raising an error.
+    """
+    template = make_simple_template(*params)
+    result = template.validate(tstr, quiet=True)
+    assert isinstance(result, e.ValidationFailure) and not result
+    assert result.reason == 'no_match'
+
+
 def test_simple_template_describe_short_provided():
     """Passing a ``short_description`` parameter to SimpleTemplate
     should mean calls to ``describe_short`` use that exact string.
@@ -185,6 +198,8 @@ olap_utype = make_simple_unit_type(1, 1, r'[T-Zt-z]', 'Overlap')
 digit_utype = make_simple_unit_type(1, 1, r'[0-9]', 'Digit')
 pipe_utype = make_simple_unit_type(1, 1, r'\|', 'Pipe')
 dot_utype = make_simple_unit_type(1, 1, r'\.', 'Dot')
+space_opt_utype = make_simple_unit_type(0, 1, r'\s', 'SpaceOpt')
+a1a_utype = make_simple_unit_type(1, 1, r'[A-Za-z][0-9]+[A-Za-z]?', 'A1A')
 
 outer_sep_gr = make_grouping(1, 1, [pipe_utype], 'sep0', None, None, None)
 outer_sep_gr_opt = make_grouping(0, 1, [pipe_utype], 'sep0', None, None, None)
@@ -274,6 +289,15 @@ GROUPING_DATA = {
                         (olap_utype, 'z')],)),
         ]
     },
+    ('1 to N, a1a_utype, optional inner separator (space)',
+     1, None, (a1a_utype,), 'a1a', space_opt_utype, None, None): {
+        'invalid': ['a1b2'],
+        'valid_parse': [
+            ('a1b', ([(a1a_utype, 'a1b')],)),
+            ('a1b c2', ([(a1a_utype, 'a1b'), (space_opt_utype, ' '),
+                         (a1a_utype, 'c2')],)),
+        ]
+    },
     ('0 to 1, alpha_utype, required outer separator (pipe) before',
      0, 1, (alpha_utype,), 'letter', None, outer_sep_gr, 'before'): {
         'invalid': [],
@@ -1627,6 +1651,25 @@ def test_compound_template_validate_error(params, tstr):
         template.validate(tstr)
 
 
+@pytest.mark.parametrize('params, tstr', COMPOUND_INVALID_PARAMS)
+def test_compound_template_validate_quiet(params, tstr):
+    """Given a set of paremeters for initializing a CompoundTemplate
+    and a test string, the test string should return a falsy
+    ValidationFailure when passed to the CompoundTemplate object's
+    ``validate`` method with ``quiet=True``. Its message should match
+    the message of the error raised when ``quiet`` is False.
+    """
+    separator_type = params[1]
+    gr_params = [gp_tuple_to_dict(gp_tuple) for gp_tuple in params[2]]
+    template = t.CompoundTemplate(separator_type=separator_type,
+                                  groups=gr_params)
+    result = template.validate(tstr, quiet=True)
+    with pytest.raises(e.InvalidCallNumberStringError) as excinfo:
+        template.validate(tstr)
+    assert isinstance(result, e.ValidationFailure) and not result
+    assert result.message == str(excinfo.value)
+
+
 @pytest.mark.parametrize('params, tstr, expected_parts', COMPOUND_PARTS_PARAMS)
 def test_compound_template_parts(params, tstr, expected_parts):
     """Given a set of parameters for initializing a CompoundTemplate,
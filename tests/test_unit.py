@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 from builtins import str
 import operator
+import pickle
 
 import pytest
 
@@ -37,6 +38,19 @@ class SUTest_Simple(u.SimpleUnit):
         return '{}{}'.format(self._string, self.print_value)
 
 
+class SUTest_SortPrefix(u.SimpleUnit):
+
+    options_defaults = u.SimpleUnit.options_defaults.copy()
+    options_defaults.update({
+        'sort_prefix': '',
+    })
+    template = t.SimpleTemplate(min_length=1, max_length=None,
+                                base_pattern=r'[A-Za-z]')
+
+    def for_sort(self):
+        return '{}{}'.format(self.sort_prefix, self._string)
+
+
 test_obj_attributes = ['definition', 'is_separator', 'is_formatting',
                        'print_value']
 
@@ -119,6 +133,104 @@ def test_simpleunit_validate_error(tstr):
         SUTest_Simple.validate(tstr)
 
 
+@pytest.mark.simple
+@pytest.mark.parametrize('tstr', ['', 'a ', 'a1'])
+def test_simpleunit_validate_quiet(tstr):
+    """When passed to a SimpleUnit's ``validate`` method with
+    ``quiet=True``, the given test string (tstr) should return a falsy
+    ValidationFailure with a 'no_match' reason and a message that
+    describes the Unit type.
+    """
+    result = SUTest_Simple.validate(tstr, quiet=True)
+    assert isinstance(result, e.ValidationFailure) and not result
+    assert result.reason == 'no_match'
+    assert 'is not a valid SUTest_Simple Unit' in result.message
+
+
+@pytest.mark.simple
+def test_simpleunit_validation_failure_pickles():
+    """A ValidationFailure returned from a SimpleUnit's ``validate``
+    method should survive pickling, keeping its reason and message.
+    """
+    result = SUTest_Simple.validate('a1', quiet=True)
+    unpickled = pickle.loads(pickle.dumps(result))
+    assert unpickled.reason == result.reason
+    assert unpickled.message == result.message
+
+
+@pytest.mark.simple
+@pytest.mark.comparison
+@pytest.mark.parametrize('change_options', [
+    lambda unit: unit.set_option('sort_prefix', 'z'),
+    lambda unit: unit.reset_options({'sort_prefix': 'z'}),
+])
+def test_simpleunit_option_changes_clear_cached_sort_key(change_options):
+    """Sort keys are cached for comparisons, but changing a Unit's
+    options via ``set_option`` or ``reset_options`` should clear the
+    cache, so that comparisons use the new options.
+    """
+    unit1, unit2 = SUTest_SortPrefix('a'), SUTest_SortPrefix('b')
+    assert unit1 < unit2
+    change_options(unit1)
+    assert unit1 > unit2
+
+
+@pytest.mark.simple
+@pytest.mark.parametrize('useropts, override, expected', [
+    ({}, False, {'definition': 'SUTest_Simple definition',
+                 'is_separator': False, 'print_value': '[PR]'}),
+    ({'print_value': '!', 'definition': 'x'}, False,
+     {'definition': 'SUTest_Simple definition', 'print_value': '!'}),
+    ({'definition': 'x', 'is_separator': True}, True,
+     {'definition': 'x', 'is_separator': True, 'print_value': '[PR]'}),
+])
+def test_simpleunit_options_are_attributes(useropts, override, expected):
+    """Each option value on a Unit should be available as an attribute
+    of the Unit, whether it comes from the ``options_defaults``, a
+    class attribute, or an argument, even though Units do not store
+    all option values as instance attributes.
+    """
+    unit = SUTest_Simple('a', override_class_opts=override, **useropts)
+    for option, value in expected.items():
+        assert getattr(unit, option) == value == unit.options[option]
+
+
+@pytest.mark.simple
+def test_simpleunit_set_option_updates_attributes():
+    """Changing an option via ``set_option`` should change the value
+    of the corresponding attribute on the Unit, including if the
+    option is later set back to its class attribute value.
+    """
+    unit = SUTest_Simple('a')
+    unit.set_option('definition', 'x', override_class_opts=True)
+    unit.set_option('print_value', '!')
+    assert unit.definition == 'x' and unit.for_print() == 'a!'
+    unit.set_option('definition', 'x')
+    assert unit.definition == 'SUTest_Simple definition'
+
+
+@pytest.mark.simple
+def test_simpleunit_missing_attribute_raises_error():
+    """Accessing an attribute that is neither a normal attribute nor
+    an option should raise an AttributeError.
+    """
+    with pytest.raises(AttributeError):
+        SUTest_Simple('a').not_an_option
+
+
+@pytest.mark.simple
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+def test_simpleunit_pickles(protocol):
+    """A SimpleUnit should survive pickling with any pickle protocol,
+    keeping its options and the sources of their values.
+    """
+    unit = SUTest_Simple('a', print_value='!')
+    unpickled = pickle.loads(pickle.dumps(unit, protocol))
+    assert unpickled.for_print() == 'a!' and unpickled == unit
+    assert unpickled.options == unit.options
+    assert unpickled.options.sources == unit.options.sources
+
+
 @pytest.mark.simple
 def test_simpleunit_as_str():
     """Casting a SimpleUnit as a string should return the ``for_print``
@@ -221,6 +333,21 @@ def test_simpleunit_derive_template_patterns(attr_prefix, testvalue):
         assert getattr(derived_unit.template, attr) == expected
 
 
+@pytest.mark.simple
+def test_simpleunit_derive_sets_module_to_calling_module():
+    """Creating a new SimpleUnit using the ``derive`` method should
+    set the new class's ``__module__`` to the module that called
+    ``derive``, or to the module ``stacklevel`` frames further up the
+    stack."""
+    def derive_for_caller():
+        return SUTest_Simple.derive(stacklevel=2)
+
+    assert SUTest_Simple.derive().__module__ == __name__
+    assert derive_for_caller().__module__ == __name__
+    too_far = SUTest_Simple.derive(stacklevel=1000)
+    assert too_far.__module__ == 'pycallnumber.unit'
+
+
 # CompoundUnit ********************************************************
 
 # Fixtures, factories, and test data
@@ -286,6 +413,17 @@ class CUTest_Simple(u.CompoundUnit):
     )
 
 
+class CUTest_SortPrefix(u.CompoundUnit):
+
+    template = t.CompoundTemplate(
+        separator_type=None,
+        groups=[
+            {'name': 'letters', 'min': 1, 'max': 1, 'type': SUTest_SortPrefix},
+            {'name': 'digits', 'min': 1, 'max': 1, 'type': digit_utype},
+        ]
+    )
+
+
 class CUTest_Simple_SortHideFormatting(u.CompoundUnit):
 
     template = t.CompoundTemplate(
@@ -530,6 +668,21 @@ def test_compoundunit_validate_error(unit_type, tstr):
         unit_type.validate(tstr)
 
 
+@pytest.mark.compound
+@pytest.mark.parametrize('unit_type, tstr', COMPUNIT_INVALID_PARAMS)
+def test_compoundunit_validate_quiet(unit_type, tstr):
+    """When passed to the given unit_type's ``validate`` method with
+    ``quiet=True``, the given test string (tstr) should return a falsy
+    ValidationFailure whose message matches the message of the error
+    raised when ``quiet`` is False.
+    """
+    result = unit_type.validate(tstr, quiet=True)
+    with pytest.raises(e.InvalidCallNumberStringError) as excinfo:
+        unit_type.validate(tstr)
+    assert isinstance(result, e.ValidationFailure) and not result
+    assert result.message == str(excinfo.value)
+
+
 @pytest.mark.compound
 @pytest.mark.parametrize('unit_type, tstr, expected', COMPUNIT_ATTR_PARAMS)
 def test_compoundunit_attributes(unit_type, tstr, expected):
@@ -578,6 +731,30 @@ def test_compoundunit_for_sort(unit_type, tstr, expected):
     assert unit.for_sort() == expected
 
 
+@pytest.mark.compound
+def test_compoundunit_lazy_creates_parts_when_needed():
+    """A CompoundUnit initialized with ``lazy=True`` should not create
+    parts for a grouping until that grouping is first accessed, and
+    it should create all of them when needed for ``for_sort``.
+    """
+    unit = CUTest_Simple('a.b|1|c', lazy=True)
+    assert '_parts' not in vars(unit) and 'letter1' not in vars(unit)
+    assert str(unit.digit) == '1'
+    assert 'digit' in vars(unit) and 'letter1' not in vars(unit)
+    assert unit.for_sort() == CUTest_Simple('a.b|1|c').for_sort()
+    assert unit.digit in unit._parts and str(unit.letter2) == 'c'
+
+
+@pytest.mark.compound
+def test_compoundunit_lazy_nonmatching_string_raises_error():
+    """Initializing a CompoundUnit with ``lazy=True`` using a string
+    that does not match the template should still raise an
+    InvalidCallNumberStringError immediately.
+    """
+    with pytest.raises(e.InvalidCallNumberStringError):
+        CUTest_Simple('a-1', lazy=True)
+
+
 @pytest.mark.compound
 def test_compoundunit_custom_for_print():
     """When the ``for_print`` method is called on a
@@ -606,3 +783,17 @@ def test_compoundunit_custom_for_sort():
     """
     unit = CUTest_CustomForMethods('aa11')
     assert unit.for_sort() == 'aa[SO]!11'
+
+
+@pytest.mark.compound
+def test_compoundunit_for_sort_is_cached():
+    """The ``for_sort`` value of a CompoundUnit should be cached, so
+    changing options on one of its parts directly should have no effect
+    until ``clear_cache`` is called on the CompoundUnit.
+    """
+    unit = CUTest_SortPrefix('a1')
+    assert unit.for_sort() == 'a!1'
+    unit.letters.set_option('sort_prefix', 'z')
+    assert unit.for_sort() == 'a!1'
+    unit.clear_cache()
+    assert unit.for_sort() == 'za!1'
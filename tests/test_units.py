@@ -1,7 +1,13 @@
+import collections
+import random
+import subprocess
+import sys
+
 import pytest
 
 from pycallnumber import units as u
 from pycallnumber import exceptions as e
+from pycallnumber import factories as f
 from helpers import generate_params
 
 
@@ -711,6 +717,60 @@ SORT_TEST_PARAMS = generate_params(UNITS_DATA, 'sort')
 SORT_EQ_TEST_PARAMS = generate_params(UNITS_DATA, 'sort_equivalence')
 DISPLAY_TEST_PARAMS = generate_params(UNITS_DATA, 'display')
 SEARCH_TEST_PARAMS = generate_params(UNITS_DATA, 'search')
+LAZY_TEST_PARAMS = [p for p in VALID_TEST_PARAMS if not p.values[0].is_simple]
+SORT_KEY_TEST_PARAMS = [
+    pytest.param(p.values[0], {}, p.values[1], marks=p.marks)
+    for p in VALID_TEST_PARAMS + INVALID_TEST_PARAMS
+] + [
+    pytest.param(p.values[0], p.values[1], tstr, marks=p.marks)
+    for p in SORT_TEST_PARAMS for tstr in p.values[2:]
+]
+
+
+def mutate(rng, tstr, others):
+    """Return a randomly changed copy of ``tstr``, which may be
+    spliced together with one of the ``others``."""
+    chars = ALPHABET + NUMERALS + ' .:/-,'
+    for _ in range(rng.randint(1, 3)):
+        pos = rng.randint(0, len(tstr))
+        change = rng.choice(('case', 'delete', 'insert', 'repeat', 'splice'))
+        if change == 'case':
+            tstr = tstr.swapcase() if rng.random() < 0.5 else\
+                tstr[:pos] + tstr[pos:pos + 1].swapcase() + tstr[pos + 1:]
+        elif change == 'delete':
+            tstr = tstr[:pos] + tstr[pos + 1:]
+        elif change == 'insert':
+            tstr = tstr[:pos] + rng.choice(chars) + tstr[pos:]
+        elif change == 'repeat':
+            end = rng.randint(pos, len(tstr))
+            tstr = tstr[:end] + tstr[pos:end] + tstr[end:]
+        else:
+            other = rng.choice(others)
+            tstr = tstr[:pos] + other[rng.randint(0, len(other)):]
+    return tstr
+
+
+def generate_sort_key_params(params, per_type=50, seed=0):
+    """Generate (tclass, opts, tstrs) test params, with ``per_type``
+    strings for each Unit type in ``params``, made by randomly changing
+    the type's test strings. Output is the same for a given ``seed``.
+    """
+    rng = random.Random(seed)
+    tstrs_by_type = collections.OrderedDict()
+    for p in params:
+        tstrs_by_type.setdefault(p.values[0], []).append(p.values[1])
+    option_choices = ({}, {'sort_case': 'upper'},
+                      {'use_formatting_in_sort': True})
+    return [
+        pytest.param(tclass, rng.choice(option_choices),
+                     [mutate(rng, rng.choice(tstrs), tstrs)
+                      for _ in range(per_type)],
+                     marks=getattr(pytest.mark, tclass.__name__))
+        for tclass, tstrs in tstrs_by_type.items()
+    ]
+
+
+GENERATED_SORT_KEY_PARAMS = generate_sort_key_params(VALID_TEST_PARAMS)
 
 
 # Tests
@@ -744,6 +804,37 @@ def test_units_dates_star_imports():
     assert len(all_imp.__all__) == len(pycallnumber.units.dates.__all__)
 
 
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='Module __getattr__ requires Python 3.7+')
+def test_importing_pycallnumber_does_not_load_unit_types():
+    """Importing ``pycallnumber`` should not import any of the modules
+    that define Unit types until one of the types is used."""
+    code = ('import sys, pycallnumber; '
+            'loaded = [m for m in sys.modules if m.startswith('
+            '"pycallnumber.units.")]; '
+            'pycallnumber.units.Dewey; '
+            'print(loaded, "pycallnumber.units.callnumbers.lc" in '
+            'sys.modules)')
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.decode('utf-8').strip() == '[] False'
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='Module __getattr__ requires Python 3.7+')
+def test_dir_lists_lazy_unit_types_without_loading_them():
+    """``dir`` on the ``units`` and ``units.callnumbers`` packages
+    should list the lazily loaded Unit types without importing the
+    modules that define them."""
+    code = ('import sys, pycallnumber; '
+            'names = dir(pycallnumber.units); '
+            'cn_names = dir(pycallnumber.units.callnumbers); '
+            'print("LC" in names, "Dewey" in cn_names, "SuDoc" in names, '
+            '[m for m in sys.modules if m.startswith('
+            '"pycallnumber.units.callnumbers.")])')
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.decode('utf-8').strip() == 'True True True []'
+
+
 @pytest.mark.parametrize('tclass, tstr', VALID_TEST_PARAMS)
 def test_Unit_validate_is_valid(tclass, tstr):
     """The test string should validate when a Unit subclass is
@@ -784,6 +875,17 @@ def test_Unit_forsort(tclass, opts, tstr1, tstr2):
     assert units[0].for_sort() < units[1].for_sort()
 
 
+@pytest.mark.parametrize('tclass, opts, tstr1, tstr2', SORT_TEST_PARAMS)
+def test_Unit_forsortpacked(tclass, opts, tstr1, tstr2):
+    """When test string 1 and test string 2 are both normalized via the
+    ``for_sort_packed`` method of the given Unit subclass, test string
+    1 should sort before test string 2 (assuming a low-to-high sort).
+
+    """
+    units = [tclass(tstr, **opts) for tstr in (tstr1, tstr2)]
+    assert units[0].for_sort_packed() < units[1].for_sort_packed()
+
+
 @pytest.mark.parametrize('tclass, opts, tstr1, tstr2, expected',
                          SORT_EQ_TEST_PARAMS)
 def test_Unit_forsort_equivalence(tclass, opts, tstr1, tstr2, expected):
@@ -794,6 +896,8 @@ def test_Unit_forsort_equivalence(tclass, opts, tstr1, tstr2, expected):
     """
     units = [tclass(tstr, **opts) for tstr in (tstr1, tstr2)]
     assert (units[0].for_sort() == units[1].for_sort()) == expected
+    assert (units[0].for_sort_packed() ==
+            units[1].for_sort_packed()) == expected
 
 
 @pytest.mark.parametrize('tclass, opts, tstr, expected', SEARCH_TEST_PARAMS)
@@ -804,3 +908,65 @@ def test_Unit_forsearch(tclass, opts, tstr, expected):
     """
     unit = tclass(tstr, **opts)
     assert unit.for_search() == expected
+
+
+@pytest.mark.parametrize('tclass, tstr', LAZY_TEST_PARAMS)
+def test_Unit_lazy_matches_eager(tclass, tstr):
+    """A CompoundUnit subclass initialized with ``lazy=True`` should
+    end up with the same parts and normalized forms as one initialized
+    normally.
+
+    """
+    def tree(unit):
+        parts = getattr(unit, '_parts', None)
+        if parts is None:
+            return (type(unit).__name__, unit.name, unit.for_print())
+        return (type(unit).__name__, unit.name, [tree(p) for p in parts])
+
+    eager, lazy = tclass(tstr), tclass(tstr, lazy=True)
+    assert lazy.part_names == eager.part_names
+    assert ([getattr(lazy, n) for n in lazy.part_names] ==
+            [getattr(eager, n) for n in eager.part_names])
+    assert tree(lazy) == tree(eager)
+    assert lazy.for_sort() == eager.for_sort()
+    assert lazy.for_search() == eager.for_search()
+
+
+@pytest.mark.parametrize('tclass, opts, tstr', SORT_KEY_TEST_PARAMS)
+def test_sort_key_matches_Unit_for_sort(tclass, opts, tstr):
+    """The ``sort_key`` factory should return the same value as the
+    ``for_sort`` method of the Unit that the ``callnumber`` factory
+    creates from the same string, options, and Unit types, or None if
+    the string is invalid, both when using only the given Unit type
+    and when using the default Unit types. If getting the sort value
+    from the Unit raises an error, ``sort_key`` should raise the same
+    type of error.
+
+    """
+    assert_sort_key_matches_for_sort(tclass, opts, tstr)
+
+
+@pytest.mark.parametrize('tclass, opts, tstrs', GENERATED_SORT_KEY_PARAMS)
+def test_sort_key_matches_Unit_for_sort_generated(tclass, opts, tstrs):
+    """The ``sort_key`` factory should match the ``for_sort`` method
+    of the equivalent Unit, as in ``test_sort_key_matches_Unit_for_sort``,
+    for randomly generated variations of the test strings for each
+    Unit type, which are mostly invalid or only partly valid.
+
+    """
+    for tstr in tstrs:
+        assert_sort_key_matches_for_sort(tclass, opts, tstr)
+
+
+def assert_sort_key_matches_for_sort(tclass, opts, tstr):
+    for unittypes in ([tclass], None):
+        try:
+            unit = f.callnumber(tstr, useropts=opts, unittypes=unittypes,
+                                quiet=True)
+            expected = unit.for_sort() if unit else None
+        except Exception as error:
+            with pytest.raises(type(error)):
+                f.sort_key(tstr, opts, unittypes)
+        else:
+            assert (tstr, f.sort_key(tstr, opts, unittypes)) ==\
+                (tstr, expected)
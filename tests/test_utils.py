@@ -1,9 +1,13 @@
 from __future__ import unicode_literals
 from builtins import object
+import itertools
 import operator
+import pickle
 
 import pytest
 
+from pycallnumber import settings
+from pycallnumber.exceptions import OptionsError
 from pycallnumber import utils as u
 from pycallnumber import units as uns
 
@@ -49,6 +53,12 @@ class MemoizeBoundMethodTester(object):
         return 'val_{}_{}_{}_{}'.format(arg1, arg2, kwarg1, kwarg2)
 
 
+class UninstantiableDewey(uns.Dewey):
+
+    def __init__(self, *args, **kwargs):
+        raise AssertionError('UninstantiableDewey was instantiated')
+
+
 test_unit_low = uns.Alphabetic('A')
 test_unit_high = uns.Alphabetic('ZZZZZZZZZZ')
 
@@ -105,6 +115,13 @@ PRETTY_PARAMETERS = [
      '  1234\n  12345\n\n  1234\n  12345')
 ]
 
+PACK_SORT_KEY_STRINGS = ['', ' ', '!', '!!', '.', '/', '0', '00', '01', '1',
+                         '1!', '1.5', '10', '12', '19a', '1a', '9', '99',
+                         '9z', ':', 'A', 'a', 'a!', 'a0', 'z', '~', '\x01',
+                         '\x7f', '\xe9', '\xe91', '\u4e00']
+PACK_SORT_KEY_PARAMS = list(itertools.product(PACK_SORT_KEY_STRINGS,
+                                              repeat=2))
+
 INFINITY_COMP_PARAMS = [
     ((u.Infinity(), u.Infinity()), operator.lt, False),
     ((u.Infinity(), u.Infinity()), operator.le, True),
@@ -156,6 +173,16 @@ INFINITY_COMP_PARAMS = [
     ((-u.Infinity(), test_unit_low), operator.ge, False),
 ]
 
+COULD_BE_UNIT_TYPE_PARAMS = [
+    ('A', uns.Alphabetic, True),
+    ('1', uns.Alphabetic, False),
+    ('A1', uns.Alphabetic, False),
+    ('MT 1001 .C35', uns.LC, True),
+    ('500.1 C226t', uns.LC, False),
+    ('500.1 C226t', uns.Dewey, True),
+    ('A 1.2:C 35', uns.Dewey, False),
+]
+
 
 # Tests
 
@@ -176,13 +203,14 @@ def test_memoize_vals(factory, args, kwargs, suffix):
 @pytest.mark.parametrize('factory, args, kwargs, suffix', MEMOIZE_PARAMETERS)
 def test_memoize_keys_key_generation(factory, args, kwargs, suffix):
     """The memoized function produced by ``factory`` should have a
-    ``_cache`` dictionary attribute that has a key with the given
-    ``suffix`` when passed the given ``args`` and ``kwargs`` values.
+    ``_cache`` dictionary attribute containing a cache for the function
+    with a key that is a tuple of the argument values in the given
+    ``suffix``, when passed the given ``args`` and ``kwargs`` values.
     """
     function = factory()
-    test_key = 'f{}'.format(suffix)
+    test_key = tuple(suffix.split('_')[1:])
     function(*args, **kwargs)
-    assert test_key in function._cache
+    assert test_key in function._cache['f']
 
 
 def test_memoize_bound_method_value():
@@ -203,8 +231,8 @@ def test_memoize_bound_method_key():
     """
     test_object = MemoizeBoundMethodTester()
     test_object.args_kwargs('1', '2', kwarg2='3')
-    test_key = 'args_kwargs_1_2_one_3'
-    assert test_key in test_object._cache
+    test_key = ('1', '2', 'one', '3')
+    assert test_key in test_object._cache['args_kwargs']
     assert not hasattr(MemoizeBoundMethodTester.args_kwargs, '_cache')
 
 
@@ -217,18 +245,54 @@ def test_memoize_multiple_calls():
     """
     function = args_kwargs()
     return_val1 = function('a', 'b')
-    length1 = len(function._cache)
+    length1 = len(function._cache['f'])
     return_val2 = function('1', '2', '3', '4')
-    length2 = len(function._cache)
+    length2 = len(function._cache['f'])
     return_val3 = function('a', 'b')
-    length3 = len(function._cache)
+    length3 = len(function._cache['f'])
     return_val4 = function('1', '2', '3', '4')
-    length4 = len(function._cache)
+    length4 = len(function._cache['f'])
     assert (return_val1 == return_val3 and return_val1 != return_val2 and
             return_val2 == return_val4 and length1 == 1 and length2 == 2 and
             length3 == 2 and length4 == 2)
 
 
+def test_memoize_cache_info():
+    """The memoized function produced by, e.g., the ``args_kwargs``
+    factory function should count cache hits and misses, which are
+    reported via its ``cache_info`` method.
+    """
+    function = args_kwargs()
+    function('a', 'b')
+    function('a', 'b', kwarg1='one')
+    function('a', 'b', 'c')
+    assert function.cache_info() == u.CacheInfo(hits=1, misses=2,
+                                                maxsize=None)
+
+
+def test_memoize_maxsize_discards_least_recently_used():
+    """A function memoized with a ``maxsize`` should keep no more than
+    ``maxsize`` values in its cache, discarding the least recently used
+    value first.
+    """
+    @u.memoize(maxsize=2)
+    def f(arg):
+        return 'val_{}'.format(arg)
+
+    f('a'), f('b'), f('a'), f('c')
+    assert list(f._cache['f'].keys()) == [('a',), ('c',)]
+    assert f('c') == 'val_c' and f.cache_info().maxsize == 2
+
+
+def test_memoize_unhashable_args_are_not_cached():
+    """Calling a memoized function with unhashable argument values
+    should return the correct value without caching it.
+    """
+    function = args()
+    assert function([1], 'b') == 'val_[1]_b'
+    assert len(function._cache['f']) == 0
+
+
 @pytest.mark.parametrize('x, max_line_width, indent_level, tab_width, y',
                          PRETTY_PARAMETERS)
 def test_pretty_output(x, max_line_width, indent_level, tab_width, y):
@@ -241,6 +305,146 @@ def test_pretty_output(x, max_line_width, indent_level, tab_width, y):
     assert teststr == y
 
 
+@pytest.mark.parametrize('cnstr, unittype, expected',
+                         COULD_BE_UNIT_TYPE_PARAMS)
+def test_could_be_unit_type(cnstr, unittype, expected):
+    """The u.could_be_unit_type function should return the expected
+    value when passed the given ``cnstr`` and ``unittype``.
+    """
+    assert u.could_be_unit_type(cnstr, unittype) == expected
+
+
+def test_create_unit_skips_types_that_cannot_match():
+    """The u.create_unit function should not attempt to instantiate
+    any type whose template regex does not match the given string.
+    """
+    unit = u.create_unit('MT 1001 .C35', [UninstantiableDewey, uns.LC], {})
+    assert isinstance(unit, uns.LC)
+
+
+@pytest.fixture
+def interned_units():
+    u.clear_interned_units()
+    yield
+    u.clear_interned_units()
+
+
+@pytest.mark.parametrize('opts1, opts2, name2, expected', [
+    ({'intern_simple_units': True}, {'intern_simple_units': True}, '', True),
+    ({'intern_simple_units': True}, {'intern_simple_units': True}, 'x', False),
+    ({'intern_simple_units': True}, {'intern_simple_units': True,
+                                     'sort_case': 'upper'}, '', False),
+    ({'intern_simple_units': True}, {}, '', False),
+    ({}, {}, '', False),
+])
+def test_create_unit_interns_simple_units(opts1, opts2, name2, expected,
+                                          interned_units):
+    """The u.create_unit function should return an existing SimpleUnit
+    object, rather than a new one, only if the ``intern_simple_units``
+    option is True and the type, string, name, and options all match.
+    """
+    unit1 = u.create_unit('abc', [uns.Alphabetic], opts1)
+    unit2 = u.create_unit('abc', [uns.Alphabetic], opts2, name2)
+    assert (unit1 is unit2) == expected
+    assert unit2.for_print() == 'abc' and unit2.name == name2
+
+
+def test_create_unit_does_not_intern_compound_units(interned_units):
+    """The u.create_unit function should not reuse CompoundUnit
+    objects, but CompoundUnits parsed with ``intern_simple_units``
+    should share their identical SimpleUnit parts.
+    """
+    opts = {'intern_simple_units': True}
+    unit1 = u.create_unit('MT 1001 .C35', [uns.LC], opts)
+    unit2 = u.create_unit('MT 1001 .C35', [uns.LC], opts)
+    assert unit1 is not unit2 and unit1 == unit2
+    assert unit1.classification.letters is unit2.classification.letters
+
+
+def test_create_unit_interned_units_are_read_only(interned_units):
+    """Changing the options on an interned SimpleUnit should raise an
+    OptionsError, so that changing one call number can't change
+    another that shares the same SimpleUnit. A pickled copy of an
+    interned SimpleUnit is not shared, so it can be changed.
+    """
+    opts = {'intern_simple_units': True}
+    unit1 = u.create_unit('MT 1001 .C35', [uns.LC], opts)
+    unit2 = u.create_unit('MT 1001 .C35', [uns.LC], opts)
+    letters = unit1.classification.letters
+    with pytest.raises(OptionsError):
+        letters.set_option('display_case', 'lower')
+    with pytest.raises(OptionsError):
+        letters.reset_options({'display_case': 'lower'})
+    unit1.set_option('display_case', 'lower')
+    assert unit1.display_case == 'lower'
+    assert unit2.display_case != 'lower'
+    assert unit2.classification.letters.for_print() == 'MT'
+    alpha = u.create_unit('ABC', [uns.Alphabetic], opts)
+    copied = pickle.loads(pickle.dumps(alpha))
+    copied.set_option('display_case', 'lower')
+    assert copied.for_print() == 'abc' and alpha.for_print() == 'ABC'
+
+
+def test_create_unit_interned_units_are_limited(interned_units,
+                                                monkeypatch):
+    """The number of SimpleUnit objects kept for reuse should not
+    exceed settings.DEFAULT_MAX_INTERNED_UNITS; the least recently
+    used ones should be discarded first.
+    """
+    monkeypatch.setattr(settings, 'DEFAULT_MAX_INTERNED_UNITS', 2)
+    opts = {'intern_simple_units': True}
+    a, b = [u.create_unit(s, [uns.Alphabetic], opts) for s in ('a', 'b')]
+    assert u.create_unit('a', [uns.Alphabetic], opts) is a
+    u.create_unit('c', [uns.Alphabetic], opts)
+    assert u.create_unit('a', [uns.Alphabetic], opts) is a
+    assert u.create_unit('b', [uns.Alphabetic], opts) is not b
+
+
+@pytest.mark.parametrize('str1, str2', PACK_SORT_KEY_PARAMS)
+def test_pack_sort_key_preserves_order(str1, str2):
+    """Comparing two strings packed via ``pack_sort_key`` should give
+    the same results as comparing the strings themselves."""
+    key1, key2 = u.pack_sort_key(str1), u.pack_sort_key(str2)
+    assert (key1 < key2, key1 == key2) == (str1 < str2, str1 == str2)
+
+
+def test_pack_sort_key_packs_digits_in_pairs():
+    """``pack_sort_key`` should pack each pair of digits into one
+    byte."""
+    assert len(u.pack_sort_key('ab!0000000001')) == 8
+
+
+def test_csv_reader_reads_text_values():
+    """``csv_reader`` should read rows of text strings, including
+    quoted and non-ASCII values, from lines of text."""
+    lines = ['a\t"b\tc"\n', '\u00e9\t\u2603\n']
+    assert list(u.csv_reader(lines, '\t')) == [['a', 'b\tc'],
+                                               ['\u00e9', '\u2603']]
+
+
+def test_create_lazy_getattr_loads_attributes_and_modules():
+    """A ``__getattr__`` function from ``create_lazy_getattr`` should
+    return the named attribute from the mapped module, or the module
+    itself if the name is the module's name, and should store each
+    value in the namespace it's given."""
+    namespace = {'__name__': 'lazy'}
+    getattr_ = u.create_lazy_getattr(namespace, {
+        'Alphabetic': 'pycallnumber.units.simple',
+        'simple': 'pycallnumber.units.simple',
+    })
+    assert getattr_('Alphabetic') is uns.simple.Alphabetic
+    assert getattr_('simple') is uns.simple
+    assert namespace['Alphabetic'] is uns.simple.Alphabetic
+
+
+def test_create_lazy_getattr_raises_AttributeError_for_other_names():
+    """A ``__getattr__`` function from ``create_lazy_getattr`` should
+    raise an AttributeError for names it doesn't know about."""
+    getattr_ = u.create_lazy_getattr({'__name__': 'lazy'}, {})
+    with pytest.raises(AttributeError):
+        getattr_('Alphabetic')
+
+
 @pytest.mark.parametrize('values, op, expected', INFINITY_COMP_PARAMS)
 def test_infinity_comparisons(values, op, expected):
     """The given values tuple should produce the expected truth value